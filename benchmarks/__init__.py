@@ -0,0 +1,33 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Performance benchmarks of zipline.
+
+The benchmarks follow the conventions of asv (airspeed velocity): classes
+with an optional setup method, time_* methods that are timed, and track_*
+methods whose return value is recorded.  With asv installed, results are
+tracked across commits with:
+
+    asv run
+    asv compare <commit> <commit>
+
+using asv.conf.json at the root of the repository.  Without asv, run:
+
+    python -m benchmarks [-o results.json] [name filter]
+
+which runs every benchmark once per combination of its parameters and
+writes the results, with the commit they were measured at, as JSON.
+"""
@@ -0,0 +1,139 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run the benchmarks without asv, once per combination of their parameters,
+and write the results as JSON.
+
+    python -m benchmarks [-o results.json] [name filter]
+"""
+import argparse
+from datetime import datetime
+import importlib
+import inspect
+import itertools
+import json
+import subprocess
+import sys
+import time
+
+MODULES = [
+    'bench_simulation',
+    'bench_history',
+    'bench_orders',
+    'bench_risk',
+    'bench_startup',
+]
+
+
+def iter_benchmarks():
+    """
+    Yield the name, class and method name of every benchmark.
+    """
+    for module_name in MODULES:
+        module = importlib.import_module('benchmarks.' + module_name)
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if class_name.startswith('_') or \
+                    cls.__module__ != module.__name__:
+                continue
+            for method_name in sorted(dir(cls)):
+                if method_name.startswith(('time_', 'track_')):
+                    yield ('.'.join([module_name, class_name, method_name]),
+                           cls, method_name)
+
+
+def param_combinations(cls):
+    params = getattr(cls, 'params', None)
+    if params is None:
+        return [()]
+    if len(getattr(cls, 'param_names', ())) == 1:
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def run_benchmark(cls, method_name, args):
+    """
+    Run a benchmark, returning its value and unit: the time it took for
+    time_ benchmarks, or else its return value.
+    """
+    benchmark = cls()
+    if hasattr(benchmark, 'setup'):
+        benchmark.setup(*args)
+    try:
+        method = getattr(benchmark, method_name)
+        if method_name.startswith('time_'):
+            start = time.time()
+            method(*args)
+            return time.time() - start, 'seconds'
+        return method(*args), getattr(method, 'unit', 'unit')
+    finally:
+        if hasattr(benchmark, 'teardown'):
+            benchmark.teardown(*args)
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+        ).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('filter', nargs='?', default='',
+                        help='only run benchmarks whose name contains this')
+    parser.add_argument('-o', '--output', default=None,
+                        help='write the results to this file rather than '
+                             'to stdout')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, cls, method_name in iter_benchmarks():
+        if args.filter not in name:
+            continue
+        param_names = getattr(cls, 'param_names', [])
+        for combination in param_combinations(cls):
+            try:
+                value, unit = run_benchmark(cls, method_name, combination)
+            except NotImplementedError:
+                # asv's convention for combinations to skip.
+                continue
+            results.append({
+                'name': name,
+                'params': dict(zip(param_names, combination)),
+                'value': value,
+                'unit': unit,
+            })
+            sys.stderr.write('%s %r: %s %s\n' % (name, combination, value,
+                                                 unit))
+
+    output = json.dumps({
+        'commit': current_commit(),
+        'date': datetime.utcnow().isoformat(),
+        'python': sys.version,
+        'results': results,
+    }, indent=2, sort_keys=True)
+
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+
+if __name__ == '__main__':
+    main()
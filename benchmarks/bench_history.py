@@ -0,0 +1,61 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Latency of history() calls made from handle_data.
+"""
+import time
+
+from .common import WEEK, YEAR, make_algo, make_sim_params, make_source
+
+BAR_COUNT = 20
+
+
+class History(object):
+    """
+    history(20, frequency, 'price') called on every bar of a year of daily
+    bars, or of a week of minute bars.
+    """
+    params = [[10, 100], ['1d', '1m']]
+    param_names = ['num_sids', 'frequency']
+    timeout = 600
+
+    def setup(self, num_sids, frequency):
+        if frequency == '1d':
+            self.sim_params = make_sim_params(YEAR, 'daily')
+        else:
+            self.sim_params = make_sim_params(WEEK, 'minute')
+
+    def _run(self, num_sids, frequency):
+        def initialize(context):
+            context.add_history(BAR_COUNT, frequency, 'price')
+            context.history_seconds = 0.0
+
+        def handle_data(context, data):
+            start = time.time()
+            context.history(BAR_COUNT, frequency, 'price')
+            context.history_seconds += time.time() - start
+
+        algo = make_algo(self.sim_params, initialize, handle_data)
+        algo.run(make_source(self.sim_params, num_sids))
+        return algo
+
+    def time_run(self, num_sids, frequency):
+        self._run(num_sids, frequency)
+
+    def track_seconds_per_call(self, num_sids, frequency):
+        algo = self._run(num_sids, frequency)
+        return algo.history_seconds / algo.bars
+    track_seconds_per_call.unit = 'seconds'
@@ -0,0 +1,63 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Order heavy workloads: rebalancing the whole universe on every bar.
+"""
+import time
+
+from .common import WEEK, YEAR, make_algo, make_sim_params, make_source
+
+
+def rebalance(context, data):
+    """
+    Alternate between holding the universe at equal weights and at half
+    those weights, so that every bar places an order for every sid.
+    """
+    weight = 1.0 / len(context.assets) * (0.5 if context.bars % 2 else 1.0)
+    for sid in data:
+        context.order_target_percent(context.assets[sid], weight)
+
+
+class Rebalance(object):
+    params = [[10, 100], ['daily', 'minute']]
+    param_names = ['num_sids', 'data_frequency']
+    timeout = 600
+
+    def setup(self, num_sids, data_frequency):
+        sessions = YEAR if data_frequency == 'daily' else WEEK
+        self.sim_params = make_sim_params(sessions, data_frequency)
+
+    def _run(self, num_sids):
+        def initialize(context):
+            context.assets = {}
+
+        def handle_data(context, data):
+            if not context.assets:
+                context.assets = {sid: context.sid(sid) for sid in data}
+            rebalance(context, data)
+
+        algo = make_algo(self.sim_params, initialize, handle_data)
+        algo.run(make_source(self.sim_params, num_sids))
+        return algo
+
+    def time_run(self, num_sids, data_frequency):
+        self._run(num_sids)
+
+    def track_orders_per_second(self, num_sids, data_frequency):
+        start = time.time()
+        algo = self._run(num_sids)
+        return algo.bars * num_sids / (time.time() - start)
+    track_orders_per_second.unit = 'orders/s'
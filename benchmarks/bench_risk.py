@@ -0,0 +1,65 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time to compute risk metrics, cumulatively during a simulation and as a
+report at its end.
+"""
+import numpy as np
+import pandas as pd
+
+from zipline.finance import risk
+from zipline.utils import factory
+
+from .common import SEED
+
+
+class _Risk(object):
+    params = [1, 5, 10]
+    param_names = ['years']
+
+    def setup(self, years):
+        self.sim_params = factory.create_simulation_parameters(
+            start=pd.Timestamp('%d-01-01' % (2015 - years), tz='UTC'),
+            end=pd.Timestamp('2014-12-31', tz='UTC'),
+        )
+        days = self.sim_params.trading_days
+        rand = np.random.RandomState(SEED)
+        self.algorithm_returns = pd.Series(rand.normal(0, 0.01, len(days)),
+                                           index=days)
+        self.benchmark_returns = pd.Series(rand.normal(0, 0.01, len(days)),
+                                           index=days)
+
+
+class RiskReport(_Risk):
+
+    def time_risk_report(self, years):
+        risk.RiskReport(
+            self.algorithm_returns,
+            self.sim_params,
+            benchmark_returns=self.benchmark_returns,
+        ).to_dict()
+
+
+class RiskMetricsCumulative(_Risk):
+
+    def time_update(self, years):
+        metrics = risk.RiskMetricsCumulative(self.sim_params)
+        account = {'leverage': 0.0}
+        for dt, algorithm_return, benchmark_return in zip(
+                self.algorithm_returns.index,
+                self.algorithm_returns.values,
+                self.benchmark_returns.values):
+            metrics.update(dt, algorithm_return, benchmark_return, account)
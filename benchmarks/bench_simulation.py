@@ -0,0 +1,60 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Throughput of whole simulations, in bars per second, across universe sizes.
+"""
+import time
+
+from .common import WEEK, YEAR, make_algo, make_sim_params, make_source
+
+
+class _Simulation(object):
+    sessions = None
+    data_frequency = None
+    param_names = ['num_sids']
+    timeout = 600
+
+    def setup(self, num_sids):
+        self.sim_params = make_sim_params(self.sessions, self.data_frequency)
+
+    def time_run(self, num_sids):
+        make_algo(self.sim_params).run(make_source(self.sim_params, num_sids))
+
+    def track_bars_per_second(self, num_sids):
+        algo = make_algo(self.sim_params)
+        source = make_source(self.sim_params, num_sids)
+        start = time.time()
+        algo.run(source)
+        return algo.bars / (time.time() - start)
+    track_bars_per_second.unit = 'bars/s'
+
+
+class DailySimulation(_Simulation):
+    """
+    A year of daily bars.
+    """
+    sessions = YEAR
+    data_frequency = 'daily'
+    params = [1, 100, 1000]
+
+
+class MinuteSimulation(_Simulation):
+    """
+    A week of minute bars.
+    """
+    sessions = WEEK
+    data_frequency = 'minute'
+    params = [1, 50, 250]
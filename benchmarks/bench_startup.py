@@ -0,0 +1,48 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Startup costs: importing zipline and building what a simulation needs before
+its first bar.
+"""
+import subprocess
+import sys
+
+from zipline.finance.trading import TradingEnvironment
+
+from .common import YEAR, make_algo, make_sim_params
+
+
+class Startup(object):
+
+    def setup(self):
+        self.sim_params = make_sim_params(YEAR, 'daily')
+
+    def track_import_seconds(self):
+        # Imported in a fresh interpreter, as zipline is already imported
+        # in this one.
+        return float(subprocess.check_output([
+            sys.executable,
+            '-c',
+            'import time; start = time.time(); import zipline; '
+            'print(time.time() - start)',
+        ]))
+    track_import_seconds.unit = 'seconds'
+
+    def time_trading_environment(self):
+        TradingEnvironment()
+
+    def time_algorithm_init(self):
+        make_algo(self.sim_params)
@@ -0,0 +1,74 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Simulations shared by the benchmarks.
+"""
+import pandas as pd
+
+from zipline.algorithm import TradingAlgorithm
+from zipline.sources import RandomWalkSource
+from zipline.utils import factory
+
+# Benchmarked sessions: the first full trading week of 2006, and the year.
+WEEK = (pd.Timestamp('2006-01-09', tz='UTC'),
+        pd.Timestamp('2006-01-13', tz='UTC'))
+YEAR = (pd.Timestamp('2006-01-03', tz='UTC'),
+        pd.Timestamp('2006-12-29', tz='UTC'))
+
+# Seed of the random walks, so that every run simulates the same prices.
+SEED = 1234
+
+
+def make_sim_params(sessions, data_frequency):
+    start, end = sessions
+    return factory.create_simulation_parameters(
+        start=start,
+        end=end,
+        data_frequency=data_frequency,
+        emission_rate='daily',
+    )
+
+
+def make_source(sim_params, num_sids):
+    return RandomWalkSource(
+        start_prices={sid: 100.0 for sid in range(num_sids)},
+        freq=sim_params.data_frequency,
+        start=sim_params.period_start,
+        end=sim_params.period_end,
+        seed=SEED,
+    )
+
+
+def make_algo(sim_params, initialize=None, handle_data=None):
+    """
+    A TradingAlgorithm calling initialize and handle_data, which default to
+    doing nothing, and counting its bars in context.bars.
+    """
+    def _initialize(context):
+        context.bars = 0
+        if initialize is not None:
+            initialize(context)
+
+    def _handle_data(context, data):
+        context.bars += 1
+        if handle_data is not None:
+            handle_data(context, data)
+
+    return TradingAlgorithm(
+        initialize=_initialize,
+        handle_data=_handle_data,
+        sim_params=sim_params,
+    )
@@ -14,6 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+
 from setuptools import setup, find_packages, Extension
 from Cython.Build import cythonize
 import numpy as np
@@ -26,13 +28,19 @@ ext_modules = [
     ),
 ]
 
+# zipline.live is written with async def and await, which interpreters older
+# than Python 3.5 can not compile.
+exclude_packages = []
+if sys.version_info < (3, 5):
+    exclude_packages.append('zipline.live')
+
 setup(
     name='zipline',
     version='0.8.0rc1',
     description='A backtester for financial algorithms.',
     author='Quantopian Inc.',
     author_email='opensource@quantopian.com',
-    packages=find_packages(),
+    packages=find_packages(exclude=exclude_packages),
     ext_modules=cythonize(ext_modules),
     scripts=['scripts/run_algo.py'],
     include_package_data=True,
@@ -44,6 +52,7 @@ setup(
         'Programming Language :: Python',
         'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3.3',
+        'Programming Language :: Python :: 3.5',
         'Operating System :: OS Independent',
         'Intended Audience :: Science/Research',
         'Topic :: Office/Business :: Financial',
@@ -0,0 +1,36 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Brokers for the zipline.live tests, which need Python 3.5.
+"""
+from zipline.live import Broker
+
+
+class RecordingBroker(Broker):
+    """
+    A broker that never fills, recording what it is asked to do.
+    """
+
+    def __init__(self):
+        super(RecordingBroker, self).__init__()
+        self.submitted = []
+        self.cancelled = []
+
+    async def submit(self, order):
+        self.submitted.append(order.id)
+
+    async def cancel(self, order_id):
+        self.cancelled.append(order_id)
@@ -17,10 +17,12 @@ import unittest
 import datetime
 import calendar
 import numpy as np
+import pandas as pd
 import pytz
 import zipline.finance.risk as risk
 from zipline.utils import factory
 
+from zipline.finance import trading
 from zipline.finance.trading import SimulationParameters
 
 from . import answer_key
@@ -492,6 +494,50 @@ class TestRisk(unittest.TestCase):
                           for x in metrics.year_periods],
                          [0.0500])
 
+    def test_rolling_matches_single_period(self):
+        returns = factory.create_returns_from_list(
+            [0.01, -0.02, 0.015, -1.0, 0.03, 0.002, -0.01] * 40,
+            self.sim_params,
+        )
+        metrics = risk.RiskReport(returns, self.sim_params,
+                                  algorithm_leverages=[1.0, 1.5])
+
+        fields = [
+            'num_trading_days',
+            'algorithm_period_returns',
+            'benchmark_period_returns',
+            'algorithm_volatility',
+            'benchmark_volatility',
+            'treasury_period_return',
+            'sharpe',
+            'sortino',
+            'downside_risk',
+            'information',
+            'beta',
+            'alpha',
+            'algorithm_covariance',
+            'benchmark_variance',
+            'max_drawdown',
+            'max_leverage',
+        ]
+        for rolling in metrics.month_periods + metrics.year_periods:
+            single = risk.RiskMetricsPeriod(
+                rolling.start_date,
+                rolling.end_date,
+                returns,
+                algorithm_leverages=[1.0, 1.5],
+            )
+            for field in fields:
+                np.testing.assert_almost_equal(
+                    getattr(rolling, field),
+                    getattr(single, field),
+                    err_msg=field,
+                )
+            np.testing.assert_almost_equal(
+                rolling.mean_algorithm_returns.values,
+                single.mean_algorithm_returns.values,
+            )
+
     def test_benchmarkrange(self):
         self.check_year_range(
             datetime.datetime(
@@ -605,3 +651,89 @@ class TestRisk(unittest.TestCase):
             )
             self.assert_month(start_date.month, col[-1].end_date.month)
             self.assert_last_day(col[-1].end_date)
+
+
+class TreasuryCurveTableTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.trading_days = pd.date_range('2015-01-05', '2015-01-16',
+                                          freq='B', tz='UTC')
+        columns = risk.risk.TREASURY_DURATIONS
+        curves = pd.DataFrame(
+            np.arange(3 * len(columns), dtype=float).reshape(3, -1),
+            index=pd.DatetimeIndex(['2015-01-05', '2015-01-06',
+                                    '2015-01-12'], tz='UTC'),
+            columns=columns,
+        )
+        # The 1month rate is missing on the 6th.
+        curves.loc['2015-01-06', '1month'] = np.nan
+        self.curves = curves
+        self.table = risk.risk.TreasuryCurveTable(curves, self.trading_days)
+
+    def test_exact(self):
+        rate, observed, days_since, exact = self.table.find(
+            '3month', pd.Timestamp('2015-01-05', tz='UTC'),
+        )
+        self.assertEqual(rate, self.curves.loc['2015-01-05', '3month'])
+        self.assertEqual(observed, pd.Timestamp('2015-01-05', tz='UTC'))
+        self.assertEqual(days_since, 0)
+        self.assertTrue(exact)
+
+    def test_falls_back_on_longer_duration(self):
+        rate, _, _, exact = self.table.find(
+            '1month', pd.Timestamp('2015-01-06', tz='UTC'),
+        )
+        self.assertEqual(rate, self.curves.loc['2015-01-06', '3month'])
+        self.assertTrue(exact)
+
+    def test_forward_fill(self):
+        # The 7th through the 9th have no curves.
+        end = pd.Timestamp('2015-01-09', tz='UTC')
+        rate, observed, days_since, exact = self.table.find('10year', end)
+        self.assertEqual(rate, self.curves.loc['2015-01-06', '10year'])
+        self.assertEqual(observed, pd.Timestamp('2015-01-06', tz='UTC'))
+        self.assertEqual(days_since, 3)
+        self.assertFalse(exact)
+
+        # A weekend is one trading day after the preceding Friday.
+        end = pd.Timestamp('2015-01-11', tz='UTC')
+        _, _, days_since, _ = self.table.find('10year', end)
+        self.assertEqual(days_since, 4)
+
+        self.assertIsNone(self.table.find(
+            '10year', end, first_date=pd.Timestamp('2015-01-07', tz='UTC'),
+        ))
+        self.assertIsNone(self.table.find(
+            '10year', pd.Timestamp('2015-01-01', tz='UTC'),
+        ))
+
+    def test_period_nan_rate_falls_back_on_longer_duration(self):
+        env = trading.TradingEnvironment.instance()
+        start = pd.Timestamp('2006-01-03', tz='UTC')
+        end = pd.Timestamp('2006-01-31', tz='UTC')
+        days = env.days_in_range(start, end)
+        returns = pd.Series(np.linspace(-0.01, 0.02, len(days)), index=days)
+
+        # A month long period uses the 1month rate, which is missing on the
+        # period's last day.
+        columns = risk.risk.TREASURY_DURATIONS
+        curves = pd.DataFrame(
+            [[0.03, 0.04] + [0.05] * (len(columns) - 2)] * len(days),
+            index=days,
+            columns=columns,
+        )
+        curves.loc[end, '1month'] = np.nan
+
+        env_curves = env.treasury_curves
+        env.treasury_curves = curves
+        try:
+            period = risk.RiskMetricsPeriod(start, end, returns,
+                                            benchmark_returns=returns)
+        finally:
+            env.treasury_curves = env_curves
+
+        # The rate falls back on the 3month rate of the same day.  A NaN
+        # rate used to be reported as is, giving a NaN
+        # treasury_period_return and a sharpe of 0.0.
+        self.assertAlmostEqual(period.treasury_period_return, 0.04 * 29 / 365)
+        self.assertAlmostEqual(period.sharpe, 2.41318829036)
@@ -18,6 +18,7 @@ from mock import MagicMock
 from nose_parameterized import parameterized
 from six.moves import range
 from textwrap import dedent
+import time
 from unittest import TestCase
 
 import numpy as np
@@ -32,11 +33,14 @@ import zipline.utils.factory as factory
 import zipline.utils.simfactory as simfactory
 
 from zipline.errors import (
+    EventBudgetExceeded,
+    NonNumericRecordedValue,
     OrderDuringInitialize,
     RegisterTradingControlPostInit,
     TradingControlViolation,
     AccountControlViolation,
     SymbolNotFound,
+    UnsupportedRecordAggregation,
 )
 from zipline.test_algorithms import (
     access_account_in_init,
@@ -94,9 +98,17 @@ from zipline.finance.trading import SimulationParameters
 from zipline.utils.api_support import set_algo_instance
 from zipline.utils.events import DateRuleFactory, TimeRuleFactory
 from zipline.algorithm import TradingAlgorithm
-from zipline.protocol import DATASOURCE_TYPE
+from zipline.protocol import DATASOURCE_TYPE, BarData, Portfolio, SIDData
 from zipline.finance.trading import TradingEnvironment
 from zipline.finance.commission import PerShare
+from zipline.finance.controls import (
+    AssetDateBounds,
+    LongOnly,
+    MaxOrderCount,
+    MaxOrderSize,
+    MaxPositionSize,
+    RestrictedListOrder,
+)
 
 
 class TestRecordAlgorithm(TestCase):
@@ -128,6 +140,197 @@ class TestRecordAlgorithm(TestCase):
         np.testing.assert_array_equal(output['name3'].values,
                                       range(1, len(output) + 1))
 
+    def test_record_options(self):
+        sim_params = factory.create_simulation_parameters(
+            num_days=2,
+            data_frequency='minute',
+        )
+        source = factory.create_minutely_trade_source(
+            [0], sim_params=sim_params, concurrent=True,
+        )
+
+        def initialize(context):
+            context.bar = 0
+            for how in ('mean', 'max', 'sum'):
+                context.set_record_options(how, how=how)
+            context.set_record_options('series', keep_series=True)
+
+        def handle_data(context, data):
+            context.bar += 1
+            context.record(last=context.bar, mean=context.bar,
+                           max=context.bar, sum=context.bar,
+                           series=context.bar)
+
+        algo = TradingAlgorithm(initialize=initialize,
+                                handle_data=handle_data,
+                                sim_params=sim_params)
+        output = algo.run(source)
+
+        # Aggregates are over each day's bars.  The source's last bar is a
+        # minute before the last close.
+        day_one = np.arange(1, 391)
+        day_two = np.arange(391, 780)
+        np.testing.assert_array_equal(output['last'], [390, 779])
+        np.testing.assert_array_equal(
+            output['mean'], [day_one.mean(), day_two.mean()],
+        )
+        np.testing.assert_array_equal(output['max'], [390, 779])
+        np.testing.assert_array_equal(
+            output['sum'], [day_one.sum(), day_two.sum()],
+        )
+        np.testing.assert_array_equal(output['series'], [390, 779])
+
+        series = algo.recorded_series('series')
+        np.testing.assert_array_equal(series.values, np.arange(1, 780))
+        self.assertEqual(series.index[0], sim_params.first_open)
+        self.assertEqual(series.index[389],
+                         sim_params.trading_days[0].replace(hour=21))
+        self.assertEqual(list(algo.recorded_series().columns), ['series'])
+        with self.assertRaises(KeyError):
+            algo.recorded_series('mean')
+
+        with self.assertRaises(UnsupportedRecordAggregation):
+            algo.set_record_options('mean', how='median')
+        with self.assertRaises(NonNumericRecordedValue):
+            algo.record(mean='not a number')
+
+
+class TestMemoryAccounting(TestCase):
+
+    def test_memory_accounting(self):
+        sim_params = factory.create_simulation_parameters(num_days=5)
+        source, _ = factory.create_test_df_source(sim_params)
+
+        def handle_data(context, data):
+            context.order(context.sid(0), 10)
+
+        algo = TradingAlgorithm(initialize=lambda context: None,
+                                handle_data=handle_data,
+                                sim_params=sim_params,
+                                memory_accounting='nbytes')
+        self.assertTrue(algo.memory_usage.empty)
+        algo.run(source)
+
+        usage = algo.memory_usage
+        self.assertEqual(
+            sorted(usage.columns),
+            ['history_container', 'perf_periods', 'perfs', 'risk_metrics'],
+        )
+        # One sample per daily perf message, plus the risk report.
+        self.assertEqual(len(usage), sim_params.days_in_period + 1)
+        self.assertTrue((usage['history_container'] == 0).all())
+        self.assertTrue((usage['risk_metrics'] > 0).all())
+        # The perf messages accumulate over the run.
+        self.assertTrue((usage['perfs'].diff().dropna() > 0).all())
+
+        self.assertIsNone(TradingAlgorithm().memory_usage)
+        with self.assertRaises(ValueError):
+            TradingAlgorithm(memory_accounting='rss')
+
+
+class TestMinuteEmission(TestCase):
+
+    def minute_messages(self, **kwargs):
+        sim_params = factory.create_simulation_parameters(
+            num_days=3,
+            data_frequency='minute',
+            emission_rate='minute',
+        )
+
+        def handle_data(context, data):
+            context.order(context.sid(0), 10)
+            context.record(bars=context.get_datetime().minute)
+
+        algo = TradingAlgorithm(initialize=lambda context: None,
+                                handle_data=handle_data,
+                                sim_params=sim_params,
+                                **kwargs)
+        algo.set_sources([factory.create_minutely_trade_source(
+            [0], sim_params=sim_params, concurrent=True,
+        )])
+        return [perf for perf in algo.get_generator()
+                if 'minute_perf' in perf or 'minute_perf_delta' in perf]
+
+    def test_delta_emission(self):
+        full = self.minute_messages()
+        deltas = self.minute_messages(minute_emission='delta')
+
+        # A minute message is emitted at each session's close.  Only the
+        # first is a full snapshot, the others being deltas to their
+        # previous message.
+        self.assertEqual(len(deltas), len(full))
+        self.assertEqual(len(deltas), 3)
+        self.assertIn('minute_perf', deltas[0])
+        self.assertEqual(deltas[0]['minute_perf'].keys(),
+                         full[0]['minute_perf'].keys())
+        for delta, msg in zip(deltas[1:], full[1:]):
+            delta = delta['minute_perf_delta']
+            self.assertEqual(delta['dt'], msg['minute_perf']['period_close'])
+            self.assertEqual(len(delta['minute_perf']['transactions']),
+                             len(msg['minute_perf']['transactions']))
+            self.assertNotIn('positions', delta['minute_perf'])
+            self.assertEqual(
+                delta['cumulative_perf']['ending_cash'],
+                msg['cumulative_perf']['ending_cash'],
+            )
+
+    def test_delta_emission_snapshot_every(self):
+        messages = self.minute_messages(minute_emission='delta',
+                                        minute_snapshot_every=2)
+        self.assertEqual(
+            ['minute_perf' in msg for msg in messages],
+            [True, False, True],
+        )
+
+
+class TestEventTiming(TestCase):
+
+    def test_event_timing(self):
+        sim_params = factory.create_simulation_parameters(num_days=5)
+        source, _ = factory.create_test_df_source(sim_params)
+
+        def scheduled(context, data):
+            pass
+
+        def initialize(context):
+            context.schedule_function(scheduled)
+
+        algo = TradingAlgorithm(initialize=initialize,
+                                handle_data=lambda context, data: None,
+                                sim_params=sim_params,
+                                event_timing=True)
+        algo.set_sources([source])
+        perfs = list(algo.get_generator())
+
+        # The risk report ends the simulation.
+        report = perfs[-1]['event_timing']
+        self.assertEqual(report['bars'], sim_params.days_in_period)
+        self.assertEqual(report['bars_over_budget'], 0)
+        self.assertEqual([event['name'] for event in report['events']],
+                         ['handle_data', 'scheduled'])
+
+        stats = algo.event_timing_stats
+        self.assertEqual(list(stats['name']), ['handle_data', 'scheduled'])
+        self.assertTrue((stats['count'] == sim_params.days_in_period).all())
+        self.assertTrue((stats['max'] >= stats['p50']).all())
+
+        self.assertIsNone(TradingAlgorithm().event_timing_stats)
+
+    def test_event_budget_raised(self):
+        sim_params = factory.create_simulation_parameters(num_days=5)
+        source, _ = factory.create_test_df_source(sim_params)
+
+        def handle_data(context, data):
+            time.sleep(0.01)
+
+        algo = TradingAlgorithm(initialize=lambda context: None,
+                                handle_data=handle_data,
+                                sim_params=sim_params,
+                                event_budget=0.005,
+                                event_budget_action='raise')
+        with self.assertRaises(EventBudgetExceeded):
+            algo.run(source)
+
 
 class TestMiscellaneousAPI(TestCase):
     def setUp(self):
@@ -1230,6 +1433,104 @@ class TestTradingControls(TestCase):
         with self.assertRaises(TradingControlViolation):
             algo.run(df_source)
 
+    def test_batch_order(self):
+        def handle_data(algo, data):
+            algo.batch_order([algo.sid(self.sid)] * 5, [1, 2, 3, 4, 5.00001])
+            algo.order_count += 5
+
+        # The batch is rejected as a whole, so no order is placed.
+        algo = SetMaxOrderCountAlgorithm(3)
+        self.check_algo_fails(algo, handle_data, 0)
+
+        algo = SetMaxOrderCountAlgorithm(5)
+        self.check_algo_succeeds(algo, handle_data, order_count=20)
+        self.assertEqual(
+            sorted(o.amount for o in algo.blotter.orders.values()),
+            sorted([1, 2, 3, 4, 5] * 4),
+        )
+
+    def test_rejected_batch_not_counted(self):
+        # A batch rejected by the order size limit places no orders, so it
+        # doesn't use up the day's order count, and the three single orders
+        # that follow it are all placed.
+        def handle_data(algo, data):
+            with self.assertRaises(TradingControlViolation):
+                algo.batch_order([algo.sid(self.sid)] * 3, [1, 2, 5])
+            for i in range(3):
+                algo.order(algo.sid(self.sid), 1)
+                algo.order_count += 1
+
+        def initialize(algo):
+            algo.order_count = 0
+            algo.set_max_order_count(3)
+            algo.set_max_order_size(max_shares=4)
+
+        algo = TradingAlgorithm(initialize=initialize,
+                                handle_data=handle_data)
+        self.check_algo_succeeds(algo, handle_data, order_count=12)
+        self.assertEqual(len(algo.blotter.orders), 12)
+
+        # Nor does a batch rejected by the order count itself.
+        def handle_data(algo, data):
+            with self.assertRaises(TradingControlViolation):
+                algo.batch_order([algo.sid(self.sid)] * 4, [1, 1, 1, 1])
+            for i in range(3):
+                algo.order(algo.sid(self.sid), 1)
+                algo.order_count += 1
+
+        algo = SetMaxOrderCountAlgorithm(3)
+        self.check_algo_succeeds(algo, handle_data, order_count=12)
+
+    def test_validate_many_matches_validate(self):
+        dt = pd.Timestamp('2006-01-05', tz='UTC')
+        assets = [
+            Equity(sid,
+                   start_date=pd.Timestamp('2006-01-0%d' % (sid + 1),
+                                           tz='UTC'),
+                   end_date=pd.Timestamp('2006-01-0%d' % (sid + 4),
+                                         tz='UTC'))
+            for sid in range(6)
+        ]
+        portfolio = Portfolio()
+        current_data = BarData()
+        for asset in assets:
+            portfolio.positions[asset.sid].amount = (asset.sid - 3) * 10
+            current_data[asset.sid] = SIDData(asset.sid,
+                                              {'price': 1.0 + asset.sid})
+
+        rand = np.random.RandomState(0)
+        orders = rand.randint(len(assets), size=50)
+        batch_assets = [assets[i] for i in orders]
+        amounts = list(rand.randint(-40, 40, size=50))
+
+        for make_control in [
+            lambda: MaxOrderCount(20),
+            lambda: RestrictedListOrder([1, 4]),
+            lambda: MaxOrderSize(max_shares=30, max_notional=100.0),
+            lambda: MaxOrderSize(assets[2], max_notional=50.0),
+            lambda: MaxPositionSize(max_shares=30),
+            lambda: MaxPositionSize(assets[5], max_notional=80.0),
+            lambda: LongOnly(),
+            lambda: AssetDateBounds(),
+        ]:
+            control = make_control()
+            expected = []
+            for asset, amount in zip(batch_assets, amounts):
+                try:
+                    control.validate(asset, amount, portfolio, dt,
+                                     current_data)
+                except TradingControlViolation:
+                    expected.append(True)
+                else:
+                    expected.append(False)
+
+            np.testing.assert_array_equal(
+                make_control().validate_many(batch_assets, amounts,
+                                             portfolio, dt, current_data),
+                expected,
+                err_msg=repr(control),
+            )
+
 
 class TestAccountControls(TestCase):
 
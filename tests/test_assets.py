@@ -17,7 +17,11 @@
 Tests for the zipline.assets package
 """
 
+import os
+import shutil
+import sqlite3
 import sys
+import tempfile
 from unittest import TestCase
 
 from datetime import (
@@ -27,14 +31,27 @@ from datetime import (
 import pickle
 import uuid
 import warnings
+import numpy as np
 import pandas as pd
 
 from nose_parameterized import parameterized
 
-from zipline.assets import Asset, Equity, Future, AssetFinder
+from zipline.assets import (
+    Asset,
+    Equity,
+    Future,
+    AssetFinder,
+    SQLiteAssetFinder,
+    asset_array_to_sids,
+    sid_isin,
+    sid_searchsorted,
+)
 from zipline.errors import (
+    AssetDBVersionError,
+    SidNotFound,
     SymbolNotFound,
     MultipleSymbolsFound,
+    RootSymbolNotFound,
     SidAssignmentError,
 )
 
@@ -225,6 +242,52 @@ class AssetTestCase(TestCase):
                 'a' < Asset(3)
 
 
+class AssetArrayTestCase(TestCase):
+
+    def test_asset_array_to_sids(self):
+        assets = [Equity(3), Future(1), 2, Asset(7)]
+        sids = asset_array_to_sids(assets)
+        self.assertEqual(np.int64, sids.dtype)
+        np.testing.assert_array_equal([3, 1, 2, 7], sids)
+
+        np.testing.assert_array_equal(
+            [3, 1],
+            asset_array_to_sids(np.array([3, 1], dtype=np.int32)),
+        )
+        np.testing.assert_array_equal(
+            [3, 1],
+            asset_array_to_sids(pd.Index([Equity(3), Equity(1)])),
+        )
+
+    def test_retrieve_all(self):
+        finder = AssetFinder(metadata={0: {'symbol': 'A'},
+                                       1: {'symbol': 'B'}})
+        assets = finder.retrieve_all(np.array([1, 0, 1], dtype=np.int64))
+        self.assertEqual(object, assets.dtype)
+        self.assertEqual(['B', 'A', 'B'], [a.symbol for a in assets])
+        self.assertIs(assets[0], assets[2])
+
+        with self.assertRaises(SidNotFound):
+            finder.retrieve_all([0, 5])
+
+    def test_sid_isin(self):
+        result = sid_isin([Equity(1), 2, Equity(3), 4], [4, Equity(1), 1])
+        self.assertEqual(np.bool_, result.dtype)
+        np.testing.assert_array_equal([True, False, False, True], result)
+        np.testing.assert_array_equal([False], sid_isin([1], []))
+
+    def test_sid_searchsorted(self):
+        sorted_sids = [Equity(1), Equity(3), Equity(5)]
+        np.testing.assert_array_equal(
+            [0, 1, 2, 3],
+            sid_searchsorted(sorted_sids, [0, Equity(3), 4, 9]),
+        )
+        np.testing.assert_array_equal(
+            [2],
+            sid_searchsorted(sorted_sids, [3], side='right'),
+        )
+
+
 class TestFuture(TestCase):
     future = Future(
         2468,
@@ -474,6 +537,83 @@ class AssetFinderTestCase(TestCase):
         # Check that old data survived
         self.assertEqual('equity', finder.metadata_cache[0]['asset_type'])
 
+    def test_consume_metadata_frame_matches_dict(self):
+        start = pd.Timestamp('2013-1-1', tz='UTC')
+        end = pd.Timestamp('2014-1-1', tz='UTC')
+        frame = pd.DataFrame.from_records(
+            [
+                {
+                    'sid': 0,
+                    'file_name': 'AAPL',
+                    'company_name': 'Apple',
+                    'start_date_nano': start.value,
+                    'end_date_nano': end.value,
+                    'exchange': 'NASDAQ',
+                },
+                {
+                    'sid': 1,
+                    'symbol': 'CLF16',
+                    'root_symbol': 'CL',
+                    'asset_type': 'future',
+                    'start_date': '2015-01-01',
+                    'notice_date': '2015-12-20',
+                    'expiration_date': '2016-01-01',
+                    'contract_multiplier': 1000,
+                },
+            ],
+            index=['AAPL', 'CLF16'],
+        )
+
+        # A frame of new identifiers is consumed in bulk.
+        bulk_finder = AssetFinder(metadata=frame)
+        self.assertEqual({}, bulk_finder.metadata_cache)
+        self.assertEqual(2, len(bulk_finder.metadata_frame))
+
+        dict_finder = AssetFinder(metadata={
+            identifier: row.to_dict()
+            for identifier, row in frame.iterrows()
+        })
+
+        for sid in (0, 1):
+            bulk_asset = bulk_finder.retrieve_asset(sid)
+            dict_asset = dict_finder.retrieve_asset(sid)
+            self.assertIs(type(dict_asset), type(bulk_asset))
+            self.assertEqual(dict_asset.to_dict(), bulk_asset.to_dict())
+
+        dt = pd.Timestamp('2015-06-01', tz='UTC')
+        self.assertEqual(
+            [1],
+            [c.sid for c in bulk_finder.lookup_future_chain('CL', dt, dt)],
+        )
+
+    def test_update_bulk_metadata(self):
+        frame = pd.DataFrame(
+            {'symbol': ['PLAY', 'MSFT'], 'exchange': ['NASDAQ', None]},
+            index=['PLAY', 'MSFT'],
+        )
+        finder = AssetFinder(metadata=frame)
+
+        # Sids are assigned in insertion order, continuing past the
+        # bulk-loaded entries.
+        finder.consume_identifiers(['MSFT', 'GOOG'])
+        finder.populate_cache()
+        self.assertEqual(0, finder.lookup_symbol('PLAY', datetime.now()).sid)
+        self.assertEqual(1, finder.lookup_symbol('MSFT', datetime.now()).sid)
+        self.assertEqual(2, finder.lookup_symbol('GOOG', datetime.now()).sid)
+
+        # Updated entries move to the metadata_cache.
+        finder.insert_metadata('PLAY', exchange='NYSE')
+        finder.populate_cache()
+        self.assertEqual(['GOOG', 'MSFT', 'PLAY'],
+                         sorted(finder.metadata_cache))
+        self.assertEqual(0, len(finder.metadata_frame))
+        play = finder.lookup_symbol('PLAY', datetime.now())
+        self.assertEqual(0, play.sid)
+        self.assertEqual('NYSE', play.exchange)
+
+        finder.clear_metadata()
+        self.assertIsNone(finder.metadata_frame)
+
     def test_consume_asset_as_identifier(self):
 
         # Build some end dates
@@ -617,3 +757,174 @@ class AssetFinderTestCase(TestCase):
         pre_map = [asset201, asset2, asset200, asset1]
         post_map = finder.map_identifier_index_to_sids(pre_map, dt)
         self.assertListEqual([201, 2, 200, 1], post_map)
+
+
+class SQLiteAssetFinderTestCase(TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'assets.sqlite')
+
+        dates = pd.date_range('2013-01-01', freq='2D', periods=3, tz='UTC')
+        self.metadata = pd.DataFrame.from_records(
+            [
+                {
+                    'sid': i,
+                    'symbol': 'existing',
+                    'asset_name': 'existing',
+                    'start_date': date,
+                    'end_date': date + timedelta(days=1),
+                    'exchange': 'NYSE',
+                }
+                for i, date in enumerate(dates)
+            ] + [
+                {
+                    'sid': 10 + i,
+                    'symbol': symbol,
+                    'root_symbol': 'CL',
+                    'asset_type': 'future',
+                    'start_date': pd.Timestamp('2015-01-01', tz='UTC'),
+                    'notice_date': notice_date,
+                    'contract_multiplier': 1000,
+                }
+                for i, (symbol, notice_date) in enumerate([
+                    ('CLG15', pd.Timestamp('2015-01-20', tz='UTC')),
+                    ('CLF15', pd.Timestamp('2014-12-20', tz='UTC')),
+                ])
+            ],
+        )
+        self.metadata.index = self.metadata.sid.values
+        self.dates = dates
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir, True)
+
+    def test_persisted_lookups(self):
+        SQLiteAssetFinder(self.path, metadata=self.metadata).db.close()
+
+        finder = SQLiteAssetFinder(self.path)
+        self.assertEqual([0, 1, 2, 10, 11], finder.sids)
+
+        # Nothing is built until it is looked up.
+        self.assertEqual(0, len(finder.cache))
+        asset = finder.retrieve_asset(1)
+        self.assertEqual(1, len(finder.cache))
+        self.assertIsInstance(asset, Equity)
+        self.assertEqual('NYSE', asset.exchange)
+        self.assertEqual(self.dates[1], asset.start_date)
+        self.assertIs(asset, finder.retrieve_asset(1))
+        self.assertIsNone(finder.retrieve_asset(100, default_none=True))
+
+        for i, date in enumerate(self.dates):
+            self.assertEqual(
+                i,
+                finder.lookup_symbol_resolve_multiple('existing', date).sid,
+            )
+        with self.assertRaises(MultipleSymbolsFound):
+            finder.lookup_symbol_resolve_multiple('existing', None)
+        self.assertIsNone(finder.lookup_symbol('missing', self.dates[0]))
+
+        dt = pd.Timestamp('2014-12-01', tz='UTC')
+        knowledge_date = pd.Timestamp('2015-01-01', tz='UTC')
+        chain = finder.lookup_future_chain('CL', dt, knowledge_date)
+        self.assertEqual([11, 10], [c.sid for c in chain])
+        self.assertIsInstance(chain[0], Future)
+        self.assertEqual(1000, chain[0].contract_multiplier)
+        with self.assertRaises(RootSymbolNotFound):
+            finder.lookup_future_chain('XX', dt, knowledge_date)
+
+    def test_lru_eviction(self):
+        finder = SQLiteAssetFinder(self.path,
+                                   metadata=self.metadata,
+                                   cache_size=2)
+        for sid in finder.sids:
+            self.assertEqual(sid, finder.retrieve_asset(sid).sid)
+        self.assertEqual(2, len(finder.cache))
+
+    def test_update_metadata(self):
+        finder = SQLiteAssetFinder(self.path, metadata=self.metadata)
+
+        # Known identifiers are not re-inserted, and updates keep the
+        # fields they do not mention.
+        finder.consume_identifiers([0, 'existing'])
+        finder.consume_metadata({0: {'exchange': 'NASDAQ'}})
+        finder.populate_cache()
+        asset = finder.retrieve_asset(0)
+        self.assertEqual('NASDAQ', asset.exchange)
+        self.assertEqual('existing', asset.symbol)
+        self.assertEqual(self.dates[0], asset.start_date)
+
+        # New identifiers are assigned sids after the largest existing sid.
+        finder.consume_identifiers(['NEW'])
+        finder.populate_cache()
+        self.assertEqual(12, finder.lookup_symbol('NEW', self.dates[0]).sid)
+
+    def test_sid_assignment_non_contiguous(self):
+        metadata = self.metadata.loc[[1, 2]]
+        finder = SQLiteAssetFinder(self.path, metadata=metadata)
+        self.assertEqual([1, 2], finder.sids)
+
+        # Pending identifiers are assigned sids past each other.
+        finder.consume_identifiers(['A', 'B'])
+        finder.populate_cache()
+        self.assertEqual(3, finder.lookup_symbol('A', self.dates[0]).sid)
+        self.assertEqual(4, finder.lookup_symbol('B', self.dates[0]).sid)
+
+        # As are those of metadata frames, after those already written.
+        finder.consume_metadata(
+            pd.DataFrame({'asset_name': ['C', 'D']}, index=['C', 'D']),
+        )
+        finder.populate_cache()
+        self.assertEqual([1, 2, 3, 4, 5, 6], finder.sids)
+        self.assertEqual(2, finder.retrieve_asset(2).sid)
+
+    @parameterized.expand([
+        ('dict', dict),
+        ('frame', lambda metadata: pd.DataFrame.from_dict(metadata,
+                                                          orient='index')),
+    ])
+    def test_reconsume_symbol_metadata(self, name, make_metadata):
+        metadata = {
+            symbol: {
+                'asset_name': symbol.lower(),
+                'start_date': self.dates[0],
+                'end_date': self.dates[-1],
+                'exchange': 'NYSE',
+            }
+            for symbol in ['AAA', 'BBB', 'CCC']
+        }
+        SQLiteAssetFinder(self.path,
+                          metadata=make_metadata(metadata)).db.close()
+        finder = SQLiteAssetFinder(self.path)
+        sids = finder.sids
+        symbol_sids = {
+            symbol: finder.lookup_symbol(symbol, self.dates[0]).sid
+            for symbol in metadata
+        }
+        finder.db.close()
+
+        # Consuming the same metadata again updates the assets already
+        # stored rather than adding new ones.
+        metadata['BBB']['exchange'] = 'NASDAQ'
+        finder = SQLiteAssetFinder(self.path,
+                                   metadata=make_metadata(metadata))
+        self.assertEqual(sids, finder.sids)
+        for symbol in metadata:
+            # Raises MultipleSymbolsFound if the symbol has several assets.
+            self.assertEqual(
+                symbol_sids[symbol],
+                finder.lookup_symbol_resolve_multiple(symbol, None).sid,
+            )
+        self.assertEqual(
+            'NASDAQ',
+            finder.lookup_symbol('BBB', self.dates[0]).exchange,
+        )
+
+    def test_version_mismatch(self):
+        SQLiteAssetFinder(self.path).db.close()
+        conn = sqlite3.connect(self.path)
+        conn.execute('PRAGMA user_version = 1000')
+        conn.close()
+
+        with self.assertRaises(AssetDBVersionError):
+            SQLiteAssetFinder(self.path)
@@ -0,0 +1,223 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for checkpointing and resuming simulations.
+"""
+from functools import partial
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from nose_parameterized import parameterized
+from pandas.util.testing import assert_frame_equal
+
+from zipline.algorithm import TradingAlgorithm
+from zipline.errors import InvalidCheckpoint
+from zipline.utils import factory
+from zipline.utils.checkpoint import read_checkpoint
+from zipline.utils.events import date_rules, time_rules
+from zipline.utils.fork import fork
+
+
+class Crash(Exception):
+    pass
+
+
+def make_algo(sim_params, crash_at=None):
+    def scheduled(context, data):
+        context.scheduled += 1
+
+    def initialize(context):
+        context.bars = 0
+        context.order_size = 10
+        context.scheduled = 0
+        context.add_history(3, '1d', 'price')
+        context.schedule_function(scheduled, date_rules.every_day(),
+                                  time_rules.market_open())
+
+    def handle_data(context, data):
+        if context.bars == crash_at:
+            raise Crash()
+        context.bars += 1
+        context.order(context.sid(0), context.order_size)
+        context.record(
+            bars=context.bars,
+            scheduled=context.scheduled,
+            mean=context.history(3, '1d', 'price')[0].mean(),
+        )
+
+    return TradingAlgorithm(initialize=initialize,
+                            handle_data=handle_data,
+                            sim_params=sim_params)
+
+
+def make_source(sim_params):
+    if sim_params.data_frequency == 'daily':
+        return factory.create_test_df_source(sim_params)[0]
+    return factory.create_minutely_trade_source(
+        [0], sim_params=sim_params, concurrent=True,
+    )
+
+
+class CheckpointTestCase(TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'algo.ckpt')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    @parameterized.expand([
+        # Crashes on the fifth day, after four checkpoints.
+        ('daily', 10, 4, 4),
+        # Crashes ten minutes into the second day.
+        ('minute', 2, 400, 390),
+    ])
+    def test_resume_matches_uninterrupted_run(self, frequency, num_days,
+                                              crash_at, checkpointed_bars):
+        sim_params = factory.create_simulation_parameters(
+            num_days=num_days,
+            data_frequency=frequency,
+            emission_rate='daily',
+        )
+        expected = make_algo(sim_params).run(make_source(sim_params))
+
+        crashing = make_algo(sim_params, crash_at=crash_at)
+        with self.assertRaises(Crash):
+            crashing.run(make_source(sim_params),
+                         checkpoint_path=self.path)
+
+        checkpoint = read_checkpoint(self.path)
+        self.assertEqual(checkpoint.algo_state['context']['bars'],
+                         checkpointed_bars)
+        self.assertEqual(len(checkpoint.read_perfs()),
+                         (expected['bars'] <= checkpointed_bars).sum())
+
+        resumed = make_algo(sim_params)
+        result = resumed.run(make_source(sim_params),
+                             resume_from=self.path)
+
+        self.assert_stats_equal(result, expected)
+        self.assertEqual(resumed.bars, expected['bars'].iloc[-1])
+        self.assertEqual(resumed.scheduled, num_days)
+
+    def assert_stats_equal(self, result, expected):
+        # Order ids are random, so orders and transactions are compared
+        # by their other fields.
+        result, expected = result.copy(), expected.copy()
+        for column in ('orders', 'transactions'):
+            self.assertEqual(
+                [[dict(o, id=None, order_id=None) for o in row]
+                 for row in result.pop(column)],
+                [[dict(o, id=None, order_id=None) for o in row]
+                 for row in expected.pop(column)],
+            )
+        assert_frame_equal(result, expected)
+
+    def test_resume_from_earlier_checkpoint(self):
+        sim_params = factory.create_simulation_parameters(num_days=6)
+        expected = make_algo(sim_params).run(make_source(sim_params))
+
+        # Keep a copy of the second of several checkpoints.
+        make_algo(sim_params).run(make_source(sim_params),
+                                  checkpoint_path=self.path,
+                                  stop_at=sim_params.trading_days[1])
+        second = os.path.join(self.tempdir, 'second.ckpt')
+        shutil.copy(self.path, second)
+        make_algo(sim_params).run(make_source(sim_params),
+                                  checkpoint_path=self.path,
+                                  resume_from=self.path)
+        self.assertEqual(read_checkpoint(second).perf_count, 2)
+        self.assertEqual(read_checkpoint(self.path).perf_count, 6)
+
+        # Only the perf messages up to the second checkpoint are read back,
+        # although the perf log has grown since.
+        result = make_algo(sim_params).run(make_source(sim_params),
+                                           resume_from=second)
+        self.assertTrue(result.index.is_unique)
+        self.assert_stats_equal(result, expected)
+
+    def test_checkpoint_every(self):
+        sim_params = factory.create_simulation_parameters(num_days=10)
+        with self.assertRaises(Crash):
+            make_algo(sim_params, crash_at=7).run(
+                make_source(sim_params),
+                checkpoint_path=self.path,
+                checkpoint_every=3,
+            )
+        self.assertEqual(read_checkpoint(self.path).algo_state['context']
+                         ['bars'], 6)
+
+        with self.assertRaises(ValueError):
+            make_algo(sim_params).run(make_source(sim_params),
+                                      checkpoint_path=self.path,
+                                      checkpoint_every=0)
+
+    def test_invalid_checkpoint(self):
+        sim_params = factory.create_simulation_parameters(num_days=5)
+        make_algo(sim_params).run(make_source(sim_params),
+                                  checkpoint_path=self.path)
+
+        other_params = factory.create_simulation_parameters(num_days=6)
+        with self.assertRaises(InvalidCheckpoint):
+            make_algo(other_params).run(make_source(other_params),
+                                        resume_from=self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not a checkpoint')
+        with self.assertRaises(InvalidCheckpoint):
+            read_checkpoint(self.path)
+
+    @parameterized.expand([
+        ('in_process', 1),
+        ('in_workers', 2),
+    ])
+    def test_fork(self, name, processes):
+        sim_params = factory.create_simulation_parameters(num_days=10)
+        prefix = make_algo(sim_params).run(
+            make_source(sim_params),
+            checkpoint_path=self.path,
+            stop_at=sim_params.trading_days[3],
+        )
+        self.assertEqual(list(prefix['bars']), [1, 2, 3, 4])
+
+        same, doubled = fork(
+            self.path,
+            partial(make_algo, sim_params),
+            partial(make_source, sim_params),
+            [{}, {'order_size': 20}],
+            processes=processes,
+        )
+        expected = make_algo(sim_params).run(make_source(sim_params))
+
+        assert_frame_equal(same.drop(['orders', 'transactions'], axis=1),
+                           expected.drop(['orders', 'transactions'], axis=1))
+
+        def amounts(stats):
+            return [[txn['amount'] for txn in row]
+                    for row in stats['transactions']]
+
+        self.assertEqual(amounts(doubled)[:5], amounts(expected)[:5])
+        self.assertEqual(
+            amounts(doubled)[5:],
+            [[2 * a for a in row] for row in amounts(expected)[5:]],
+        )
+
+        with self.assertRaises(ValueError):
+            make_algo(sim_params).run(make_source(sim_params),
+                                      resume_context={'order_size': 20})
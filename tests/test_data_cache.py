@@ -0,0 +1,162 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for the binary market data cache and offline loading.
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import patch
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_series_equal
+
+from zipline.data import loader
+from zipline.data.cache import (
+    CacheFormatError,
+    file_signature,
+    read_cache,
+    read_cache_header,
+    write_cache,
+)
+from zipline.errors import MarketDataNotFound, StaleMarketData
+
+
+class MarketDataCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.dates = pd.date_range('2015-01-02', periods=5, tz='UTC')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_series_round_trip(self):
+        path = os.path.join(self.tempdir, 'bm.npz')
+        returns = pd.Series([0.01, -0.02, 0.0, np.nan, 0.03],
+                            index=self.dates)
+        write_cache(path, returns, 'benchmark', 'yahoo')
+
+        loaded, header = read_cache(path)
+        assert_series_equal(loaded, returns)
+        self.assertEqual(header['kind'], 'benchmark')
+        self.assertEqual(header['source'], 'yahoo')
+        self.assertEqual(header['length'], 5)
+        self.assertEqual(pd.Timestamp(header['start']), self.dates[0])
+        self.assertEqual(pd.Timestamp(header['end']), self.dates[-1])
+        self.assertEqual(read_cache_header(path), header)
+
+    def test_frame_drops_non_numeric_columns(self):
+        path = os.path.join(self.tempdir, 'curves.npz')
+        curves = pd.DataFrame(
+            {
+                '1month': [0.01, 0.02, None, 0.04, 0.05],
+                'date': ['2015-01-0%d' % i for i in range(2, 7)],
+                'tid': range(5),
+            },
+            index=self.dates,
+            dtype=object,
+        )
+        write_cache(path, curves, 'treasury_curves', 'data.treasury.gov')
+
+        loaded, _ = read_cache(path)
+        self.assertEqual(list(loaded.columns), ['1month', 'tid'])
+        np.testing.assert_array_equal(
+            loaded['1month'].values, [0.01, 0.02, np.nan, 0.04, 0.05],
+        )
+        self.assertTrue(loaded.index.equals(self.dates))
+
+    def test_bad_cache(self):
+        path = os.path.join(self.tempdir, 'bad.npz')
+        np.savez(path, header=np.array('{"version": -1}'))
+        with self.assertRaises(CacheFormatError):
+            read_cache(path)
+
+        with self.assertRaises(IOError):
+            read_cache(os.path.join(self.tempdir, 'missing.npz'))
+
+    def test_offline_load_market_data(self):
+        with patch.object(loader, 'DATA_PATH', self.tempdir):
+            with self.assertRaises(MarketDataNotFound):
+                loader.load_market_data(offline=True)
+
+            # A cache that ends long ago is stale.
+            write_cache(
+                os.path.join(self.tempdir, '^GSPC_benchmark.npz'),
+                pd.Series(0.0, index=self.dates),
+                'benchmark',
+                'yahoo',
+            )
+            with self.assertRaises(StaleMarketData):
+                loader.load_market_data(offline=True)
+
+            os.environ['ZIPLINE_OFFLINE'] = '1'
+            try:
+                with self.assertRaises(StaleMarketData):
+                    loader.load_market_data()
+            finally:
+                del os.environ['ZIPLINE_OFFLINE']
+
+    def test_cache_rebuilt_from_changed_csv(self):
+        filename = 'returns.csv'
+        csv_path = os.path.join(self.tempdir, filename)
+
+        def write_csv(returns):
+            pd.DataFrame({'returns': returns}, index=self.dates).to_csv(
+                csv_path,
+            )
+
+        def read_csv(path):
+            return pd.read_csv(path, index_col=0, parse_dates=True)['returns']
+
+        with patch.object(loader, 'DATA_PATH', self.tempdir):
+            write_csv([0.01] * 5)
+            data, source = loader._read_cached(filename, read_csv)
+            self.assertEqual(source, 'csv')
+            cache_path = os.path.join(self.tempdir, 'returns.npz')
+            self.assertEqual(read_cache_header(cache_path)['source_file'],
+                             file_signature(csv_path))
+
+            # The CSV is read from the cache while unchanged, whatever the
+            # cache's source.
+            write_cache(cache_path, data, 'returns', 'yahoo',
+                        source_file=file_signature(csv_path))
+            _, source = loader._read_cached(filename, read_csv)
+            self.assertEqual(source, 'yahoo')
+
+            # Data copied over the CSV replaces the cache.
+            write_csv([0.002] * 5)
+            data, source = loader._read_cached(filename, read_csv)
+            self.assertEqual(source, 'csv')
+            np.testing.assert_array_equal(data.values, [0.002] * 5)
+
+            # As does a CSV edited without changing its size.
+            write_csv([0.003] * 5)
+            stat = os.stat(csv_path)
+            os.utime(csv_path, (stat.st_atime, stat.st_mtime + 10))
+            data, _ = loader._read_cached(filename, read_csv)
+            np.testing.assert_array_equal(data.values, [0.003] * 5)
+            data, source = loader._read_cached(filename, read_csv)
+            self.assertEqual(source, 'csv')
+            self.assertEqual(read_cache_header(cache_path)['source_file'],
+                             file_signature(csv_path))
+
+            # Without its CSV, the cache is used as is.
+            os.remove(csv_path)
+            data, _ = loader._read_cached(filename, read_csv)
+            np.testing.assert_array_equal(data.values, [0.003] * 5)
@@ -0,0 +1,170 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for futures chain roll calendars.
+"""
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from zipline.assets import (
+    AssetFinder,
+    ExpirationRoll,
+    FutureChainIndex,
+    NoticeDateRoll,
+    RollCalendar,
+    VolumeRoll,
+)
+from zipline.errors import RootSymbolNotFound
+
+
+def ts(date):
+    return pd.Timestamp(date, tz='UTC')
+
+
+class RollCalendarTestCase(TestCase):
+
+    def setUp(self):
+        self.finder = AssetFinder(metadata={
+            0: {
+                'symbol': 'CLF15',
+                'root_symbol': 'CL',
+                'asset_type': 'future',
+                'start_date': ts('2014-01-01'),
+                'notice_date': ts('2014-12-20'),
+                'expiration_date': ts('2014-12-22'),
+            },
+            1: {
+                'symbol': 'CLG15',
+                'root_symbol': 'CL',
+                'asset_type': 'future',
+                'start_date': ts('2014-01-01'),
+                'notice_date': ts('2015-01-20'),
+                'expiration_date': ts('2015-01-22'),
+            },
+            2: {
+                'symbol': 'CLH15',
+                'root_symbol': 'CL',
+                'asset_type': 'future',
+                'start_date': ts('2014-01-01'),
+                'notice_date': ts('2015-02-20'),
+                'expiration_date': ts('2015-02-22'),
+            },
+        })
+        self.contracts = self.finder.lookup_future_contracts('CL')
+
+    def test_notice_date_roll(self):
+        calendar = RollCalendar.from_rule('CL', self.contracts,
+                                          NoticeDateRoll())
+
+        self.assertEqual(calendar.front_contract(ts('2014-12-01')).sid, 0)
+        # The roll happens on the notice date itself.
+        self.assertEqual(calendar.front_contract(ts('2014-12-20')).sid, 1)
+        self.assertEqual(calendar.front_contract(ts('2015-02-19')).sid, 2)
+        self.assertIsNone(calendar.front_contract(ts('2015-03-01')))
+
+        dts = pd.date_range('2014-12-18', '2015-03-01', freq='10D', tz='UTC')
+        expected = [
+            None if c is None else c.sid
+            for c in (calendar.front_contract(dt) for dt in dts)
+        ]
+        self.assertEqual(
+            [None if c is None else c.sid
+             for c in calendar.front_contracts(dts)],
+            expected,
+        )
+
+        schedule = calendar.roll_schedule()
+        self.assertEqual(list(schedule.index),
+                         [ts('2014-12-20'), ts('2015-01-20')])
+        self.assertEqual([c.sid for c in schedule], [1, 2])
+
+    def test_expiration_roll(self):
+        calendar = RollCalendar.from_rule('CL', self.contracts,
+                                          ExpirationRoll(5))
+        self.assertEqual(calendar.front_contract(ts('2014-12-16')).sid, 0)
+        self.assertEqual(calendar.front_contract(ts('2014-12-17')).sid, 1)
+
+        sessions = pd.date_range('2014-12-01', '2015-03-01', freq='B',
+                                 tz='UTC')
+        calendar = RollCalendar.from_rule('CL', self.contracts,
+                                          ExpirationRoll(2, sessions))
+        # Monday the 22nd expires, so roll two sessions earlier, on Thursday.
+        self.assertEqual(calendar.front_contract(ts('2014-12-17')).sid, 0)
+        self.assertEqual(calendar.front_contract(ts('2014-12-18')).sid, 1)
+
+    def test_volume_roll(self):
+        sessions = pd.date_range('2014-12-01', '2015-02-28', tz='UTC')
+        volumes = pd.DataFrame(
+            {0: 100.0, 1: 10.0, 2: 1.0},
+            index=sessions,
+        )
+        # Contract 1 overtakes contract 0 on the 10th, so the roll happens
+        # on the 11th.  Contract 2 never overtakes contract 1, so that roll
+        # falls back on the notice date.
+        volumes.loc[ts('2014-12-10'):, 1] = 1000.0
+        calendar = RollCalendar.from_rule('CL', self.contracts,
+                                          VolumeRoll(volumes))
+
+        self.assertEqual(calendar.front_contract(ts('2014-12-10')).sid, 0)
+        self.assertEqual(calendar.front_contract(ts('2014-12-11')).sid, 1)
+        self.assertEqual(calendar.front_contract(ts('2015-01-19')).sid, 1)
+        self.assertEqual(calendar.front_contract(ts('2015-01-20')).sid, 2)
+
+    def test_continuous_prices(self):
+        calendar = RollCalendar.from_rule('CL', self.contracts,
+                                          NoticeDateRoll())
+        dts = pd.DatetimeIndex(
+            [ts('2014-12-19'), ts('2014-12-20'), ts('2015-01-19'),
+             ts('2015-01-20'), ts('2015-01-21')],
+        )
+        prices = pd.DataFrame(
+            {
+                0: [10.0, 11.0, np.nan, np.nan, np.nan],
+                1: [12.0, 14.0, 15.0, 16.0, np.nan],
+                2: [np.nan, np.nan, np.nan, 32.0, 33.0],
+            },
+            index=dts,
+        )
+
+        raw = calendar.continuous_prices(prices)
+        np.testing.assert_array_equal(raw.values,
+                                      [10.0, 14.0, 15.0, 32.0, 33.0])
+        self.assertEqual(raw.name, 'CL')
+
+        # Gaps at the rolls are 14 - 11 = 3 and 32 - 16 = 16.
+        added = calendar.continuous_prices(prices, adjustment='add')
+        np.testing.assert_array_equal(added.values,
+                                      [29.0, 30.0, 31.0, 32.0, 33.0])
+
+        # Ratios at the rolls are 14 / 11 and 32 / 16.
+        scaled = calendar.continuous_prices(prices, adjustment='mul')
+        np.testing.assert_allclose(
+            scaled.values,
+            [10.0 * 14 / 11 * 2, 28.0, 30.0, 32.0, 33.0],
+        )
+
+        with self.assertRaises(ValueError):
+            calendar.continuous_prices(prices, adjustment='log')
+
+    def test_future_chain_index(self):
+        index = FutureChainIndex(self.finder)
+        self.assertEqual(index.front_contract('CL', ts('2015-01-01')).sid, 1)
+        self.assertIs(index.calendar('CL'), index.calendar('CL'))
+
+        with self.assertRaises(RootSymbolNotFound):
+            index.calendar('XX')
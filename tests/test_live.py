@@ -0,0 +1,245 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for running algorithms with zipline.live.
+"""
+from datetime import timedelta
+import sys
+import time
+from unittest import TestCase, skipIf
+
+from nose_parameterized import parameterized
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from zipline.algorithm import TradingAlgorithm
+from zipline.finance.execution import LimitOrder
+from zipline.sources import DataFrameSource, SpecificEquityTrades
+from zipline.utils import factory
+from zipline.utils.events import date_rules, time_rules
+
+if sys.version_info >= (3, 5):
+    from zipline.live import (
+        LiveRunner,
+        SimulatedBroker,
+        SimulatedFeed,
+        paced_replay,
+    )
+
+    # Kept out of this module, which older interpreters must be able to
+    # import to skip its tests, as async def is Python 3.5 syntax.
+    from .live_brokers import RecordingBroker
+
+
+def make_algo(sim_params):
+    def scheduled(context, data):
+        context.scheduled += 1
+
+    def initialize(context):
+        context.bars = 0
+        context.scheduled = 0
+        context.schedule_function(scheduled, date_rules.every_day(),
+                                  time_rules.market_open())
+
+    def handle_data(context, data):
+        context.bars += 1
+        context.order(context.sid(0), 10)
+        context.record(bars=context.bars, scheduled=context.scheduled)
+
+    return TradingAlgorithm(initialize=initialize,
+                            handle_data=handle_data,
+                            sim_params=sim_params)
+
+
+def make_source(sim_params):
+    if sim_params.data_frequency == 'daily':
+        return factory.create_test_df_source(sim_params)[0]
+    return factory.create_minutely_trade_source(
+        [0], sim_params=sim_params, concurrent=True,
+    )
+
+
+@skipIf(sys.version_info < (3, 5), "zipline.live requires Python 3.5")
+class LiveRunnerTestCase(TestCase):
+
+    @parameterized.expand([
+        ('daily', 'daily', 5),
+        ('minute', 'daily', 2),
+        ('minute', 'minute', 2),
+    ])
+    def test_simulated_broker_matches_backtest(self, data_frequency,
+                                               emission_rate, num_days):
+        sim_params = factory.create_simulation_parameters(
+            num_days=num_days,
+            data_frequency=data_frequency,
+            emission_rate=emission_rate,
+        )
+        expected = make_algo(sim_params).run(make_source(sim_params))
+
+        algo = make_algo(sim_params)
+        runner = LiveRunner(
+            algo,
+            [SimulatedFeed([make_source(sim_params)])],
+            SimulatedBroker(),
+        )
+        result = runner.run()
+
+        # Order ids are random, so orders and transactions are compared
+        # by their other fields.
+        for column in ('orders', 'transactions'):
+            self.assertEqual(
+                [[dict(o, id=None, order_id=None) for o in row]
+                 for row in result.pop(column)],
+                [[dict(o, id=None, order_id=None) for o in row]
+                 for row in expected.pop(column)],
+            )
+        assert_frame_equal(result, expected)
+        self.assertEqual(algo.scheduled, num_days)
+        self.assertEqual(sum('daily_perf' in perf for perf in runner.perfs),
+                         len(expected))
+        self.assertIn('one_month', runner.perfs[-1])
+
+    def test_orders_routed_to_broker(self):
+        sim_params = factory.create_simulation_parameters(num_days=4)
+
+        def initialize(context):
+            context.order_id = None
+
+        def handle_data(context, data):
+            if context.order_id is None:
+                context.order_id = context.order(context.sid(0), 10,
+                                                 style=LimitOrder(1))
+            else:
+                context.cancel_order(context.order_id)
+
+        algo = TradingAlgorithm(initialize=initialize,
+                                handle_data=handle_data,
+                                sim_params=sim_params)
+        broker = RecordingBroker()
+        result = LiveRunner(
+            algo,
+            [SimulatedFeed([make_source(sim_params)])],
+            broker,
+        ).run()
+
+        self.assertEqual(broker.submitted, [algo.order_id])
+        self.assertEqual(broker.cancelled, [algo.order_id])
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result.orders[0][0]['status'], 0)
+        self.assertEqual(result.orders[1][0]['status'], 2)
+
+    def test_feeds_merged_by_dt(self):
+        sim_params = factory.create_simulation_parameters(num_days=3)
+        sources = [
+            DataFrameSource(pd.DataFrame({sid: 10.0},
+                                         index=sim_params.trading_days))
+            for sid in (0, 1)
+        ]
+
+        def initialize(context):
+            context.seen = []
+
+        def handle_data(context, data):
+            context.seen.append(sorted(data.keys()))
+
+        algo = TradingAlgorithm(initialize=initialize,
+                                handle_data=handle_data,
+                                sim_params=sim_params)
+        LiveRunner(
+            algo,
+            [SimulatedFeed([source]) for source in sources],
+            RecordingBroker(),
+        ).run()
+
+        self.assertEqual(algo.seen, [[0, 1]] * 3)
+
+
+@skipIf(sys.version_info < (3, 5), "zipline.live requires Python 3.5")
+class PacedReplayTestCase(TestCase):
+
+    def setUp(self):
+        self.sim_params = factory.create_simulation_parameters(
+            num_days=1,
+            data_frequency='minute',
+        )
+        # 20 minutes, replayed 3000 times faster: a bar every 20ms.
+        start = self.sim_params.first_open
+        self.source = SpecificEquityTrades(
+            sids=[0],
+            start=start,
+            end=start + timedelta(minutes=20),
+            delta=timedelta(minutes=1),
+        )
+        self.speed = 3000
+
+    def test_replay_paced(self):
+        def initialize(context):
+            context.bars = 0
+
+        def handle_data(context, data):
+            context.bars += 1
+            context.order(context.sid(0), 10)
+
+        algo = TradingAlgorithm(initialize=initialize,
+                                handle_data=handle_data,
+                                sim_params=self.sim_params)
+        start = time.time()
+        result, runner = paced_replay(algo, [self.source], speed=self.speed,
+                                      fill_latency=0.005)
+        elapsed = time.time() - start
+
+        self.assertEqual(algo.bars, 20)
+        self.assertGreaterEqual(elapsed, 19 * 0.02)
+        self.assertAlmostEqual(runner.budget, 0.02)
+
+        report = runner.latency_report()
+        self.assertEqual(report['bars'], 20)
+        self.assertEqual(report['overruns'], 0)
+        self.assertEqual(runner.overruns, [])
+        # The latencies are those timed by the algorithm's EventManager.
+        self.assertEqual(list(algo.event_timing_stats['count']), [20])
+        self.assertEqual(runner.latencies[-1],
+                         algo.event_manager.last_bar_time)
+
+        # Fills are reported after the bar they are made on, and applied
+        # before the next one, so that the order filled on the last bar is
+        # left out.
+        self.assertEqual(result.positions[0][0]['amount'], 180)
+
+    def test_overruns_reported(self):
+        def initialize(context):
+            context.bars = 0
+
+        def handle_data(context, data):
+            context.bars += 1
+            if context.bars % 5 == 0:
+                time.sleep(0.06)
+
+        algo = TradingAlgorithm(initialize=initialize,
+                                handle_data=handle_data,
+                                sim_params=self.sim_params)
+        _, runner = paced_replay(algo, [self.source], speed=self.speed)
+
+        frame = runner.latency_frame()
+        self.assertEqual(len(frame), 20)
+        self.assertEqual(list(frame.index[frame.overrun]),
+                         list(frame.index[4::5]))
+        self.assertEqual(runner.overruns, list(frame.index[4::5]))
+        self.assertEqual(runner.latency_report()['overruns'], 4)
+        self.assertGreaterEqual(runner.latency_report()['max'], 0.06)
+        # The bars after an overrun are asked for late.
+        feed = runner.feeds[0]
+        self.assertGreater(feed.lags[5], 0.02)
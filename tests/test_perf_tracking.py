@@ -442,6 +442,40 @@ class TestCommissionEvents(unittest.TestCase):
                                    rtol=1e-3)
         self.assertEqual(0, account['accrued_interest'])
 
+    def test_commission_calculate_many(self):
+        events = factory.create_trade_history(
+            1,
+            [10, 10, 10, 10, 10],
+            [100, 100, 100, 100, 100],
+            oneday,
+            self.sim_params
+        )
+        transactions = [create_txn(events[0], price, amount)
+                        for price, amount in [(20, 50), (21, -100), (22, 150)]]
+        amounts = [txn.amount for txn in transactions]
+        prices = [txn.price for txn in transactions]
+        order_ids = [txn.order_id for txn in transactions]
+
+        models = [PerShare(cost=0.01),
+                  PerShare(cost=0.01, min_trade_cost=1.00),
+                  PerTrade(cost=5.00),
+                  PerDollar(cost=0.0015)]
+        for model in models:
+            per_share, commissions = model.calculate_many(amounts, prices,
+                                                          order_ids)
+            expected_per_share, expected_commissions = zip(
+                *map(model.calculate, transactions)
+            )
+            np.testing.assert_allclose(per_share, expected_per_share)
+            np.testing.assert_allclose(commissions, expected_commissions)
+
+        # PerTrade charges one trade per order, spread over its fills.
+        per_share, commissions = PerTrade(cost=5.00).calculate_many(
+            [10, 30, -20, 0], [20, 20, 20, 20], ['a', 'a', 'b', 'c'],
+        )
+        np.testing.assert_allclose(per_share, [0.125, 0.125, 0.25, 0])
+        np.testing.assert_allclose(commissions, [1.25, 3.75, 5.0, 0])
+
     def test_commission_zero_position(self):
         """
         Ensure no div-by-zero errors.
@@ -1937,6 +1971,8 @@ class TestPerformanceTracker(unittest.TestCase):
             events, operator.attrgetter('dt'))
 
         messages = {}
+        deltas = {}
+        scalars = None
         for date, group in grouped_events:
             tracker.set_date(date)
             for event in group:
@@ -1951,6 +1987,9 @@ class TestPerformanceTracker(unittest.TestCase):
             tracker.handle_minute_close(date)
             msg = tracker.to_dict()
             messages[date] = msg
+            deltas[date], scalars = tracker.to_minute_delta(
+                scalars, {'minute': date},
+            )
 
         self.assertEquals(2, len(messages))
 
@@ -1985,6 +2024,33 @@ class TestPerformanceTracker(unittest.TestCase):
         self.assertIsNone(msg_1['cumulative_risk_metrics']['sharpe'])
         self.assertIsNotNone(msg_2['cumulative_risk_metrics']['sharpe'])
 
+        # Delta messages hold what changed since the previous minute:
+        # everything for the first one.  Applying them in turn gives the
+        # scalars of the full messages.
+        state = {'recorded_vars': {}}
+        for dt, msg in [(foo_event_1.dt, msg_1), (foo_event_2.dt, msg_2)]:
+            msg['minute_perf']['recorded_vars'] = {'minute': dt}
+            delta = deltas[dt]['minute_perf_delta']
+            self.assertEqual(delta['dt'], dt)
+            self.assertEqual(
+                len(delta['minute_perf'].pop('transactions')),
+                len(msg['minute_perf']['transactions']),
+            )
+            self.assertEqual(len(delta['minute_perf'].pop('orders')),
+                             len(msg['minute_perf']['orders']))
+            state['recorded_vars'].update(
+                delta['minute_perf'].pop('recorded_vars'))
+            for section in ('cumulative_perf', 'minute_perf',
+                            'cumulative_risk_metrics'):
+                state.setdefault(section, {}).update(delta[section])
+
+            self.assertEqual(state,
+                             perf.PerformanceTracker.minute_scalars(msg))
+
+        self.assertNotIn('starting_cash', delta['cumulative_perf'])
+        self.assertIn('period_close', delta['minute_perf'])
+        self.assertNotIn('positions', delta['minute_perf'])
+
         check_perf_tracker_serialization(tracker)
 
     @with_environment()
@@ -2060,6 +2126,41 @@ class TestPerformanceTracker(unittest.TestCase):
         # frame
         self.assertNotIn(1, perf_tracker.dividend_frame['sid'].values)
 
+    def test_dividend_schedule_matches_frame(self):
+        days = pd.date_range('2014-01-02', periods=20, freq='B', tz='UTC')
+        rand = np.random.RandomState(0)
+        dividend_frame = pd.DataFrame({
+            'sid': rand.randint(10, size=100),
+            'declared_date': days[0],
+            'ex_date': days[rand.randint(10, size=100)],
+            'pay_date': days[rand.randint(10, 20, size=100)],
+            'net_amount': rand.uniform(size=100),
+            'gross_amount': np.nan,
+            'payment_sid': np.nan,
+            'ratio': np.nan,
+        })
+
+        perf_tracker = perf.PerformanceTracker(
+            factory.create_simulation_parameters(num_days=20),
+        )
+        # Added in two batches, to check that ids and indexes are kept
+        # across updates.
+        perf_tracker.update_dividends(dividend_frame.iloc[:60].copy())
+        perf_tracker.update_dividends(dividend_frame.iloc[60:].copy())
+        perf_tracker.handle_sid_removed_from_universe(3)
+
+        expected = perf_tracker.dividend_frame
+        self.assertEqual(len(expected), (dividend_frame.sid != 3).sum())
+        for day in days:
+            for field, found in [
+                ('ex_date', perf_tracker._dividends.going_ex(day)),
+                ('pay_date', perf_tracker._dividends.paid(day)),
+            ]:
+                self.assertEqual(
+                    sorted(found['id']),
+                    sorted(expected['id'][expected[field] == day]),
+                )
+
     def test_serialization(self):
         start_dt = datetime(year=2008,
                             month=10,
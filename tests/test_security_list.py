@@ -149,6 +149,35 @@ class SecurityListTestCase(TestCase):
             self.assertNotIn("BZQ", rl.leveraged_etf_list)
             self.assertNotIn("URTY", rl.leveraged_etf_list)
 
+    @with_environment()
+    def test_restricted_matches_membership(self, env=None):
+        first_kd = list(LEVERAGED_ETFS.keys())[0]
+        dates = [first_kd - timedelta(days=1),
+                 first_kd,
+                 self.extra_knowledge_date]
+        assets = [env.asset_finder.lookup_symbol(
+            symbol, as_of_date=self.extra_knowledge_date)
+            for symbol in ["BZQ", "URTY", "JFT", "AAPL", "GOOG"]]
+
+        with security_list_copy():
+            add_security_data(['AAPL'], ['BZQ'])
+            for dt in dates:
+                rl = SecurityListSet(lambda: dt).leveraged_etf_list
+                expected = [asset in rl for asset in assets]
+                self.assertEqual(list(rl.restricted(assets)), expected)
+                self.assertEqual(
+                    list(rl.restricted([a.sid for a in assets])), expected)
+                self.assertEqual(set(rl), rl.current_securities(dt))
+
+            # Nothing is known before the first knowledge date, and each
+            # later knowledge date applies its changes.
+            self.assertEqual(rl.current_securities(dates[0]), frozenset())
+            before, after = (rl.current_securities(dt) for dt in dates[1:])
+            self.assertIn(assets[0].sid, before)
+            self.assertNotIn(assets[0].sid, after)
+            self.assertNotIn(assets[3].sid, before)
+            self.assertIn(assets[3].sid, after)
+
     def test_algo_without_rl_violation_via_check(self):
         sim_params = factory.create_simulation_parameters(
             start=list(LEVERAGED_ETFS.keys())[0], num_days=4)
@@ -171,3 +171,54 @@ class TestRandomWalkSource(TestCase):
             self.assertGreater(event.price, 0,
                                "price should never go negative.")
             self.assertEqual(event.dt.hour, 0)
+
+    def test_seed_and_batches(self):
+        start_prices = {sid: 100.0 for sid in range(50)}
+        start = pd.Timestamp('1990-01-02', tz='UTC')
+        end = pd.Timestamp('1990-01-04', tz='UTC')
+
+        def make_source():
+            return RandomWalkSource(start_prices=start_prices,
+                                    calendar=calendar_nyse, start=start,
+                                    end=end, seed=42)
+
+        batches = list(make_source().bar_batches())
+        # Three full sessions of minutes.
+        self.assertEqual(len(batches), 3 * 390)
+
+        # Events are the batches flattened, and the same seed gives the same
+        # walk.
+        events = list(make_source())
+        self.assertEqual(len(events), 50 * len(batches))
+        for i, event in enumerate(events):
+            batch = batches[i // 50]
+            self.assertEqual(event.dt, batch['dt'])
+            self.assertEqual(event.sid, batch['sid'][i % 50])
+            self.assertEqual(event.price, batch['price'][i % 50])
+
+    def test_factor_loadings(self):
+        start_prices = {sid: 100.0 for sid in range(20)}
+        start = pd.Timestamp('1990-01-02', tz='UTC')
+        end = pd.Timestamp('1990-03-01', tz='UTC')
+
+        def steps(factor_loadings):
+            source = RandomWalkSource(start_prices=start_prices,
+                                      calendar=calendar_nyse, start=start,
+                                      end=end, freq='daily', seed=0,
+                                      factor_loadings=factor_loadings)
+            prices = np.array([batch['price']
+                               for batch in source.bar_batches()])
+            return np.diff(prices, axis=0)
+
+        def mean_correlation(steps):
+            corr = np.corrcoef(steps.T)
+            return corr[np.triu_indices_from(corr, 1)].mean()
+
+        self.assertLess(abs(mean_correlation(steps(None))), 0.1)
+        self.assertGreater(
+            mean_correlation(steps({sid: 0.9 for sid in start_prices})),
+            0.6,
+        )
+
+        with self.assertRaises(ValueError):
+            steps({0: [0.9, 0.9]})
@@ -12,12 +12,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import numpy as np
 import pandas as pd
 
+from mock import patch
 from nose_parameterized import parameterized
+from pandas.util.testing import assert_frame_equal
 from six.moves import range
 from unittest import TestCase
 from zipline import TradingAlgorithm
+from zipline.gens.tradesimulation import AlgorithmSimulator
+from zipline.protocol import DATASOURCE_TYPE, BarData, Event, SIDData
 from zipline.test_algorithms import NoopAlgorithm
 from zipline.utils import factory
 
@@ -64,3 +69,145 @@ class TestTradeSimulation(TestCase):
             pd.DatetimeIndex(algo.before_trading_at)),
             "Expected %s but was %s."
             % (params.trading_days, algo.before_trading_at))
+
+    def test_daily_loop_matches_generic_loop(self):
+        params = factory.create_simulation_parameters(num_days=20)
+
+        def handle_data(context, data):
+            context.order(context.sid(0), 10)
+            context.record(price=data[0].price)
+
+        def run():
+            algo = BeforeTradingAlgorithm(initialize=lambda context: None,
+                                          handle_data=handle_data,
+                                          sim_params=params)
+            source, _ = factory.create_test_df_source(params)
+            return algo, algo.run(source)
+
+        algo, daily = run()
+        with patch.object(AlgorithmSimulator, 'transform',
+                          AlgorithmSimulator._transform_snapshots):
+            generic_algo, generic = run()
+
+        self.assertEqual(algo.before_trading_at,
+                         generic_algo.before_trading_at)
+        # Order ids are random, so transactions are compared by amount.
+        for column in ('orders', 'transactions'):
+            self.assertEqual(
+                [[o['amount'] for o in row] for row in daily.pop(column)],
+                [[o['amount'] for o in row] for row in generic.pop(column)],
+            )
+        assert_frame_equal(daily, generic)
+
+    @parameterized.expand([('daily',), ('minute',)])
+    def test_messages_on_days_without_events(self, emission_rate):
+        params = factory.create_simulation_parameters(
+            num_days=4, data_frequency='minute', emission_rate=emission_rate,
+        )
+        source = factory.create_minutely_trade_source(
+            [0], sim_params=params, concurrent=True,
+        )
+        # Drop the third day's bars.
+        third_day = params.trading_days[2]
+        algo = NoopAlgorithm(sim_params=params)
+        algo.set_sources([[event for event in source
+                           if event.dt.date() != third_day.date()]])
+        messages = list(algo.get_generator())
+
+        perf_key = 'daily_perf'
+        daily = [m[perf_key] for m in messages if perf_key in m]
+        self.assertEqual(len(daily), 4)
+        # Minute emission also emits a minute message at each close, and
+        # both end with the risk report.
+        self.assertEqual(len(messages), 5 if emission_rate == 'daily' else 9)
+
+        tracker = algo.perf_tracker
+        np.testing.assert_array_equal(
+            tracker.benchmark_returns,
+            algo.trading_environment.benchmark_returns[params.trading_days],
+        )
+
+
+class TestBarData(TestCase):
+
+    def test_sid_data_views(self):
+        dt = pd.Timestamp('2015-01-05 15:00', tz='UTC')
+        data = BarData()
+        # More sids than the initial capacity of the universe's arrays.
+        for sid in range(20):
+            data.create_sid_data(sid).update({
+                'sid': sid,
+                'type': DATASOURCE_TYPE.TRADE,
+                'dt': dt,
+                'price': float(sid),
+                'volume': 100,
+            })
+        data[3].update({'dt': dt, 'signal': 1.5})
+
+        sid_data = data[3]
+        self.assertEqual(sid_data.price, 3.0)
+        self.assertEqual(sid_data['volume'], 100)
+        self.assertEqual(sid_data.datetime, dt)
+        self.assertEqual(sid_data.signal, 1.5)
+        self.assertEqual(len(sid_data), 6)
+        self.assertEqual(sid_data.to_dict(), {
+            'sid': 3,
+            'type': DATASOURCE_TYPE.TRADE,
+            'dt': dt,
+            'price': 3.0,
+            'volume': 100,
+            'signal': 1.5,
+        })
+
+        sid_data['price'] = 7.0
+        np.testing.assert_array_equal(data.current([1, 3, 19], 'price'),
+                                      [1.0, 7.0, 19.0])
+
+        # A SIDData built on its own is read through the slow path.
+        data[30] = SIDData(30, {'price': 2.0})
+        np.testing.assert_array_equal(data.current([1, 30], 'price'),
+                                      [1.0, 2.0])
+        np.testing.assert_array_equal(data.current([30], 'volume'),
+                                      [np.nan])
+        self.assertNotIn('volume', data[30])
+        self.assertIsNone(data[30].get('volume'))
+        with self.assertRaises(KeyError):
+            data[30]['volume']
+        with self.assertRaises(AttributeError):
+            data[30].volume
+
+    def test_sid_data_types(self):
+        dt = pd.Timestamp('2015-01-05 15:00', tz='UTC')
+        events = [
+            Event({'sid': 1, 'type': DATASOURCE_TYPE.TRADE, 'dt': dt,
+                   'price': 10.5, 'volume': 100}),
+            Event({'sid': 2, 'type': DATASOURCE_TYPE.TRADE, 'dt': dt,
+                   'price': np.float64(20.0), 'volume': np.int64(200)}),
+            Event({'sid': 3, 'type': DATASOURCE_TYPE.CUSTOM, 'dt': dt,
+                   'price': None, 'volume': None}),
+            Event({'sid': 4, 'type': DATASOURCE_TYPE.CUSTOM, 'dt': dt,
+                   'price': 'n/a', 'volume': True}),
+        ]
+        data = BarData()
+        for event in events:
+            # As AlgorithmSimulator.update_universe does.
+            data.create_sid_data(event.sid).update(event.__dict__)
+
+        for event in events:
+            sid_data = data[event.sid]
+            for field in ('dt', 'price', 'volume'):
+                expected = getattr(event, field)
+                for value in (getattr(sid_data, field),
+                              sid_data[field],
+                              sid_data.get(field),
+                              sid_data.to_dict()[field]):
+                    self.assertIs(type(value), type(expected))
+                    self.assertEqual(value, expected)
+
+        # Fields that are not real numbers are read as missing.
+        np.testing.assert_array_equal(data.current([1, 2, 3, 4], 'price'),
+                                      [10.5, 20.0, np.nan, np.nan])
+        np.testing.assert_array_equal(data.current([1, 2, 3, 4], 'volume'),
+                                      [100, 200, np.nan, np.nan])
+        np.testing.assert_array_equal(data.current([5, 3], 'price', 0.0),
+                                      [0.0, 0.0])
@@ -0,0 +1,61 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import TestCase
+
+from zipline.utils.cache import LRUCache
+
+
+class LRUCacheTestCase(TestCase):
+
+    def test_eviction_order(self):
+        cache = LRUCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+
+        # Touch 'a' so that 'b' is the least recently used entry.
+        self.assertEqual(1, cache['a'])
+        cache['c'] = 3
+
+        self.assertEqual(2, len(cache))
+        self.assertIn('a', cache)
+        self.assertIn('c', cache)
+        self.assertNotIn('b', cache)
+
+    def test_load(self):
+        loaded = []
+
+        def load(key):
+            if key < 0:
+                raise KeyError(key)
+            loaded.append(key)
+            return key * 2
+
+        cache = LRUCache(2, load)
+        self.assertEqual(2, cache[1])
+        self.assertEqual(2, cache[1])
+        self.assertEqual([1], loaded)
+
+        self.assertIsNone(cache.get(-1))
+        self.assertIsNone(cache.peek(5))
+        self.assertEqual([1], loaded)
+
+        cache[2]
+        cache[3]
+        self.assertIsNone(cache.peek(1))
+        self.assertEqual([1, 2, 3], loaded)
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            LRUCache(0)
@@ -14,14 +14,17 @@
 # limitations under the License.
 import datetime
 from itertools import islice
+from logbook import TestHandler
 from six import iteritems
 import random
+import time
 from six.moves import range, map
 from nose_parameterized import parameterized
 from unittest import TestCase
 
 import numpy as np
 
+from zipline.errors import EventBudgetExceeded
 from zipline.finance.trading import TradingEnvironment, with_environment
 import zipline.utils.events
 from zipline.utils.events import (
@@ -174,6 +177,62 @@ class TestEventManager(TestCase):
 
         self.assertEqual(CountingRule.count, 5)
 
+    def test_timing_stats(self):
+        def handle_data(context, data):
+            time.sleep(0.001)
+
+        em = EventManager(timed=True)
+        em.add_event(Event(Never(), lambda context, data: None))
+        em.add_event(Event(Always(), handle_data), prepend=True)
+        for _ in range(10):
+            em.handle_data(None, None, datetime.datetime.now())
+
+        first, second = em.timing_stats()
+        self.assertEqual(first['name'], 'handle_data')
+        self.assertEqual(first['count'], 10)
+        self.assertGreaterEqual(first['mean'], 0.001)
+        self.assertLessEqual(first['p50'], first['p99'])
+        self.assertLessEqual(first['p99'], first['max'])
+        self.assertEqual(
+            second,
+            {'name': '<lambda>', 'count': 0, 'mean': None, 'p50': None,
+             'p99': None, 'max': None},
+        )
+
+        report = em.timing_report()
+        self.assertEqual(report['bars'], 10)
+        self.assertIsNone(report['budget'])
+        self.assertEqual(report['bars_over_budget'], 0)
+        self.assertGreaterEqual(em.last_bar_time, 0.001)
+
+    def test_untimed(self):
+        self.em.add_event(self.event1)
+        self.em.handle_data(None, None, datetime.datetime.now())
+        self.assertFalse(self.em.timed)
+        self.assertEqual(self.em.bars, 0)
+        self.assertEqual(self.em.timing_stats()[0]['count'], 0)
+
+    def test_budget_logged(self):
+        em = EventManager(budget=0.005)
+        em.add_event(Event(Always(), lambda context, data: time.sleep(0.01)))
+        with TestHandler() as handler:
+            em.handle_data(None, None, datetime.datetime.now())
+            em.handle_data(None, None, datetime.datetime.now())
+
+        self.assertTrue(em.timed)
+        self.assertEqual(em.bars_over_budget, 2)
+        self.assertEqual(len(handler.records), 2)
+        self.assertIn('over the budget', handler.records[0].message)
+
+    def test_budget_raised(self):
+        em = EventManager(budget=0.005, budget_action='raise')
+        em.add_event(Event(Always(), lambda context, data: time.sleep(0.01)))
+        with self.assertRaises(EventBudgetExceeded):
+            em.handle_data(None, None, datetime.datetime.now())
+
+        with self.assertRaises(ValueError):
+            EventManager(budget_action='ignore')
+
 
 class TestEventRule(TestCase):
     def test_is_abstract(self):
@@ -12,7 +12,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from copy import copy
 import warnings
 
 import pytz
@@ -21,7 +20,7 @@ import numpy as np
 
 from datetime import datetime
 
-from itertools import groupby, chain
+from itertools import groupby, chain, dropwhile
 from six.moves import filter
 from six import (
     exec_,
@@ -31,6 +30,7 @@ from six import (
 from operator import attrgetter
 
 from zipline.errors import (
+    InvalidCheckpoint,
     OrderDuringInitialize,
     OverrideCommissionPostInit,
     OverrideSlippagePostInit,
@@ -69,6 +69,7 @@ from zipline.gens.composites import date_sorted_sources
 from zipline.gens.tradesimulation import AlgorithmSimulator
 from zipline.sources import DataFrameSource, DataPanelSource
 from zipline.utils.api_support import ZiplineAPI, api_method
+from zipline.utils.checkpoint import Checkpointer, read_checkpoint
 import zipline.utils.events
 from zipline.utils.events import (
     EventManager,
@@ -78,15 +79,40 @@ from zipline.utils.events import (
 )
 from zipline.utils.factory import create_simulation_parameters
 from zipline.utils.math_utils import tolerant_equals
+from zipline.utils.memory import MemoryAccountant
+from zipline.utils.recorder import Recorder
 
 import zipline.protocol
-from zipline.protocol import Event
 
 from zipline.history import HistorySpec
 from zipline.history.history_container import HistoryContainer
 
 DEFAULT_CAPITAL_BASE = float("1.0e5")
 
+# Attributes set on a TradingAlgorithm by the simulation, rather than by the
+# user's algorithm, besides those set in __init__.  Neither are part of the
+# context saved in a checkpoint.
+SIMULATION_ATTRS = frozenset([
+    '_internal_attrs',
+    '_current_universe',
+    'data_gen',
+    'gen',
+    'risk_report',
+    'trading_client',
+])
+
+
+def _share_count(amount, epsilon=1e-4):
+    """
+    Truncate amount to the integer share count that's either within epsilon
+    of amount or closer to zero.
+
+    E.g. 3.9999 -> 4; 5.5 -> 5; -5.5 -> -5
+    """
+    if abs(amount - round(amount)) <= epsilon:
+        amount = round(amount)
+    return int(amount)
+
 
 class TradingAlgorithm(object):
     """
@@ -134,6 +160,34 @@ class TradingAlgorithm(object):
                How much capital to start with.
             instant_fill : bool <default: False>
                Whether to fill orders immediately or on next bar.
+            minute_emission : {'full', 'delta'} <default: 'full'>
+               With a minute emission rate, whether each minute's perf
+               message is a full snapshot, or, if 'delta', a compact
+               record of what changed since the previous minute.  See
+               PerformanceTracker.to_minute_delta.
+            minute_snapshot_every : int, optional
+               With delta minute emission, emit a full snapshot every
+               this many minute messages, on top of the first one of the
+               simulation.
+            memory_accounting : {'nbytes', 'tracemalloc'}, optional
+               Sample the bytes held by the history container, performance
+               periods, risk metrics and perf messages with each perf
+               message, under its 'memory' key, and in memory_usage.
+               'tracemalloc' also traces the memory allocated by Python
+               during the run, see MemoryAccountant.top_allocations.
+            event_timing : bool <default: False>
+               Time each call of handle_data and of the scheduled
+               functions, and report their count, mean, median, 99th
+               percentile and longest duration in the risk report ending
+               the simulation, under its 'event_timing' key, and in
+               event_timing_stats.
+            event_budget : float, optional
+               The time, in seconds, that handle_data and the scheduled
+               functions may take altogether on each bar.  Implies
+               event_timing.
+            event_budget_action : {'log', 'raise'} <default: 'log'>
+               Whether bars over the event_budget are logged, or raise
+               EventBudgetExceeded.
             asset_finder : An AssetFinder object
                 A new AssetFinder object to be used in this TradingEnvironment
             asset_metadata: can be either:
@@ -164,7 +218,8 @@ class TradingAlgorithm(object):
         # List of account controls to be checked on each bar.
         self.account_controls = []
 
-        self._recorded_vars = {}
+        # The variables recorded with record().
+        self.recorder = Recorder()
         self.namespace = kwargs.get('namespace', {})
 
         self._platform = kwargs.pop('platform', 'zipline')
@@ -179,6 +234,19 @@ class TradingAlgorithm(object):
 
         self.instant_fill = kwargs.pop('instant_fill', False)
 
+        self.minute_emission = kwargs.pop('minute_emission', 'full')
+        if self.minute_emission not in ('full', 'delta'):
+            raise ValueError(
+                "minute_emission must be 'full' or 'delta', got %r" %
+                self.minute_emission
+            )
+        self.minute_snapshot_every = kwargs.pop('minute_snapshot_every', None)
+
+        memory_accounting = kwargs.pop('memory_accounting', None)
+        self.memory_accountant = None
+        if memory_accounting is not None:
+            self.memory_accountant = MemoryAccountant(memory_accounting)
+
         # set the capital base
         self.capital_base = kwargs.pop('capital_base', DEFAULT_CAPITAL_BASE)
 
@@ -229,7 +297,11 @@ class TradingAlgorithm(object):
         self._before_trading_start = None
         self._analyze = None
 
-        self.event_manager = EventManager()
+        self.event_manager = EventManager(
+            timed=kwargs.pop('event_timing', False),
+            budget=kwargs.pop('event_budget', None),
+            budget_action=kwargs.pop('event_budget_action', 'log'),
+        )
 
         if self.algoscript is not None:
             filename = kwargs.pop('algo_filename', None)
@@ -283,6 +355,10 @@ class TradingAlgorithm(object):
         self.initialize_args = args
         self.initialize_kwargs = kwargs
 
+        # Anything set on the algorithm from now on, other than by the
+        # simulation itself, is part of the user's context.
+        self._internal_attrs = frozenset(self.__dict__) | SIMULATION_ATTRS
+
     def initialize(self, *args, **kwargs):
         """
         Call self._initialize with `self` made available to Zipline API
@@ -342,7 +418,8 @@ class TradingAlgorithm(object):
                    blotter=repr(self.blotter),
                    recorded_vars=repr(self.recorded_vars))
 
-    def _create_data_generator(self, source_filter, sim_params=None):
+    def _create_data_generator(self, source_filter, sim_params=None,
+                               resume_dt=None):
         """
         Create a merged data generator using the sources attached to this
         algorithm.
@@ -351,44 +428,51 @@ class TradingAlgorithm(object):
         sorted order, and returns True for those events that should be
         processed by the zipline, and False for those that should be
         skipped.
-        """
-        if sim_params is None:
-            sim_params = self.sim_params
-
-        if self.benchmark_return_source is None:
-            if sim_params.data_frequency == 'minute' or \
-               sim_params.emission_rate == 'minute':
-                def update_time(date):
-                    return self.trading_environment.get_open_and_close(date)[1]
-            else:
-                def update_time(date):
-                    return date
-            benchmark_return_source = [
-                Event({'dt': update_time(dt),
-                       'returns': ret,
-                       'type': zipline.protocol.DATASOURCE_TYPE.BENCHMARK,
-                       'source_id': 'benchmarks'})
-                for dt, ret in
-                self.trading_environment.benchmark_returns.iteritems()
-                if dt.date() >= sim_params.period_start.date() and
-                dt.date() <= sim_params.period_end.date()
-            ]
-        else:
-            benchmark_return_source = self.benchmark_return_source
 
+        ::resume_dt:: if given, events up to and including this dt, which
+        were processed before a checkpoint was taken, are skipped.
+        """
         date_sorted = date_sorted_sources(*self.sources)
 
         if source_filter:
             date_sorted = filter(source_filter, date_sorted)
 
-        with_benchmarks = date_sorted_sources(benchmark_return_source,
-                                              date_sorted)
+        if resume_dt is not None:
+            date_sorted = dropwhile(lambda event: event.dt <= resume_dt,
+                                    date_sorted)
 
         # Group together events with the same dt field. This depends on the
         # events already being sorted.
-        return groupby(with_benchmarks, attrgetter('dt'))
+        return groupby(date_sorted, attrgetter('dt'))
+
+    def _benchmark_returns(self, sim_params):
+        """
+        The dts and values of the benchmark returns over the simulation,
+        from benchmark_return_source if it is set, or else from the trading
+        environment.  Perf messages are emitted at these dts.
+        """
+        if self.benchmark_return_source is not None:
+            events = list(self.benchmark_return_source)
+            return ([event.dt for event in events],
+                    [event.returns for event in events])
+
+        env = self.trading_environment
+        returns = env.benchmark_returns
+        start = pd.Timestamp(sim_params.period_start.date(), tz='UTC')
+        end = pd.Timestamp(sim_params.period_end.date(), tz='UTC')
+        days = returns.index.normalize()
+        returns = returns[(days >= start) & (days <= end)]
+
+        if sim_params.data_frequency == 'minute' or \
+           sim_params.emission_rate == 'minute':
+            # Returns are known as of each day's close.
+            dts = env.open_and_closes.market_close.reindex(returns.index)
+        else:
+            dts = returns.index
+        return dts, returns.values
 
-    def _create_generator(self, sim_params, source_filter=None):
+    def _create_generator(self, sim_params, source_filter=None,
+                          resume_dt=None):
         """
         Create a basic generator setup using the sources to this algorithm.
 
@@ -396,8 +480,22 @@ class TradingAlgorithm(object):
         sorted order, and returns True for those events that should be
         processed by the zipline, and False for those that should be
         skipped.
+
+        ::resume_dt:: is the dt of the checkpoint being resumed from, if any.
         """
+        self._prepare_simulation(sim_params)
+
+        self.data_gen = self._create_data_generator(source_filter, sim_params,
+                                                    resume_dt)
+
+        return self.trading_client.transform(self.data_gen)
 
+    def _prepare_simulation(self, sim_params):
+        """
+        Initialize the algorithm, if it is not already, and set up its
+        performance tracker, transaction model and AlgorithmSimulator for a
+        simulation over sim_params.
+        """
         if not self.initialized:
             self.initialize(*self.initialize_args, **self.initialize_kwargs)
             self.initialized = True
@@ -406,20 +504,19 @@ class TradingAlgorithm(object):
             # HACK: When running with the `run` method, we set perf_tracker to
             # None so that it will be overwritten here.
             self.perf_tracker = PerformanceTracker(sim_params)
+        self.perf_tracker.set_benchmark_returns(
+            *self._benchmark_returns(sim_params)
+        )
 
         self.portfolio_needs_update = True
         self.account_needs_update = True
         self.performance_needs_update = True
 
-        self.data_gen = self._create_data_generator(source_filter, sim_params)
-
         self.trading_client = AlgorithmSimulator(self, sim_params)
 
         transact_method = transact_partial(self.slippage, self.commission)
         self.set_transact(transact_method)
 
-        return self.trading_client.transform(self.data_gen)
-
     def get_generator(self):
         """
         Override this method to add new logic to the construction
@@ -432,7 +529,9 @@ class TradingAlgorithm(object):
     # the run method to the subclass, and refactor to put the
     # generator creation logic into get_generator.
     def run(self, source, overwrite_sim_params=True,
-            benchmark_return_source=None):
+            benchmark_return_source=None, checkpoint_path=None,
+            checkpoint_every=1, resume_from=None, resume_context=None,
+            stop_at=None):
         """Run the algorithm.
 
         :Arguments:
@@ -446,6 +545,29 @@ class TradingAlgorithm(object):
                * column names must be the different asset identifiers
                * index must be DatetimeIndex
                * array contents should be price info.
+        :Optional:
+            checkpoint_path : str
+               Write a checkpoint of the simulation to this path at the
+               end of every `checkpoint_every` trading sessions.  The perf
+               messages are appended to a perf log at this path with a
+               `.perfs` suffix, which `resume_from` reads them back from.
+            checkpoint_every : int <default: 1>
+               The number of sessions between checkpoints.
+            resume_from : str
+               Path of a checkpoint written by an earlier run of this
+               algorithm over the same source and simulation parameters.
+               The simulation carries on from the session following the
+               checkpoint, and the returned stats cover the whole run.
+            resume_context : dict
+               Attributes to set on the algorithm once its context has
+               been restored from `resume_from`, such as parameters that
+               differ between continuations of the same checkpoint.
+            stop_at : datetime
+               End the simulation after the first session ending at or
+               after this dt, without emitting a risk report.  If
+               `checkpoint_path` is given, the state at the end of that
+               session is checkpointed, so that other runs can be forked
+               from it.
 
         :Returns:
             daily_stats : pandas.DataFrame
@@ -506,12 +628,23 @@ class TradingAlgorithm(object):
         for sid in self._current_universe:
             self.asset_finder.retrieve_asset(sid)
 
+        if resume_context is not None and resume_from is None:
+            raise ValueError("resume_context requires resume_from")
+
+        checkpoint = None
+        if resume_from is not None:
+            checkpoint = read_checkpoint(resume_from)
+            checkpoint.check_sim_params(self.sim_params)
+
         # force a reset of the performance tracker, in case
         # this is a repeat run of the algorithm.
         self.perf_tracker = None
 
         # create zipline
-        self.gen = self._create_generator(self.sim_params)
+        self.gen = self._create_generator(
+            self.sim_params,
+            resume_dt=checkpoint.dt if checkpoint is not None else None,
+        )
 
         # Create history containers
         if self.history_specs:
@@ -522,18 +655,90 @@ class TradingAlgorithm(object):
                 self.sim_params.data_frequency,
             )
 
-        # loop through simulated_trading, each iteration returns a
-        # perf dictionary
         perfs = []
-        for perf in self.gen:
-            perfs.append(perf)
+        if checkpoint is not None:
+            self._restore_checkpoint_state(checkpoint)
+            self.trading_client.resume(checkpoint)
+            perfs = checkpoint.read_perfs()
+            if resume_context is not None:
+                self.__dict__.update(resume_context)
+
+        if checkpoint_path is not None:
+            self.trading_client.checkpointer = Checkpointer(
+                checkpoint_path, perfs, every=checkpoint_every,
+                resumed=checkpoint,
+            )
+        if stop_at is not None:
+            self.trading_client.stop_at = pd.Timestamp(stop_at, tz='UTC')
+
+        accountant = self.memory_accountant
+        if accountant is not None:
+            accountant.start()
+
+        try:
+            # loop through simulated_trading, each iteration returns a
+            # perf dictionary
+            for perf in self.gen:
+                perfs.append(perf)
+                if accountant is not None:
+                    perf['memory'] = accountant.sample(
+                        self.datetime, self, perfs,
+                    )
+
+            # convert perf dict to pandas dataframe
+            daily_stats = self._create_daily_stats(perfs)
+
+            self.analyze(daily_stats)
+        finally:
+            if accountant is not None:
+                accountant.stop()
 
-        # convert perf dict to pandas dataframe
-        daily_stats = self._create_daily_stats(perfs)
+        return daily_stats
 
-        self.analyze(daily_stats)
+    def _checkpoint_state(self):
+        """
+        The state of the algorithm to save in a checkpoint.
 
-        return daily_stats
+        The context is made of the attributes set on the algorithm by the
+        user's code.  Everything else, such as scheduled functions, trading
+        controls and the commission and slippage models, is set up again by
+        initialize when resuming.
+        """
+        context = {k: v for k, v in iteritems(self.__dict__)
+                   if k not in self._internal_attrs and not callable(v)}
+        return {
+            'perf_tracker': self.perf_tracker,
+            'blotter': self.blotter,
+            'recorder': self.recorder,
+            'history_container': self.history_container,
+            'context': context,
+            'event_rules': self.event_manager.rule_states(),
+        }
+
+    def _restore_checkpoint_state(self, checkpoint):
+        """
+        Restore the state saved by _checkpoint_state onto an initialized
+        algorithm.
+        """
+        state = checkpoint.algo_state
+        try:
+            self.event_manager.restore_rule_states(state['event_rules'])
+        except ValueError as e:
+            raise InvalidCheckpoint(path=checkpoint.path, reason=str(e))
+
+        transact = self.blotter.transact
+        self.blotter = state['blotter']
+        self.set_transact(transact)
+
+        self.perf_tracker = state['perf_tracker']
+        self.recorder = state['recorder']
+        if state['history_container'] is not None:
+            self.history_container = state['history_container']
+        self.__dict__.update(state['context'])
+
+        self.portfolio_needs_update = True
+        self.account_needs_update = True
+        self.performance_needs_update = True
 
     def _create_daily_stats(self, perfs):
         # create daily and cumulative stats dataframe
@@ -644,6 +849,9 @@ class TradingAlgorithm(object):
     def record(self, *args, **kwargs):
         """
         Track and record local variable (i.e. attributes) each day.
+
+        By default the perf messages report the last value recorded for each
+        variable, see set_record_options for alternatives.
         """
         # Make 2 objects both referencing the same iterator
         args = [iter(args)] * 2
@@ -653,8 +861,64 @@ class TradingAlgorithm(object):
         # call to next on args[0] will also advance args[1], resulting in zip
         # returning (a,b) (c,d) (e,f) rather than (a,a) (b,b) (c,c) etc.
         positionals = zip(*args)
+        record = self.recorder.record
+        dt = self.datetime
         for name, value in chain(positionals, iteritems(kwargs)):
-            self._recorded_vars[name] = value
+            record(dt, name, value)
+
+    @api_method
+    def set_record_options(self, name, how='last', keep_series=False):
+        """
+        Set how the variable name passed to record is reported.
+
+        :Arguments:
+            name : str
+                The name of the recorded variable.
+            how : {'last', 'mean', 'max', 'min', 'sum'} <default: 'last'>
+                How the values recorded for name during each emission
+                interval, a day or a minute, are aggregated into the value
+                reported in the perf messages.  Only 'last' accepts values
+                that aren't numbers.
+            keep_series : bool <default: False>
+                Also keep every recorded value, to be retrieved with
+                recorded_series once the simulation is done, rather than
+                only the values reported in the perf messages.
+        """
+        self.recorder.set_options(name, how=how, keep_series=keep_series)
+
+    def recorded_series(self, name=None):
+        """
+        The values recorded for name, indexed by the dt they were recorded
+        at, or a DataFrame of all the variables kept as series if name is
+        None.  See set_record_options.
+        """
+        return self.recorder.series(name)
+
+    @property
+    def memory_usage(self):
+        """
+        The memory usage sampled with each perf message, as a DataFrame with
+        a column of bytes per component, or None unless the algorithm was
+        created with memory_accounting.
+        """
+        if self.memory_accountant is None:
+            return None
+        return self.memory_accountant.frame()
+
+    @property
+    def event_timing_stats(self):
+        """
+        The timing of handle_data and the scheduled functions, as a
+        DataFrame with a row per event, in the order they are called, or
+        None unless the algorithm was created with event_timing or an
+        event_budget.  See EventManager.timing_stats.
+        """
+        if not self.event_manager.timed:
+            return None
+        return pd.DataFrame(
+            self.event_manager.timing_stats(),
+            columns=['name', 'count', 'mean', 'p50', 'p99', 'max'],
+        )
 
     @api_method
     def symbol(self, symbol_str):
@@ -713,21 +977,7 @@ class TradingAlgorithm(object):
         """
         Place an order using the specified parameters.
         """
-
-        def round_if_near_integer(a, epsilon=1e-4):
-            """
-            Round a to the nearest integer if that integer is within an epsilon
-            of a.
-            """
-            if abs(a - round(a)) <= epsilon:
-                return round(a)
-            else:
-                return a
-
-        # Truncate to the integer share count that's either within .0001 of
-        # amount or closer to zero.
-        # E.g. 3.9999 -> 4.0; 5.5 -> 5.0; -5.5 -> -5.0
-        amount = int(round_if_near_integer(amount))
+        amount = _share_count(amount)
 
         # Raises a ZiplineError if invalid parameters are detected.
         self.validate_order_params(sid,
@@ -754,7 +1004,66 @@ class TradingAlgorithm(object):
 
         Raises an UnsupportedOrderParameters if invalid arguments are found.
         """
+        self._validate_order_arguments((asset,), limit_price, stop_price,
+                                       style)
+
+        for control in self.trading_controls:
+            control.validate(asset,
+                             amount,
+                             self.updated_portfolio(),
+                             self.get_datetime(),
+                             self.trading_client.current_data)
+
+    def validate_batch_order_params(self,
+                                    assets,
+                                    amounts,
+                                    limit_price,
+                                    stop_price,
+                                    style):
+        """
+        Helper method for validating parameters to the batch_order API
+        function.
+
+        Every order is checked against each trading control with a single
+        call to its validate_many.  If any order violates a control, the
+        violation reported is the one that validating the orders one by one,
+        in order, would have reported first.  Otherwise each control's
+        commit_many is called with the batch.
+        """
+        self._validate_order_arguments(assets, limit_price, stop_price, style)
 
+        if not self.trading_controls:
+            return
+
+        portfolio = self.updated_portfolio()
+        algo_datetime = self.get_datetime()
+        current_data = self.trading_client.current_data
+
+        first_failure = None
+        for control in self.trading_controls:
+            failed = np.flatnonzero(control.validate_many(assets,
+                                                          amounts,
+                                                          portfolio,
+                                                          algo_datetime,
+                                                          current_data))
+            if len(failed) and (first_failure is None or
+                                failed[0] < first_failure[1]):
+                first_failure = (control, failed[0])
+
+        if first_failure is not None:
+            control, i = first_failure
+            control.fail(assets[i], amounts[i], algo_datetime)
+
+        # Only a batch that passed every control is placed, and so counted.
+        for control in self.trading_controls:
+            control.commit_many(assets, amounts, algo_datetime)
+
+    def _validate_order_arguments(self, assets, limit_price, stop_price,
+                                  style):
+        """
+        Checks for the order parameters that don't depend on trading
+        controls.
+        """
         if not self.initialized:
             raise OrderDuringInitialize(
                 msg="order() can only be called from within handle_data()"
@@ -771,18 +1080,47 @@ class TradingAlgorithm(object):
                     msg="Passing both stop_price and style is not supported."
                 )
 
-        if not isinstance(asset, Asset):
-            raise UnsupportedOrderParameters(
-                msg="Passing non-Asset argument to 'order()' is not supported."
-                    " Use 'sid()' or 'symbol()' methods to look up an Asset."
+        for asset in assets:
+            if not isinstance(asset, Asset):
+                raise UnsupportedOrderParameters(
+                    msg="Passing non-Asset argument to 'order()' is not "
+                        "supported. Use 'sid()' or 'symbol()' methods to look "
+                        "up an Asset."
+                )
+
+    @api_method
+    def batch_order(self, assets, amounts,
+                    limit_price=None,
+                    stop_price=None,
+                    style=None):
+        """
+        Place an order for each of assets, for the matching number of shares
+        in amounts, all with the same limit price, stop price or style.
+
+        The orders are checked against the trading controls together, and
+        none of them is placed if any violates a control.
+
+        Returns a list of the ids of the orders placed, with None for zero
+        amounts.
+        """
+        assets = list(assets)
+        amounts = [_share_count(amount) for amount in amounts]
+        if len(assets) != len(amounts):
+            raise ValueError(
+                "Got %d assets but %d amounts" % (len(assets), len(amounts))
             )
 
-        for control in self.trading_controls:
-            control.validate(asset,
-                             amount,
-                             self.updated_portfolio(),
-                             self.get_datetime(),
-                             self.trading_client.current_data)
+        self.validate_batch_order_params(assets,
+                                         amounts,
+                                         limit_price,
+                                         stop_price,
+                                         style)
+
+        style = self.__convert_order_params_for_blotter(limit_price,
+                                                        stop_price,
+                                                        style)
+        return [self.blotter.order(asset, amount, style)
+                for asset, amount in zip(assets, amounts)]
 
     @staticmethod
     def __convert_order_params_for_blotter(limit_price, stop_price, style):
@@ -831,7 +1169,7 @@ class TradingAlgorithm(object):
 
     @property
     def recorded_vars(self):
-        return copy(self._recorded_vars)
+        return self.recorder.values()
 
     @property
     def portfolio(self):
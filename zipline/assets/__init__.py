@@ -18,12 +18,28 @@ from ._assets import (
     Equity,
     Future,
     make_asset_array,
+    asset_array_to_sids,
+    sids_to_asset_array,
+    sid_isin,
+    sid_searchsorted,
     CACHE_FILE_TEMPLATE
 )
 from .assets import (
     AssetFinder,
     AssetConvertible
 )
+from .asset_db import (
+    AssetDB,
+    SQLiteAssetFinder,
+)
+from .futures import (
+    RollRule,
+    NoticeDateRoll,
+    ExpirationRoll,
+    VolumeRoll,
+    RollCalendar,
+    FutureChainIndex,
+)
 
 __all__ = [
     'Asset',
@@ -31,6 +47,18 @@ __all__ = [
     'Future',
     'AssetFinder',
     'AssetConvertible',
+    'AssetDB',
+    'SQLiteAssetFinder',
+    'RollRule',
+    'NoticeDateRoll',
+    'ExpirationRoll',
+    'VolumeRoll',
+    'RollCalendar',
+    'FutureChainIndex',
     'make_asset_array',
+    'asset_array_to_sids',
+    'sids_to_asset_array',
+    'sid_isin',
+    'sid_searchsorted',
     'CACHE_FILE_TEMPLATE'
 ]
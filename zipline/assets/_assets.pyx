@@ -302,3 +302,152 @@ def make_asset_array(int size, Asset asset):
     cdef np.ndarray out = np.empty([size], dtype=object)
     out.fill(asset)
     return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def make_assets_from_columns(np.ndarray[np.int64_t, ndim=1] sids,
+                             np.ndarray[np.uint8_t, ndim=1] is_future,
+                             np.ndarray[object, ndim=1] symbols,
+                             np.ndarray[object, ndim=1] root_symbols,
+                             np.ndarray[object, ndim=1] asset_names,
+                             np.ndarray[object, ndim=1] start_dates,
+                             np.ndarray[object, ndim=1] end_dates,
+                             np.ndarray[object, ndim=1] first_traded,
+                             np.ndarray[object, ndim=1] exchanges,
+                             np.ndarray[object, ndim=1] notice_dates,
+                             np.ndarray[object, ndim=1] expiration_dates,
+                             np.ndarray[np.int64_t, ndim=1] multipliers):
+    """
+    Build a list of Equity and Future objects from aligned column arrays.
+
+    All arrays must have the same length. Missing dates should be passed as
+    None, and missing strings as ''. Rows where is_future is non-zero are
+    built as Futures, all others as Equities.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = sids.shape[0]
+    cdef list out = [None] * n
+
+    for i in range(n):
+        if is_future[i]:
+            # Future must be built with keywords, as Asset.__cinit__ receives
+            # the same arguments and expects its own positional order.
+            out[i] = Future(sid=sids[i],
+                            symbol=symbols[i],
+                            root_symbol=root_symbols[i],
+                            asset_name=asset_names[i],
+                            start_date=start_dates[i],
+                            end_date=end_dates[i],
+                            notice_date=notice_dates[i],
+                            expiration_date=expiration_dates[i],
+                            first_traded=first_traded[i],
+                            exchange=exchanges[i],
+                            contract_multiplier=multipliers[i])
+        else:
+            out[i] = Equity(sids[i],
+                            symbols[i],
+                            asset_names[i],
+                            start_dates[i],
+                            end_dates[i],
+                            first_traded[i],
+                            exchanges[i])
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def asset_array_to_sids(object assets):
+    """
+    Convert an array-like of Assets and/or integer sids to an int64 array of
+    sids.
+    """
+    cdef np.ndarray values = np.asarray(assets)
+    cdef np.ndarray[object, ndim=1] objects
+    cdef np.ndarray[np.int64_t, ndim=1] out
+    cdef Py_ssize_t i, n
+    cdef object obj
+
+    # Integer arrays need no per-element work.
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int64)
+
+    objects = values.astype(object)
+    n = objects.shape[0]
+    out = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        obj = objects[i]
+        if isinstance(obj, Asset):
+            out[i] = (<Asset>obj).sid
+        else:
+            out[i] = obj
+    return out
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def sids_to_asset_array(object sids, object retrieve_asset):
+    """
+    Convert an array-like of integer sids to an object array of Assets.
+
+    retrieve_asset is called once for each distinct sid, e.g. with
+    AssetFinder.retrieve_asset to resolve sids through the finder's cache.
+    """
+    cdef np.ndarray[np.int64_t, ndim=1] unique_sids
+    cdef np.ndarray inverse
+    cdef np.ndarray[object, ndim=1] unique_assets
+    cdef Py_ssize_t i, n
+
+    unique_sids, inverse = np.unique(
+        asset_array_to_sids(sids),
+        return_inverse=True,
+    )
+    n = unique_sids.shape[0]
+    unique_assets = np.empty(n, dtype=object)
+    for i in range(n):
+        unique_assets[i] = retrieve_asset(unique_sids[i])
+    return unique_assets.take(inverse)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def sid_isin(object sids, object test_sids):
+    """
+    Return a boolean array marking which entries of sids are also in
+    test_sids.  Both arguments may contain Assets and/or integer sids.
+    """
+    cdef np.ndarray[np.int64_t, ndim=1] values = asset_array_to_sids(sids)
+    cdef np.ndarray[np.int64_t, ndim=1] tests = np.unique(
+        asset_array_to_sids(test_sids),
+    )
+    cdef Py_ssize_t n = values.shape[0]
+    cdef Py_ssize_t i, lo, hi, mid
+    cdef np.int64_t value
+    cdef np.ndarray[np.uint8_t, ndim=1] out = np.zeros(n, dtype=np.uint8)
+
+    for i in range(n):
+        value = values[i]
+        # Binary search of the sorted, unique test sids.
+        lo = 0
+        hi = tests.shape[0]
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if tests[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < tests.shape[0] and tests[lo] == value:
+            out[i] = 1
+    return out.view(np.bool_)
+
+
+def sid_searchsorted(object sorted_sids, object sids, object side='left'):
+    """
+    Find the indices into sorted_sids at which sids would be inserted to
+    maintain order.  Both arguments may contain Assets and/or integer sids.
+    """
+    return np.searchsorted(
+        asset_array_to_sids(sorted_sids),
+        asset_array_to_sids(sids),
+        side=side,
+    )
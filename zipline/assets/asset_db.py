@@ -0,0 +1,404 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+SQLite-backed asset metadata storage and a lazily-building AssetFinder.
+"""
+from numbers import Integral
+import sqlite3
+
+import numpy as np
+import pandas as pd
+from six import itervalues, string_types
+
+from zipline.errors import AssetDBVersionError
+from zipline.assets._assets import Equity, Future
+from zipline.assets.assets import (
+    AssetFinder,
+    DATE_FIELDS,
+    FRAME_FIELDS,
+    _to_utc_datetime64,
+)
+from zipline.utils.cache import LRUCache
+
+# Version of the schema below, stored in the user_version pragma of the
+# database file.  Bump this whenever the schema changes.
+ASSET_DB_VERSION = 1
+
+# Default number of Assets, symbols and future chains held by each of the
+# caches of a SQLiteAssetFinder.
+DEFAULT_CACHE_SIZE = 10000
+
+# SQLite limits the number of bound parameters in a single statement.
+SQLITE_MAX_VARIABLE_NUMBER = 999
+
+# Fields stored as integer nanoseconds since the epoch, in UTC.
+NANOS_FIELDS = frozenset(DATE_FIELDS + ['first_traded'])
+
+NAT = np.datetime64('NaT').astype(np.int64)
+
+SCHEMA = [
+    """
+    CREATE TABLE assets (
+        sid INTEGER PRIMARY KEY,
+        asset_type TEXT NOT NULL,
+        symbol TEXT,
+        root_symbol TEXT,
+        asset_name TEXT,
+        start_date INTEGER,
+        end_date INTEGER,
+        first_traded INTEGER,
+        exchange TEXT,
+        notice_date INTEGER,
+        expiration_date INTEGER,
+        contract_multiplier INTEGER
+    )
+    """,
+    "CREATE INDEX ix_assets_symbol ON assets (symbol)",
+    """
+    CREATE INDEX ix_assets_symbol_dates
+    ON assets (symbol, start_date, end_date)
+    """,
+    "CREATE INDEX ix_assets_root_symbol ON assets (root_symbol, notice_date)",
+]
+
+SELECT_ASSETS = "SELECT %s FROM assets" % ', '.join(FRAME_FIELDS)
+
+
+def _timestamp(nanos):
+    if nanos is None:
+        return None
+    return pd.Timestamp(nanos, tz='UTC')
+
+
+def _asset_from_row(row):
+    """
+    Build an Equity or Future from a row of the assets table.
+    """
+    (sid, asset_type, symbol, root_symbol, asset_name, start_date, end_date,
+     first_traded, exchange, notice_date, expiration_date,
+     contract_multiplier) = row
+
+    if asset_type == 'future':
+        return Future(
+            sid=sid,
+            symbol=symbol or '',
+            root_symbol=root_symbol or '',
+            asset_name=asset_name or '',
+            start_date=_timestamp(start_date),
+            end_date=_timestamp(end_date),
+            notice_date=_timestamp(notice_date),
+            expiration_date=_timestamp(expiration_date),
+            first_traded=_timestamp(first_traded),
+            exchange=exchange or '',
+            contract_multiplier=(
+                1 if contract_multiplier is None else contract_multiplier
+            ),
+        )
+    return Equity(
+        sid,
+        symbol or '',
+        asset_name or '',
+        _timestamp(start_date),
+        _timestamp(end_date),
+        _timestamp(first_traded),
+        exchange or '',
+    )
+
+
+def _frame_to_rows(frame):
+    """
+    Convert a normalized metadata frame indexed by sid to rows of the assets
+    table.
+    """
+    columns = [frame.index.values.astype(np.int64).tolist()]
+    for field in FRAME_FIELDS[1:]:
+        values = frame[field]
+        if field in NANOS_FIELDS:
+            nanos = _to_utc_datetime64(values.values).astype(np.int64)
+            column = [None if n == NAT else n for n in nanos.tolist()]
+        elif field == 'asset_type':
+            column = values.fillna('equity').str.lower().tolist()
+        elif field == 'contract_multiplier':
+            column = [None if pd.isnull(v) else int(v) for v in values]
+        else:
+            column = [None if pd.isnull(v) else v for v in values]
+        columns.append(column)
+    return list(zip(*columns))
+
+
+def _rows_to_frame(rows):
+    """
+    Convert rows of the assets table to a normalized metadata frame indexed
+    by sid.  This is the inverse of _frame_to_rows.
+    """
+    if not rows:
+        return pd.DataFrame(columns=FRAME_FIELDS[1:])
+
+    columns = list(zip(*rows))
+    data = {}
+    for field, column in zip(FRAME_FIELDS[1:], columns[1:]):
+        if field in NANOS_FIELDS:
+            data[field] = np.array(
+                [NAT if n is None else n for n in column],
+                dtype=np.int64,
+            ).view('M8[ns]')
+        else:
+            data[field] = np.array(column, dtype=object)
+    return pd.DataFrame(
+        data,
+        index=pd.Index(columns[0], name='sid'),
+        columns=FRAME_FIELDS[1:],
+    )
+
+
+class AssetDB(object):
+    """
+    Asset metadata stored in a SQLite file.
+
+    Rows are keyed by sid, which is the table's primary key.  Symbols,
+    (symbol, start_date, end_date) and future root symbols are indexed, and
+    dates are stored as integer nanoseconds since the epoch in UTC.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version == 0 and not self._has_assets_table():
+            self._create()
+        elif version != ASSET_DB_VERSION:
+            raise AssetDBVersionError(
+                path=path,
+                db_version=version,
+                expected_version=ASSET_DB_VERSION,
+            )
+
+    def _has_assets_table(self):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='assets'"
+        ).fetchone() is not None
+
+    def _create(self):
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+            self.conn.execute('PRAGMA user_version = %d' % ASSET_DB_VERSION)
+
+    def close(self):
+        self.conn.close()
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM assets').fetchone()[0]
+
+    def max_sid(self):
+        """
+        The largest sid in the database, or None if it is empty.
+        """
+        return self.conn.execute('SELECT MAX(sid) FROM assets').fetchone()[0]
+
+    def sids(self):
+        return [row[0] for row in
+                self.conn.execute('SELECT sid FROM assets ORDER BY sid')]
+
+    def contains_sid(self, sid):
+        return self.conn.execute(
+            'SELECT 1 FROM assets WHERE sid = ?', (int(sid),),
+        ).fetchone() is not None
+
+    def contains_symbol(self, symbol):
+        return self.conn.execute(
+            'SELECT 1 FROM assets WHERE symbol = ? LIMIT 1', (symbol,),
+        ).fetchone() is not None
+
+    def sids_for_symbols(self, symbols):
+        """
+        A dict of the sid of each of symbols in the database.  The sid of a
+        symbol held by several assets is that of its latest asset.
+        """
+        symbols = list(symbols)
+        sids = {}
+        for start in range(0, len(symbols), SQLITE_MAX_VARIABLE_NUMBER):
+            chunk = symbols[start:start + SQLITE_MAX_VARIABLE_NUMBER]
+            # Later rows overwrite earlier ones.
+            sids.update(self.conn.execute(
+                'SELECT symbol, sid FROM assets WHERE symbol IN (%s) '
+                'ORDER BY start_date, end_date' % ', '.join('?' * len(chunk)),
+                chunk,
+            ))
+        return sids
+
+    def rows_for_sids(self, sids):
+        sids = [int(sid) for sid in sids]
+        rows = []
+        for start in range(0, len(sids), SQLITE_MAX_VARIABLE_NUMBER):
+            chunk = sids[start:start + SQLITE_MAX_VARIABLE_NUMBER]
+            rows.extend(self.conn.execute(
+                '%s WHERE sid IN (%s)' % (SELECT_ASSETS,
+                                          ', '.join('?' * len(chunk))),
+                chunk,
+            ))
+        return rows
+
+    def rows_for_symbol(self, symbol):
+        return self.conn.execute(
+            '%s WHERE symbol = ? ORDER BY start_date, end_date'
+            % SELECT_ASSETS,
+            (symbol,),
+        ).fetchall()
+
+    def rows_for_root_symbol(self, root_symbol):
+        """
+        Return the rows of all futures with the given root symbol, sorted by
+        notice date.
+        """
+        return self.conn.execute(
+            "%s WHERE root_symbol = ? AND asset_type = 'future' "
+            "ORDER BY notice_date" % SELECT_ASSETS,
+            (root_symbol,),
+        ).fetchall()
+
+    def write(self, frame):
+        """
+        Insert or update the entries of a normalized metadata frame, as
+        returned by AssetFinder.normalized_metadata.
+
+        Fields that are missing from frame keep the value already stored for
+        that sid.
+        """
+        # Merge duplicate sids field by field, later entries winning.
+        frame = frame.set_index('sid').groupby(level=0).last()
+
+        existing = _rows_to_frame(self.rows_for_sids(frame.index))
+        if len(existing):
+            frame = frame.combine_first(existing)
+
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO assets (%s) VALUES (%s)' % (
+                    ', '.join(FRAME_FIELDS),
+                    ', '.join('?' * len(FRAME_FIELDS)),
+                ),
+                _frame_to_rows(frame),
+            )
+
+
+class SQLiteAssetFinder(AssetFinder):
+    """
+    An AssetFinder whose metadata lives in a SQLite file.
+
+    Assets are only built when first looked up, and are held in LRU caches of
+    at most cache_size entries, so memory use and startup cost are
+    proportional to the assets a simulation actually touches rather than to
+    the size of the database.
+
+    Metadata consumed by this finder is written to the database when
+    populate_cache is called.
+    """
+
+    def __init__(self,
+                 path,
+                 metadata=None,
+                 allow_sid_assignment=True,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        self.db = AssetDB(path)
+        self.cache_size = cache_size
+        super(SQLiteAssetFinder, self).__init__(
+            metadata=metadata,
+            allow_sid_assignment=allow_sid_assignment,
+        )
+
+    def populate_cache(self):
+        """
+        Write any consumed metadata to the database, and reset the caches of
+        built Assets.
+        """
+        pending = self.normalized_metadata()
+        if len(pending):
+            self.db.write(pending)
+        self.clear_metadata()
+
+        self.cache = LRUCache(self.cache_size, self._load_asset)
+        self.sym_cache = LRUCache(self.cache_size, self._load_symbol)
+        self.future_chains_cache = LRUCache(self.cache_size,
+                                            self._load_future_chain)
+        self.future_chain_dates_cache = LRUCache(self.cache_size)
+        self.fuzzy_match = {}
+
+    def _asset_for_row(self, row):
+        sid = row[0]
+        asset = self.cache.peek(sid)
+        if asset is None:
+            asset = self.cache[sid] = _asset_from_row(row)
+        return asset
+
+    def _load_asset(self, sid):
+        if not isinstance(sid, Integral):
+            raise KeyError(sid)
+        rows = self.db.rows_for_sids([sid])
+        if not rows:
+            raise KeyError(sid)
+        return _asset_from_row(rows[0])
+
+    def _load_symbol(self, symbol):
+        rows = self.db.rows_for_symbol(symbol)
+        if not rows:
+            raise KeyError(symbol)
+        return [self._asset_for_row(row) for row in rows]
+
+    def _load_future_chain(self, root_symbol):
+        rows = self.db.rows_for_root_symbol(root_symbol)
+        if not rows:
+            raise KeyError(root_symbol)
+        return [self._asset_for_row(row) for row in rows]
+
+    def _in_db(self, identifier):
+        if isinstance(identifier, string_types):
+            return self.db.contains_symbol(identifier)
+        if hasattr(identifier, '__int__'):
+            return self.db.contains_sid(identifier)
+        return False
+
+    def insert_metadata(self, identifier, **kwargs):
+        # Bare identifiers that are already in the database need no entry.
+        if not kwargs and self._in_db(identifier):
+            return
+        super(SQLiteAssetFinder, self).insert_metadata(identifier, **kwargs)
+
+    def _stored_sids(self, symbols):
+        return self.db.sids_for_symbols(symbols)
+
+    def _next_sid(self):
+        """
+        The sids of the database need not be contiguous, so new sids are
+        assigned past the largest sid in the database or in the metadata
+        not yet written to it.
+        """
+        sids = [int(entry['sid']) for entry in itervalues(self.metadata_cache)]
+        if self.metadata_frame is not None and len(self.metadata_frame):
+            sids.append(int(self.metadata_frame['sid'].max()))
+        max_sid = self.db.max_sid()
+        if max_sid is not None:
+            sids.append(max_sid)
+        return max(sids) + 1 if sids else 0
+
+    @property
+    def sids(self):
+        return self.db.sids()
+
+    @property
+    def assets(self):
+        return [self.retrieve_asset(sid) for sid in self.sids]
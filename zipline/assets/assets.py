@@ -36,7 +36,12 @@ from zipline.errors import (
     MapAssetIdentifierIndexError,
 )
 from zipline.assets._assets import (
-    Asset, Equity, Future
+    Asset,
+    Equity,
+    Future,
+    asset_array_to_sids,
+    make_assets_from_columns,
+    sids_to_asset_array,
 )
 
 log = Logger('assets.py')
@@ -62,6 +67,91 @@ ASSET_FIELDS = [
     'end_date_nano',  # Used as end_date
 ]
 
+# Columns of a bulk-loaded metadata frame, after the compatibility fields
+# above have been folded into their canonical names.
+FRAME_FIELDS = [
+    'sid',
+    'asset_type',
+    'symbol',
+    'root_symbol',
+    'asset_name',
+    'start_date',
+    'end_date',
+    'first_traded',
+    'exchange',
+    'notice_date',
+    'expiration_date',
+    'contract_multiplier',
+]
+
+# Sentinels used in place of missing dates in arrays of nanoseconds, chosen
+# so that a missing notice date is never after, and a missing start date
+# never before, any real date.
+MIN_NANOS = np.iinfo(np.int64).min
+MAX_NANOS = np.iinfo(np.int64).max
+
+# Fields of FRAME_FIELDS that are stored as UTC datetime64 columns.
+DATE_FIELDS = [
+    'start_date',
+    'end_date',
+    'notice_date',
+    'expiration_date',
+]
+
+
+def _nanos(dates, missing):
+    """
+    Convert an iterable of date-likes to an int64 array of nanoseconds since
+    the epoch, using missing in place of None.
+    """
+    return np.array(
+        [missing if dt is None else pd.Timestamp(dt).value for dt in dates],
+        dtype=np.int64,
+    )
+
+
+def _valid_mask(column):
+    """
+    Return a boolean array marking the entries of a metadata column that
+    insert_metadata would accept, i.e. everything but None, nan and ''.
+    """
+    mask = column.notnull().values
+    if column.dtype == object:
+        mask = mask & (column != '').values
+    return mask
+
+
+def _to_utc_datetime64(values):
+    """
+    Convert an array of date-likes (nanos, strings, datetimes or Timestamps)
+    to a naive datetime64[ns] array of UTC times, with NaT for missing values.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    return index.values.astype('M8[ns]')
+
+
+def _object_column(column, default):
+    """
+    Return the values of column as an object array, with missing entries
+    replaced by default.
+    """
+    values = np.array(column.values, dtype=object)
+    values[pd.isnull(column.values)] = default
+    return values
+
+
+def _timestamp_column(column):
+    """
+    Return a datetime64 column as an object array of UTC Timestamps, with
+    None in place of NaT.
+    """
+    values = np.array(
+        pd.DatetimeIndex(column.values, tz='UTC').astype(object),
+        dtype=object,
+    )
+    values[pd.isnull(column.values)] = None
+    return values
+
 
 class AssetFinder(object):
 
@@ -70,6 +160,7 @@ class AssetFinder(object):
         self.cache = {}
         self.sym_cache = {}
         self.future_chains_cache = {}
+        self.future_chain_dates_cache = {}
         self.fuzzy_match = {}
 
         # This flag controls if the AssetFinder is allowed to generate its own
@@ -80,6 +171,11 @@ class AssetFinder(object):
         # The AssetFinder also holds a nested-dict of all metadata for
         # reference when building Assets
         self.metadata_cache = {}
+
+        # Metadata consumed in bulk from DataFrames is held in columnar form
+        # until an entry is updated, at which point it moves to
+        # metadata_cache.
+        self.metadata_frame = None
         if metadata is not None:
             self.consume_metadata(metadata)
 
@@ -96,6 +192,16 @@ class AssetFinder(object):
         else:
             raise SidNotFound(sid=sid)
 
+    def retrieve_all(self, sids):
+        """
+        Retrieve the Assets for an array-like of integer sids, returning them
+        as an object array in the same order.
+
+        Each distinct sid is looked up once. Raises SidNotFound if any sid is
+        unknown.
+        """
+        return sids_to_asset_array(sids, self.retrieve_asset)
+
     @staticmethod
     def _lookup_symbol_in_infos(infos, as_of_date):
         """
@@ -239,13 +345,43 @@ class AssetFinder(object):
         -------
         [Future]
         """
+        contracts = self.lookup_future_contracts(root_symbol)
+        notice_dates, start_dates = self._future_chain_dates(root_symbol,
+                                                             contracts)
+
+        # The chain is sorted by notice date, so the contracts whose notice
+        # date is after as_of_date are a suffix of it.
+        first = notice_dates.searchsorted(pd.Timestamp(as_of_date).value,
+                                          side='right')
+        started = start_dates[first:] <= pd.Timestamp(knowledge_date).value
+        return [contracts[i] for i in first + np.flatnonzero(started)]
+
+    def lookup_future_contracts(self, root_symbol):
+        """
+        Return every contract for the given root symbol, sorted by notice
+        date.
+
+        Raises RootSymbolNotFound if there are no contracts for root_symbol.
+        """
         try:
-            return [c for c in self.future_chains_cache[root_symbol]
-                    if c.notice_date and (as_of_date < c.notice_date)
-                    and c.start_date and (c.start_date <= knowledge_date)]
+            return self.future_chains_cache[root_symbol]
         except KeyError:
             raise RootSymbolNotFound(root_symbol=root_symbol)
 
+    def _future_chain_dates(self, root_symbol, contracts):
+        """
+        Return arrays of the notice and start dates, in nanoseconds, of
+        contracts.  These are computed once per root symbol.
+        """
+        try:
+            return self.future_chain_dates_cache[root_symbol]
+        except KeyError:
+            dates = self.future_chain_dates_cache[root_symbol] = (
+                _nanos((c.notice_date for c in contracts), MIN_NANOS),
+                _nanos((c.start_date for c in contracts), MAX_NANOS),
+            )
+            return dates
+
     def populate_cache(self):
         """
         Populates the asset cache with all values in the assets
@@ -256,11 +392,18 @@ class AssetFinder(object):
         self.cache = {}
         self.sym_cache = {}
         self.future_chains_cache = {}
+        self.future_chain_dates_cache = {}
         self.fuzzy_match = {}
 
-        for identifier, row in self.metadata_cache.items():
-            asset = self._spawn_asset(identifier=identifier, **row)
+        assets = []
+        if self.metadata_frame is not None:
+            assets.extend(self._spawn_assets_from_frame(self.metadata_frame))
+        assets.extend(
+            self._spawn_asset(identifier=identifier, **row)
+            for identifier, row in self.metadata_cache.items()
+        )
 
+        for asset in assets:
             # Insert asset into the various caches
             self.cache[asset.sid] = asset
 
@@ -351,6 +494,34 @@ class AssetFinder(object):
 
         return asset
 
+    @staticmethod
+    def _spawn_assets_from_frame(frame):
+        """
+        Build Assets for every row of a normalized metadata frame, as
+        produced by _insert_metadata_frame.
+        """
+        asset_types = frame.asset_type.fillna('equity').str.lower()
+        invalid = ~asset_types.isin(['equity', 'future']).values
+        if invalid.any():
+            raise InvalidAssetType(
+                asset_type=frame.asset_type[invalid].iloc[0],
+            )
+
+        return make_assets_from_columns(
+            frame.sid.values.astype(np.int64),
+            (asset_types == 'future').values.astype(np.uint8),
+            _object_column(frame.symbol, ''),
+            _object_column(frame.root_symbol, ''),
+            _object_column(frame.asset_name, ''),
+            _timestamp_column(frame.start_date),
+            _timestamp_column(frame.end_date),
+            _object_column(frame.first_traded, None),
+            _object_column(frame.exchange, ''),
+            _timestamp_column(frame.notice_date),
+            _timestamp_column(frame.expiration_date),
+            frame.contract_multiplier.fillna(1).values.astype(np.int64),
+        )
+
     @property
     def sids(self):
         return self.cache.keys()
@@ -484,6 +655,10 @@ class AssetFinder(object):
         self.consume_identifiers(index)
         self.populate_cache()
 
+        # Assets carry their own sids, so they can be mapped in one pass.
+        if isinstance(first_identifier, Asset):
+            return asset_array_to_sids(index).tolist()
+
         # Look up all Assets for mapping
         matches = []
         missing = []
@@ -505,7 +680,9 @@ class AssetFinder(object):
         :param identifier: The identifier for which to insert metadata
         :param kwargs: The keyed metadata to insert
         """
-        entry = self.metadata_cache.get(identifier, {})
+        entry = self.metadata_cache.get(identifier)
+        if entry is None:
+            entry = self._pop_frame_metadata(identifier)
 
         for key, value in kwargs.items():
             # Do not accept invalid fields
@@ -530,10 +707,20 @@ class AssetFinder(object):
             if hasattr(identifier, '__int__'):
                 entry['sid'] = identifier.__int__()
             else:
-                if self.allow_sid_assignment:
+                # Reuse the sid already stored for the symbol, if any.
+                symbol = entry.get('file_name', entry.get('symbol'))
+                if symbol is None and isinstance(identifier, string_types):
+                    symbol = identifier
+                stored_sid = None
+                if symbol is not None:
+                    stored_sid = self._stored_sids([symbol]).get(symbol)
+
+                if stored_sid is not None:
+                    entry['sid'] = stored_sid
+                elif self.allow_sid_assignment:
                     # Assign the sid the value of its insertion order.
                     # This assumes that we are assigning values to all assets.
-                    entry['sid'] = len(self.metadata_cache)
+                    entry['sid'] = self._next_sid()
                 else:
                     raise SidAssignmentError(identifier=identifier)
 
@@ -577,11 +764,201 @@ class AssetFinder(object):
 
     def clear_metadata(self):
         self.metadata_cache = {}
+        self.metadata_frame = None
+
+    def _metadata_count(self):
+        """
+        The number of identifiers with metadata held by this AssetFinder.
+        """
+        count = len(self.metadata_cache)
+        if self.metadata_frame is not None:
+            count += len(self.metadata_frame)
+        return count
+
+    def _next_sid(self):
+        """
+        The sid assigned to the next identifier inserted without one: its
+        insertion order.
+        """
+        return self._metadata_count()
+
+    def _stored_sids(self, symbols):
+        """
+        A dict of the sid already stored for each of symbols by this
+        AssetFinder's backing store, for the symbols it knows.  An
+        AssetFinder has no backing store, so this is empty.
+        """
+        return {}
+
+    def normalized_metadata(self):
+        """
+        Return all metadata held by this AssetFinder as a single frame indexed
+        by identifier, with the columns in FRAME_FIELDS.
+        """
+        frames = []
+        if self.metadata_frame is not None:
+            frames.append(self.metadata_frame)
+        if self.metadata_cache:
+            # Every entry in metadata_cache already has a sid, so the
+            # converter never needs to assign one.
+            converter = AssetFinder()
+            converter._insert_metadata_frame(
+                pd.DataFrame.from_dict(self.metadata_cache, orient='index'),
+            )
+            frames.append(converter.metadata_frame)
+
+        if not frames:
+            return pd.DataFrame(columns=FRAME_FIELDS)
+        return pd.concat(frames)
+
+    def _pop_frame_metadata(self, identifier):
+        """
+        Remove the entry for identifier from the bulk-loaded metadata frame
+        and return it as a metadata dict, or return an empty dict if the
+        identifier was not bulk-loaded.
+        """
+        frame = self.metadata_frame
+        if frame is None or identifier not in frame.index:
+            return {}
+
+        row = frame.loc[identifier]
+        self.metadata_frame = frame.drop(identifier)
+        return {
+            key: value for key, value in row.iteritems()
+            if not pd.isnull(value)
+        }
+
+    def _is_new_metadata_frame(self, dataframe):
+        """
+        Return True if every identifier in dataframe is unique and unknown to
+        this AssetFinder, so that the frame can be consumed in bulk.
+        """
+        index = dataframe.index
+        if not index.is_unique:
+            return False
+        if index.isin(list(self.metadata_cache)).any():
+            return False
+        frame = self.metadata_frame
+        return frame is None or not index.isin(frame.index).any()
 
     def _insert_metadata_dataframe(self, dataframe):
+        # Frames made up entirely of new identifiers are normalized and
+        # stored in columnar form. Frames that update existing entries are
+        # merged into those entries field by field.
+        if self._is_new_metadata_frame(dataframe):
+            self._insert_metadata_frame(dataframe)
+            return
+
         for identifier, row in dataframe.iterrows():
             self.insert_metadata(identifier, **row)
 
+    def _insert_metadata_frame(self, dataframe):
+        """
+        Normalize a DataFrame of metadata for new identifiers in a single
+        vectorized pass, and append it to self.metadata_frame.
+
+        This applies the same rules as insert_metadata and _spawn_asset,
+        column by column rather than row by row.
+        """
+        index = dataframe.index
+        if not len(index):
+            return
+
+        def column(field):
+            # The field as a Series with entries insert_metadata would have
+            # rejected masked to nan.
+            if field not in dataframe.columns:
+                return pd.Series(np.nan, index=index, dtype=object)
+            values = dataframe[field]
+            return values.where(_valid_mask(values))
+
+        identifiers = np.array(index, dtype=object)
+
+        # file_name takes precedence over symbol. Identifiers that are
+        # strings are used as the symbol if no symbol is given.
+        symbol = column('file_name').combine_first(column('symbol'))
+        is_string = np.array(
+            [isinstance(i, string_types) for i in identifiers],
+            dtype=bool,
+        )
+        from_identifier = symbol.isnull().values & is_string
+        symbol[from_identifier] = identifiers[from_identifier]
+
+        # company_name is only used if asset_name is not given.
+        asset_name = column('asset_name').combine_first(
+            column('company_name'),
+        )
+
+        dates = {
+            'start_date': column('start_date_nano').combine_first(
+                column('start_date'),
+            ),
+            'end_date': column('end_date_nano').combine_first(
+                column('end_date'),
+            ),
+            'notice_date': column('notice_date'),
+            'expiration_date': column('expiration_date'),
+        }
+
+        # Identifiers without a sid use their integer value, or else are
+        # assigned their insertion order.
+        sids = np.array(column('sid').values, dtype=object)
+        missing = pd.isnull(sids)
+        if missing.any():
+            has_int = np.array(
+                [hasattr(i, '__int__') for i in identifiers],
+                dtype=bool,
+            )
+            from_identifier = missing & has_int
+            sids[from_identifier] = [
+                i.__int__() for i in identifiers[from_identifier]
+            ]
+
+            unassigned = missing & ~has_int
+            if unassigned.any():
+                # Reuse the sids already stored for the symbols, if any.
+                stored = self._stored_sids(
+                    symbol[unassigned].dropna().unique().tolist(),
+                )
+                if stored:
+                    stored_sids = symbol.map(stored).values
+                    found = unassigned & ~pd.isnull(stored_sids)
+                    sids[found] = stored_sids[found]
+                    unassigned &= ~found
+
+            if unassigned.any():
+                if not self.allow_sid_assignment:
+                    raise SidAssignmentError(
+                        identifier=identifiers[unassigned][0],
+                    )
+                sids[unassigned] = (
+                    self._next_sid() + np.flatnonzero(unassigned)
+                )
+
+        normalized = pd.DataFrame(
+            {
+                'sid': sids.astype(np.int64),
+                'asset_type': column('asset_type'),
+                'symbol': symbol,
+                'root_symbol': column('root_symbol'),
+                'asset_name': asset_name,
+                'first_traded': column('first_traded'),
+                'exchange': column('exchange'),
+                'contract_multiplier': column('contract_multiplier'),
+            },
+            index=index,
+            columns=FRAME_FIELDS,
+        )
+        for field in DATE_FIELDS:
+            normalized[field] = _to_utc_datetime64(dates[field].values)
+
+        if self.metadata_frame is None:
+            self.metadata_frame = normalized
+        else:
+            self.metadata_frame = pd.concat(
+                [self.metadata_frame, normalized],
+            )
+
     def _insert_metadata_dict(self, dict):
         for identifier, entry in dict.items():
             self.insert_metadata(identifier, **entry)
@@ -0,0 +1,333 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Roll schedules for futures chains.
+
+A RollRule assigns each contract of a chain the date on which it stops being
+the front contract.  A RollCalendar holds those dates as a sorted array, so
+that the front contract on any date is a single searchsorted, and builds
+continuous price series by stitching together the prices of successive front
+contracts.
+"""
+from abc import ABCMeta, abstractmethod
+
+import numpy as np
+import pandas as pd
+from six import with_metaclass
+
+from zipline.assets._assets import asset_array_to_sids
+from zipline.assets.assets import MIN_NANOS
+
+ADJUSTMENTS = frozenset([None, 'add', 'mul'])
+
+
+def _date_nanos(date):
+    if date is None:
+        return MIN_NANOS
+    return pd.Timestamp(date).value
+
+
+def _index_nanos(index):
+    return pd.DatetimeIndex(index).values.astype('M8[ns]').astype(np.int64)
+
+
+class RollRule(with_metaclass(ABCMeta)):
+    """
+    Abstract base class for the rules deciding when a chain rolls from one
+    contract to the next.
+    """
+
+    @abstractmethod
+    def roll_dates(self, contracts):
+        """
+        Return an int64 array holding, for each of contracts, the date in
+        nanoseconds on which the contract stops being the front contract.
+
+        contracts are sorted by notice date.  Contracts that can never be the
+        front contract get MIN_NANOS.
+        """
+        raise NotImplementedError('roll_dates')
+
+
+class NoticeDateRoll(RollRule):
+    """
+    Roll on each contract's notice date, falling back on its expiration date
+    and then its end date when the notice date is unknown.
+    """
+
+    def roll_dates(self, contracts):
+        return np.array(
+            [_date_nanos(c.notice_date or c.expiration_date or c.end_date)
+             for c in contracts],
+            dtype=np.int64,
+        )
+
+
+class ExpirationRoll(RollRule):
+    """
+    Roll a fixed number of days before each contract expires.
+
+    If trading_days is given, days_before counts trading sessions, and the
+    roll happens at the start of a session.  Otherwise days_before counts
+    calendar days.
+    """
+
+    def __init__(self, days_before, trading_days=None):
+        if days_before < 0:
+            raise ValueError(
+                "days_before must be non-negative, got %s" % days_before
+            )
+        self.days_before = days_before
+        self.trading_days = trading_days
+
+    def roll_dates(self, contracts):
+        expirations = np.array(
+            [_date_nanos(c.expiration_date or c.notice_date or c.end_date)
+             for c in contracts],
+            dtype=np.int64,
+        )
+        missing = expirations == MIN_NANOS
+
+        if self.trading_days is None:
+            dates = expirations - pd.Timedelta(days=self.days_before).value
+        else:
+            sessions = _index_nanos(self.trading_days)
+            locs = sessions.searchsorted(expirations) - self.days_before
+            dates = sessions[np.clip(locs, 0, len(sessions) - 1)]
+
+        dates[missing] = MIN_NANOS
+        return dates
+
+
+class VolumeRoll(RollRule):
+    """
+    Roll to the next contract on the session after its volume first exceeds
+    that of the current front contract, but no later than the date given by
+    the fallback rule.
+
+    volumes is a DataFrame of daily volumes indexed by session, with a column
+    per contract, either sids or Assets.
+    """
+
+    def __init__(self, volumes, fallback=None):
+        self.volumes = volumes
+        self.fallback = NoticeDateRoll() if fallback is None else fallback
+
+    def roll_dates(self, contracts):
+        dates = self.fallback.roll_dates(contracts)
+
+        sessions = _index_nanos(self.volumes.index)
+        columns = pd.Index(asset_array_to_sids(self.volumes.columns))
+        locs = columns.get_indexer([c.sid for c in contracts])
+        volumes = self.volumes.values
+
+        previous = MIN_NANOS
+        for i in range(len(contracts) - 1):
+            current, following = locs[i], locs[i + 1]
+            if dates[i] == MIN_NANOS or current < 0 or following < 0:
+                continue
+
+            # Only sessions between the previous roll and the fallback roll
+            # can trigger an early roll.
+            start = sessions.searchsorted(previous)
+            stop = sessions.searchsorted(dates[i])
+            crossed = np.flatnonzero(
+                volumes[start:stop, following] > volumes[start:stop, current]
+            )
+            if len(crossed):
+                session = start + crossed[0] + 1
+                if session < len(sessions):
+                    dates[i] = min(dates[i], sessions[session])
+            previous = dates[i]
+
+        return dates
+
+
+class RollCalendar(object):
+    """
+    The sequence of front contracts of a futures chain.
+
+    Contract i is the front contract from roll_dates[i - 1] (inclusive) until
+    roll_dates[i] (exclusive).  Roll dates are forced to be non-decreasing, so
+    a contract whose roll date precedes that of an earlier contract is never
+    the front contract.
+    """
+
+    def __init__(self, root_symbol, contracts, roll_dates):
+        if len(contracts) != len(roll_dates):
+            raise ValueError(
+                "Got %d contracts but %d roll dates" % (len(contracts),
+                                                        len(roll_dates))
+            )
+        self.root_symbol = root_symbol
+        self.contracts = np.array(list(contracts) + [None], dtype=object)
+        self.roll_dates = np.maximum.accumulate(
+            np.asarray(roll_dates, dtype=np.int64)
+        )
+        self.sids = np.array([c.sid for c in contracts], dtype=np.int64)
+
+    @classmethod
+    def from_rule(cls, root_symbol, contracts, roll_rule):
+        return cls(root_symbol, contracts, roll_rule.roll_dates(contracts))
+
+    def __len__(self):
+        return len(self.sids)
+
+    def __repr__(self):
+        return '%s(%r, %d contracts)' % (type(self).__name__,
+                                         self.root_symbol,
+                                         len(self))
+
+    def front_position(self, dts):
+        """
+        Return the positions in the chain of the front contracts on dts, as
+        an int64 array.  Dates after the last roll map to len(self).
+        """
+        return self.roll_dates.searchsorted(_index_nanos(dts), side='right')
+
+    def front_contract(self, dt):
+        """
+        Return the front contract on dt, or None if the chain has run out.
+        """
+        loc = self.roll_dates.searchsorted(pd.Timestamp(dt).value,
+                                           side='right')
+        return self.contracts[loc]
+
+    def front_contracts(self, dts):
+        """
+        Return an object array of the front contracts on each of dts, with
+        None where the chain has run out.
+        """
+        return self.contracts[self.front_position(dts)]
+
+    def roll_schedule(self):
+        """
+        Return a Series of the contract that becomes the front contract on
+        each roll date.
+        """
+        rolls = self.roll_dates
+        live = np.flatnonzero(
+            (np.diff(rolls) > 0) & (rolls[:-1] != MIN_NANOS)
+        ) + 1
+        return pd.Series(
+            self.contracts[live],
+            index=pd.DatetimeIndex(rolls[live - 1], tz='UTC'),
+        )
+
+    def continuous_prices(self, prices, adjustment=None):
+        """
+        Build a continuous price series from the prices of the contracts in
+        the chain.
+
+        Parameters
+        ----------
+        prices : pd.DataFrame
+            Prices indexed by date, with a column per contract, either sids
+            or Assets.
+        adjustment : {None, 'add', 'mul'}
+            How earlier prices are back-adjusted at each roll.  None leaves
+            them as traded, 'add' shifts them by the difference between the
+            new and old contract's prices on the roll date, and 'mul' scales
+            them by the ratio of those prices.
+
+        Returns
+        -------
+        pd.Series
+            The price of the front contract on each date, NaN where the
+            front contract has no price.
+        """
+        if adjustment not in ADJUSTMENTS:
+            raise ValueError(
+                "adjustment must be one of %s, got %r"
+                % (sorted(ADJUSTMENTS, key=str), adjustment)
+            )
+
+        columns = pd.Index(asset_array_to_sids(prices.columns))
+        # Column of each contract in prices, with -1 past the chain's end.
+        contract_locs = np.append(columns.get_indexer(self.sids), -1)
+        locs = contract_locs[self.front_position(prices.index)]
+
+        values = prices.values.astype(np.float64)
+        rows = np.arange(len(values))
+        has_price = locs >= 0
+
+        result = np.full(len(values), np.nan)
+        result[has_price] = values[rows[has_price], locs[has_price]]
+
+        if adjustment is not None and len(values) > 1:
+            # Rows where the front contract changes, priced in both the
+            # outgoing and the incoming contract.
+            rolls = np.flatnonzero(
+                (locs[1:] != locs[:-1]) & has_price[1:] & has_price[:-1]
+            ) + 1
+            new = values[rolls, locs[rolls]]
+            old = values[rolls, locs[rolls - 1]]
+
+            if adjustment == 'add':
+                steps = np.zeros(len(values))
+                steps[rolls] = np.where(np.isnan(new - old), 0.0, new - old)
+                # Each price moves by the sum of the gaps of all later rolls.
+                shifts = np.append(np.cumsum(steps[::-1])[::-1][1:], 0.0)
+                result += shifts
+            else:
+                steps = np.ones(len(values))
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    ratios = new / old
+                steps[rolls] = np.where(np.isfinite(ratios), ratios, 1.0)
+                scales = np.append(np.cumprod(steps[::-1])[::-1][1:], 1.0)
+                result *= scales
+
+        return pd.Series(result, index=prices.index, name=self.root_symbol)
+
+
+class FutureChainIndex(object):
+    """
+    Per-root-symbol RollCalendars for the futures known to an AssetFinder,
+    built on first use.
+    """
+
+    def __init__(self, asset_finder, roll_rule=None):
+        self.asset_finder = asset_finder
+        self.roll_rule = NoticeDateRoll() if roll_rule is None else roll_rule
+        self._calendars = {}
+
+    def calendar(self, root_symbol):
+        """
+        Return the RollCalendar for root_symbol.
+
+        Raises RootSymbolNotFound if there are no contracts for root_symbol.
+        """
+        try:
+            return self._calendars[root_symbol]
+        except KeyError:
+            contracts = self.asset_finder.lookup_future_contracts(root_symbol)
+            calendar = self._calendars[root_symbol] = RollCalendar.from_rule(
+                root_symbol, contracts, self.roll_rule,
+            )
+            return calendar
+
+    def front_contract(self, root_symbol, dt):
+        return self.calendar(root_symbol).front_contract(dt)
+
+    def front_contracts(self, root_symbol, dts):
+        return self.calendar(root_symbol).front_contracts(dts)
+
+    def continuous_prices(self, root_symbol, prices, adjustment=None):
+        return self.calendar(root_symbol).continuous_prices(prices,
+                                                            adjustment)
+
+    def clear(self):
+        self._calendars.clear()
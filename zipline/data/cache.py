@@ -0,0 +1,181 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Binary on-disk cache for benchmark returns and treasury curves.
+
+Each cache file is an uncompressed .npz archive holding:
+
+- ``index``: the UTC dates of the data, as int64 nanoseconds.
+- ``values``: the data, as a float64 vector (a Series) or matrix (a
+  DataFrame).
+- ``columns``: the column labels of a DataFrame, as strings.  Columns that
+  are not numeric, like the date column of the treasury curves, are
+  dropped.
+- ``header``: a JSON document with the format version, the kind of data,
+  its first and last dates, where it was downloaded from and the
+  modification time and size of the CSV file it was written alongside.
+
+Nothing is pickled, so loading is a handful of memory copies rather than the
+CSV parse done by the text files alongside.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CACHE_FORMAT_VERSION = 1
+
+
+class CacheFormatError(ValueError):
+    """
+    Raised when a cache file is unreadable or was written in a different
+    format version.  Callers treat it like a missing cache.
+    """
+    pass
+
+
+def _isoformat(nanos):
+    return pd.Timestamp(nanos, tz='UTC').isoformat()
+
+
+def file_signature(path):
+    """
+    The modification time and size of the file at path, to tell whether it
+    changed since a cache was written from it.
+    """
+    stat = os.stat(path)
+    return {'mtime': stat.st_mtime, 'size': stat.st_size}
+
+
+def _header_for(index, kind, source, source_file):
+    return {
+        'version': CACHE_FORMAT_VERSION,
+        'kind': kind,
+        'source': source,
+        'source_file': source_file,
+        'start': _isoformat(index[0]) if len(index) else None,
+        'end': _isoformat(index[-1]) if len(index) else None,
+        'length': len(index),
+    }
+
+
+def _numeric_columns(frame):
+    columns, values = [], []
+    for column in frame.columns:
+        try:
+            values.append(np.asarray(frame[column], dtype=np.float64))
+        except (TypeError, ValueError):
+            continue
+        columns.append(str(column))
+    return columns, np.column_stack(values) if values else None
+
+
+def write_cache(path, data, kind, source, source_file=None):
+    """
+    Write a Series or DataFrame indexed by date to path.
+
+    source_file is the file_signature of the file the data was also written
+    to, if any, which readers check the cache against.
+
+    The file is written to a temporary path and moved into place, so a
+    reader never sees a partially written cache.
+    """
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+
+    nanos = index.values.astype('M8[ns]').astype(np.int64)
+    arrays = {
+        'index': nanos,
+        'header': np.array(json.dumps(
+            _header_for(nanos, kind, source, source_file),
+        )),
+    }
+    if isinstance(data, pd.DataFrame):
+        columns, values = _numeric_columns(data)
+        if values is None:
+            values = np.empty((len(data), 0))
+        arrays['columns'] = np.array(columns)
+        arrays['values'] = values
+    else:
+        arrays['values'] = np.asarray(data.values, dtype=np.float64)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.rename(tmp_path, path)
+
+
+def _open(path):
+    try:
+        archive = np.load(path)
+    except (IOError, OSError):
+        raise
+    except Exception as e:
+        raise CacheFormatError("Unreadable cache file %s: %s" % (path, e))
+
+    try:
+        header = json.loads(str(archive['header']))
+    except (KeyError, ValueError) as e:
+        archive.close()
+        raise CacheFormatError("Missing cache header in %s: %s" % (path, e))
+
+    if header.get('version') != CACHE_FORMAT_VERSION:
+        archive.close()
+        raise CacheFormatError(
+            "Cache file %s has format version %s, expected %s" % (
+                path, header.get('version'), CACHE_FORMAT_VERSION,
+            )
+        )
+    return archive, header
+
+
+def read_cache_header(path):
+    """
+    Return the header of the cache at path without loading its data.
+    """
+    archive, header = _open(path)
+    archive.close()
+    return header
+
+
+def read_cache(path):
+    """
+    Load the cache at path.
+
+    Returns
+    -------
+    data : pd.Series or pd.DataFrame
+        The cached data, indexed by UTC dates.
+    header : dict
+        The cache's header.
+
+    Raises IOError if there is no file at path, and CacheFormatError if the
+    file is not a readable cache.
+    """
+    archive, header = _open(path)
+    try:
+        index = pd.DatetimeIndex(archive['index'].view('M8[ns]'), tz='UTC')
+        values = archive['values']
+        if 'columns' in archive.files:
+            data = pd.DataFrame(values, index=index,
+                                columns=archive['columns'].tolist())
+        else:
+            data = pd.Series(values, index=index)
+    finally:
+        archive.close()
+    return data, header
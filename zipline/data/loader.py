@@ -30,7 +30,14 @@ from six import iteritems
 
 from . import benchmarks
 from . benchmarks import get_benchmark_returns
+from . cache import (
+    CacheFormatError,
+    file_signature,
+    read_cache,
+    write_cache,
+)
 
+from zipline.errors import MarketDataNotFound, StaleMarketData
 from zipline.utils.tradingcalendar import trading_day as trading_day_nyse
 from zipline.utils.tradingcalendar import trading_days as trading_days_nyse
 
@@ -49,6 +56,10 @@ CACHE_PATH = os.path.join(
     'cache'
 )
 
+# Values of the ZIPLINE_OFFLINE environment variable that enable offline
+# mode.
+OFFLINE_VALUES = frozenset(['1', 'true', 'yes', 'on'])
+
 # Mapping from index symbol to appropriate bond data
 INDEX_MAPPING = {
     '^GSPC':
@@ -152,12 +163,119 @@ def get_benchmark_filename(symbol):
     return "%s_benchmark.csv" % symbol
 
 
+def get_cache_filename(filename):
+    """
+    Return the name of the binary cache stored next to a CSV data file.
+    """
+    return os.path.splitext(filename)[0] + '.npz'
+
+
+def offline_mode():
+    """
+    Whether market data should be loaded without touching the network, as
+    set by the ZIPLINE_OFFLINE environment variable.
+    """
+    return os.environ.get('ZIPLINE_OFFLINE', '').lower() in OFFLINE_VALUES
+
+
+def _csv_signature(filename):
+    """
+    The file_signature of the CSV file filename, or None if it is missing.
+    """
+    try:
+        return file_signature(get_data_filepath(filename))
+    except (OSError, IOError):
+        return None
+
+
+def _read_cached(filename, read_csv):
+    """
+    Load a data file, preferring its binary cache.  The binary cache is
+    written from the CSV file if it is missing or unreadable, or if the CSV
+    file was changed since the cache was written, e.g. by copying in fresher
+    data.
+
+    Raises IOError if neither file exists.
+    """
+    cache_filepath = get_data_filepath(get_cache_filename(filename))
+    try:
+        data, header = read_cache(cache_filepath)
+    except (OSError, IOError, CacheFormatError):
+        pass
+    else:
+        csv_signature = _csv_signature(filename)
+        if csv_signature is None or \
+                header.get('source_file') == csv_signature:
+            return data, header['source']
+        logger.info(
+            "{csv} changed since {cache} was written, rebuilding it.",
+            csv=get_data_filepath(filename),
+            cache=cache_filepath,
+        )
+
+    data = read_csv(get_data_filepath(filename))
+    _write_cached(filename, data, source='csv')
+    return data, 'csv'
+
+
+def _write_cached(filename, data, source):
+    kind, _ = os.path.splitext(filename)
+    try:
+        write_cache(get_data_filepath(get_cache_filename(filename)),
+                    data, kind, source, source_file=_csv_signature(filename))
+    except (OSError, IOError) as e:
+        logger.warn("Failed to write cache for {name}: {error}",
+                    name=filename, error=e)
+
+
+def _is_stale(last_date, days_up_to_now):
+    """
+    Whether more than one trading day has elapsed since last_date.
+    """
+    last_date_offset = days_up_to_now.searchsorted(last_date.normalize())
+
+    # We're doing "> 2" rather than "> 1" because we're subtracting an array
+    # _length_ from an array _index_, and therefore even if we had data up to
+    # and including the current day, the difference would still be 1.
+    return len(days_up_to_now) - last_date_offset > 2
+
+
+def _as_utc(data):
+    if data.index.tz is None:
+        return data.tz_localize('UTC')
+    if str(data.index.tz) != 'UTC':
+        return data.tz_convert('UTC')
+    return data
+
+
 def load_market_data(trading_day=trading_day_nyse,
-                     trading_days=trading_days_nyse, bm_symbol='^GSPC'):
-    bm_filepath = get_data_filepath(get_benchmark_filename(bm_symbol))
+                     trading_days=trading_days_nyse, bm_symbol='^GSPC',
+                     offline=None):
+    """
+    Load benchmark returns and treasury curves for bm_symbol.
+
+    Data is read from binary caches in DATA_PATH, falling back on the CSV
+    files next to them, and is downloaded if it is missing or more than one
+    trading day old.
+
+    If offline is True, or is None and the ZIPLINE_OFFLINE environment
+    variable is set, nothing is downloaded.  Missing data raises
+    MarketDataNotFound and out of date data raises StaleMarketData instead.
+    """
+    if offline is None:
+        offline = offline_mode()
+
+    most_recent = pd.Timestamp('today', tz='UTC') - trading_day
+    most_recent_index = trading_days.searchsorted(most_recent)
+    days_up_to_now = trading_days[:most_recent_index + 1]
+
+    bm_filename = get_benchmark_filename(bm_symbol)
     try:
-        saved_benchmarks = pd.Series.from_csv(bm_filepath)
+        saved_benchmarks, _ = _read_cached(bm_filename, pd.Series.from_csv)
     except (OSError, IOError, ValueError):
+        bm_filepath = get_data_filepath(bm_filename)
+        if offline:
+            raise MarketDataNotFound(kind='benchmark', path=bm_filepath)
         logger.info(
             "No cache found at {path}. "
             "Downloading benchmark data for '{symbol}'.",
@@ -167,44 +285,39 @@ def load_market_data(trading_day=trading_day_nyse,
 
         dump_benchmarks(bm_symbol)
         saved_benchmarks = pd.Series.from_csv(bm_filepath)
+        _write_cached(bm_filename, saved_benchmarks, source='yahoo')
 
-    saved_benchmarks = saved_benchmarks.tz_localize('UTC')
-
-    most_recent = pd.Timestamp('today', tz='UTC') - trading_day
-    most_recent_index = trading_days.searchsorted(most_recent)
-    days_up_to_now = trading_days[:most_recent_index + 1]
-
-    # Find the offset of the last date for which we have trading data in our
-    # list of valid trading days
-    last_bm_date = saved_benchmarks.index[-1]
-    last_bm_date_offset = days_up_to_now.searchsorted(
-        last_bm_date.strftime('%Y/%m/%d'))
+    saved_benchmarks = _as_utc(saved_benchmarks)
 
     # If more than 1 trading days has elapsed since the last day where
-    # we have data,then we need to update
-    # We're doing "> 2" rather than "> 1" because we're subtracting an array
-    # _length_ from an array _index_, and therefore even if we had data up to
-    # and including the current day, the difference would still be 1.
-    if len(days_up_to_now) - last_bm_date_offset > 2:
-        benchmark_returns = update_benchmarks(bm_symbol, last_bm_date)
-        if benchmark_returns.index.tz is None or \
-           benchmark_returns.index.tz.zone != 'UTC':
-            benchmark_returns = benchmark_returns.tz_localize('UTC')
+    # we have data, then we need to update.
+    last_bm_date = saved_benchmarks.index[-1]
+    if _is_stale(last_bm_date, days_up_to_now):
+        if offline:
+            raise StaleMarketData(
+                kind='benchmark',
+                path=get_data_filepath(bm_filename),
+                last_date=last_bm_date.date(),
+                most_recent=days_up_to_now[-1].date(),
+            )
+        benchmark_returns = _as_utc(
+            update_benchmarks(bm_symbol, last_bm_date)
+        )
+        _write_cached(bm_filename, benchmark_returns, source='yahoo')
     else:
         benchmark_returns = saved_benchmarks
-        if benchmark_returns.index.tz is None or\
-           benchmark_returns.index.tz.zone != 'UTC':
-            benchmark_returns = benchmark_returns.tz_localize('UTC')
 
     # Get treasury curve module, filename & source from mapping.
     # Default to USA.
     module, filename, source = INDEX_MAPPING.get(
         bm_symbol, INDEX_MAPPING['^GSPC'])
 
-    tr_filepath = get_data_filepath(filename)
     try:
-        saved_curves = pd.DataFrame.from_csv(tr_filepath)
+        saved_curves, _ = _read_cached(filename, pd.DataFrame.from_csv)
     except (OSError, IOError, ValueError):
+        tr_filepath = get_data_filepath(filename)
+        if offline:
+            raise MarketDataNotFound(kind='treasury', path=tr_filepath)
         logger.info(
             "No cache found at {path}. "
             "Downloading treasury data from {source}.",
@@ -214,20 +327,24 @@ def load_market_data(trading_day=trading_day_nyse,
 
         dump_treasury_curves(module, filename)
         saved_curves = pd.DataFrame.from_csv(tr_filepath)
+        _write_cached(filename, saved_curves, source=source)
 
-    # Find the offset of the last date for which we have trading data in our
-    # list of valid trading days
-    last_tr_date = saved_curves.index[-1]
-    last_tr_date_offset = days_up_to_now.searchsorted(
-        last_tr_date.strftime('%Y/%m/%d'))
+    saved_curves = _as_utc(saved_curves)
 
-    # If more than 1 trading days has elapsed since the last day where
-    # we have data,then we need to update
-    # Comment above explains why this is "> 2".
-    if len(days_up_to_now) - last_tr_date_offset > 2:
-        treasury_curves = dump_treasury_curves(module, filename)
+    # Same staleness check as for the benchmark.
+    last_tr_date = saved_curves.index[-1]
+    if _is_stale(last_tr_date, days_up_to_now):
+        if offline:
+            raise StaleMarketData(
+                kind='treasury',
+                path=get_data_filepath(filename),
+                last_date=last_tr_date.date(),
+                most_recent=days_up_to_now[-1].date(),
+            )
+        treasury_curves = _as_utc(dump_treasury_curves(module, filename))
+        _write_cached(filename, treasury_curves, source=source)
     else:
-        treasury_curves = saved_curves.tz_localize('UTC')
+        treasury_curves = saved_curves
 
     return benchmark_returns, treasury_curves
 
@@ -100,6 +100,38 @@ You may only call override_commission in your initialize method.
 """.strip()
 
 
+class UnsupportedRecordAggregation(ZiplineError):
+    """
+    Raised if a user script calls set_record_options with an aggregation
+    that isn't supported.
+    """
+    msg = """
+Recorded variables can be aggregated with one of {supported}, got {how!r}.
+""".strip()
+
+
+class NonNumericRecordedValue(ZiplineError):
+    """
+    Raised if a value that isn't a number is recorded for a variable that is
+    aggregated or kept as a series.
+    """
+    msg = """
+Can not record {value!r} for {name!r}: values of variables that are \
+aggregated or kept as series must be numbers.
+""".strip()
+
+
+class EventBudgetExceeded(ZiplineError):
+    """
+    Raised if handle_data and the scheduled functions take longer than the
+    algorithm's event_budget on a bar, with event_budget_action='raise'.
+    """
+    msg = """
+handle_data and scheduled functions took {elapsed:.6f}s at {dt}, over the \
+budget of {budget:.6f}s per bar.
+""".strip()
+
+
 class TransactionWithNoVolume(ZiplineError):
     """
     Raised if a transact call returns a transaction with zero volume.
@@ -138,6 +170,16 @@ Transaction volume of {txn} exceeds the order volume of {order}.
 """.strip()
 
 
+class FillForUnknownOrder(ZiplineError):
+    """
+    Raised if a broker reports a fill for an order that was not placed
+    through the blotter.
+    """
+    msg = """
+Transaction {txn} fills an order that was never placed.
+""".strip()
+
+
 class UnsupportedOrderParameters(ZiplineError):
     """
     Raised if a set of mutually exclusive parameters are passed to an order
@@ -285,6 +327,47 @@ AssetFinder metadata is missing a SID for identifier '{identifier}'.
 """.strip()
 
 
+class AssetDBVersionError(ZiplineError):
+    """
+    Raised when an asset database file was written with a schema version
+    that this version of zipline can not read.
+    """
+    msg = """
+Asset database at '{path}' has version {db_version}, but version \
+{expected_version} is required.
+""".strip()
+
+
+class MarketDataNotFound(ZiplineError):
+    """
+    Raised when benchmark or treasury data is missing and can not be
+    downloaded because zipline is in offline mode.
+    """
+    msg = """
+No {kind} data found at '{path}', and downloads are disabled in offline mode.
+""".strip()
+
+
+class StaleMarketData(ZiplineError):
+    """
+    Raised when benchmark or treasury data is out of date and can not be
+    updated because zipline is in offline mode.
+    """
+    msg = """
+The {kind} data at '{path}' ends on {last_date}, more than one trading day \
+before {most_recent}, and downloads are disabled in offline mode.
+""".strip()
+
+
+class InvalidCheckpoint(ZiplineError):
+    """
+    Raised when a simulation can not be resumed from a checkpoint file.
+    """
+    msg = """
+Can not resume from checkpoint '{path}': {reason}.
+""".strip()
+
+
 class NoSourceError(ZiplineError):
     """
     Raised when no source is given to the pipeline
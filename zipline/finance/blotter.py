@@ -190,7 +190,13 @@ class Blotter(object):
         for order in orders_to_modify:
             order.handle_split(split_event)
 
-    def process_benchmark(self, benchmark_event):
+    def process_benchmark(self, dt):
+        """
+        Called at each dt a perf message is emitted at, before the trades of
+        that dt are processed, with the (txn, order) pairs yielded being
+        processed first.  Lets a broker report fills made outside of the
+        trade events.
+        """
         return
         yield
 
@@ -233,19 +239,7 @@ class Blotter(object):
             if txn.type == zp.DATASOURCE_TYPE.COMMISSION:
                 order.commission = (order.commission or 0.0) + txn.cost
             else:
-                if txn.amount == 0:
-                    raise zipline.errors.TransactionWithNoAmount(txn=txn)
-                if math.copysign(1, txn.amount) != order.direction:
-                    raise zipline.errors.TransactionWithWrongDirection(
-                        txn=txn, order=order)
-                if abs(txn.amount) > abs(self.orders[txn.order_id].amount):
-                    raise zipline.errors.TransactionVolumeExceedsOrder(
-                        txn=txn, order=order)
-
-                order.filled += txn.amount
-                if txn.commission is not None:
-                    order.commission = ((order.commission or 0.0) +
-                                        txn.commission)
+                self._apply_transaction(order, txn)
 
             # mark the date of the order to match the transaction
             # that is filling it.
@@ -253,6 +247,44 @@ class Blotter(object):
 
             yield txn, order
 
+    def _apply_transaction(self, order, txn):
+        if txn.amount == 0:
+            raise zipline.errors.TransactionWithNoAmount(txn=txn)
+        if math.copysign(1, txn.amount) != order.direction:
+            raise zipline.errors.TransactionWithWrongDirection(
+                txn=txn, order=order)
+        if abs(txn.amount) > abs(self.orders[txn.order_id].amount):
+            raise zipline.errors.TransactionVolumeExceedsOrder(
+                txn=txn, order=order)
+
+        order.filled += txn.amount
+        if txn.commission is not None:
+            order.commission = ((order.commission or 0.0) +
+                                txn.commission)
+
+    def process_fill(self, txn):
+        """
+        Apply a transaction made by a broker outside of the blotter, such as
+        a fill reported by a live broker, to the order it fills.  Returns
+        the order.
+        """
+        try:
+            order = self.orders[txn.order_id]
+        except KeyError:
+            raise zipline.errors.FillForUnknownOrder(txn=txn)
+
+        self._apply_transaction(order, txn)
+        order.dt = txn.dt
+
+        if not order.open:
+            orders = self.open_orders[order.sid]
+            if order in orders:
+                orders.remove(order)
+            if not orders:
+                del self.open_orders[order.sid]
+
+        return order
+
     def __getstate__(self):
 
         state_to_save = ['new_orders', 'orders', '_status']
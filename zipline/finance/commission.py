@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 from six import iteritems
 
 from zipline.utils.serialization_utils import (
@@ -56,6 +57,21 @@ class PerShare(object):
             commission = max(commission, self.min_trade_cost)
             return abs(commission / transaction.amount), commission
 
+    def calculate_many(self, amounts, prices, order_ids=None):
+        """
+        Vectorized calculate over the transactions with the given amounts
+        and prices.  The minimum trade cost applies to each transaction.
+
+        returns a tuple of arrays:
+        (per share commissions, total transaction commissions)
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        commissions = np.abs(amounts * self.cost)
+        if self.min_trade_cost is None:
+            return np.full(len(amounts), self.cost), commissions
+        commissions = np.maximum(commissions, self.min_trade_cost)
+        return np.abs(commissions / amounts), commissions
+
     def __getstate__(self):
 
         state_dict = \
@@ -104,6 +120,31 @@ class PerTrade(object):
 
         return abs(self.cost / transaction.amount), self.cost
 
+    def calculate_many(self, amounts, prices, order_ids=None):
+        """
+        Vectorized calculate over the transactions with the given amounts
+        and prices.
+
+        If order_ids are given, the transactions filling the same order are
+        one trade: the cost is charged once per order and spread over its
+        transactions by share count.  Otherwise each transaction is charged
+        the full cost, as in calculate.
+
+        returns a tuple of arrays:
+        (per share commissions, total transaction commissions)
+        """
+        shares = np.abs(np.asarray(amounts, dtype=float))
+        if order_ids is None:
+            trade_shares = shares
+        else:
+            _, trades = np.unique(np.asarray(order_ids), return_inverse=True)
+            trade_shares = np.bincount(trades, weights=shares)[trades]
+
+        per_share = np.zeros(len(shares))
+        traded = trade_shares != 0
+        per_share[traded] = self.cost / trade_shares[traded]
+        return per_share, per_share * shares
+
     def __getstate__(self):
 
         state_dict = \
@@ -152,6 +193,18 @@ class PerDollar(object):
         cost_per_share = transaction.price * self.cost
         return cost_per_share, abs(transaction.amount) * cost_per_share
 
+    def calculate_many(self, amounts, prices, order_ids=None):
+        """
+        Vectorized calculate over the transactions with the given amounts
+        and prices.
+
+        returns a tuple of arrays:
+        (per share commissions, total transaction commissions)
+        """
+        costs_per_share = np.asarray(prices, dtype=float) * self.cost
+        return (costs_per_share,
+                np.abs(np.asarray(amounts, dtype=float)) * costs_per_share)
+
     def __getstate__(self):
 
         state_dict = \
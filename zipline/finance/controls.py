@@ -14,6 +14,8 @@
 # limitations under the License.
 import abc
 
+import numpy as np
+import pandas as pd
 from six import with_metaclass
 
 from zipline.errors import (
@@ -22,6 +24,50 @@ from zipline.errors import (
 )
 
 
+def _applies_to(control_asset, assets):
+    """
+    Mask of the assets that a control restricted to control_asset, or to
+    every asset if control_asset is None, applies to.
+    """
+    if control_asset is None:
+        return np.ones(len(assets), dtype=bool)
+    return np.array([asset == control_asset for asset in assets], dtype=bool)
+
+
+def _held_shares(portfolio, assets):
+    """
+    The number of shares of each of assets held in portfolio.
+    """
+    positions = portfolio.positions
+    return np.array(
+        [positions[asset].amount if asset in positions else 0
+         for asset in assets],
+        dtype=np.float64,
+    )
+
+
+def _current_prices(assets, mask, algo_current_data):
+    """
+    The current price of each of the assets selected by mask, and NaN for the
+    others.
+    """
+    prices = np.full(len(assets), np.nan)
+    selected = np.flatnonzero(mask)
+    prices[selected] = algo_current_data.current(
+        [assets[i] for i in selected], 'price',
+    )
+    return prices
+
+
+def _nanos(dates, missing):
+    """
+    Dates as int64 nanoseconds, with missing in place of None.
+    """
+    return np.array([missing if date is None else date.value
+                     for date in dates],
+                    dtype=np.int64)
+
+
 class TradingControl(with_metaclass(abc.ABCMeta)):
     """
     Abstract base class representing a fail-safe control on the behavior of any
@@ -55,6 +101,47 @@ class TradingControl(with_metaclass(abc.ABCMeta)):
         """
         raise NotImplementedError
 
+    def validate_many(self,
+                      assets,
+                      amounts,
+                      portfolio,
+                      algo_datetime,
+                      algo_current_data):
+        """
+        Check a batch of orders, placed together on the same bar, against this
+        TradingControl's constraint.
+
+        Returns a boolean array flagging the orders that violate it.  Unlike
+        validate, this method does not call self.fail; the caller decides
+        which violation to report.
+
+        The default implementation calls validate on each order.  Subclasses
+        override it to look up positions, prices and restrictions once for
+        the whole batch.
+        """
+        failed = np.zeros(len(assets), dtype=bool)
+        for i, (asset, amount) in enumerate(zip(assets, amounts)):
+            try:
+                self.validate(asset,
+                              amount,
+                              portfolio,
+                              algo_datetime,
+                              algo_current_data)
+            except TradingControlViolation:
+                failed[i] = True
+        return failed
+
+    def commit_many(self, assets, amounts, algo_datetime):
+        """
+        Called once a batch of orders checked with validate_many has passed
+        every TradingControl, before the orders are placed.
+
+        validate_many should have no externally-visible side-effects, as the
+        batch may still be rejected by another control.  Controls keeping
+        track of the orders placed update their state here instead.
+        """
+        pass
+
     def fail(self, asset, amount, datetime):
         """
         Raise a TradingControlViolation with information about the failure.
@@ -82,6 +169,15 @@ class MaxOrderCount(TradingControl):
         self.max_count = max_count
         self.current_date = None
 
+    def _roll_date(self, algo_datetime):
+        """
+        Reset the order count if algo_datetime is on a new day.
+        """
+        algo_date = algo_datetime.date()
+        if self.current_date and self.current_date != algo_date:
+            self.orders_placed = 0
+        self.current_date = algo_date
+
     def validate(self,
                  asset,
                  amount,
@@ -91,17 +187,33 @@ class MaxOrderCount(TradingControl):
         """
         Fail if we've already placed self.max_count orders today.
         """
-        algo_date = algo_datetime.date()
-
-        # Reset order count if it's a new day.
-        if self.current_date and self.current_date != algo_date:
-            self.orders_placed = 0
-        self.current_date = algo_date
+        self._roll_date(algo_datetime)
 
         if self.orders_placed >= self.max_count:
             self.fail(asset, amount, algo_datetime)
         self.orders_placed += 1
 
+    def validate_many(self,
+                      assets,
+                      amounts,
+                      _portfolio,
+                      algo_datetime,
+                      _algo_current_data):
+        """
+        Flag the orders past the first self.max_count placed today.
+
+        The orders are only counted by commit_many, once the whole batch has
+        passed every control.
+        """
+        self._roll_date(algo_datetime)
+
+        remaining = max(self.max_count - self.orders_placed, 0)
+        return np.arange(len(assets)) >= remaining
+
+    def commit_many(self, assets, amounts, algo_datetime):
+        self._roll_date(algo_datetime)
+        self.orders_placed += len(assets)
+
 
 class RestrictedListOrder(TradingControl):
     """
@@ -131,6 +243,22 @@ class RestrictedListOrder(TradingControl):
         if asset in self.restricted_list:
             self.fail(asset, amount, _algo_datetime)
 
+    def validate_many(self,
+                      assets,
+                      amounts,
+                      _portfolio,
+                      _algo_datetime,
+                      _algo_current_data):
+        """
+        Flag the orders for assets in the restricted_list.
+        """
+        # A SecurityList flags a whole batch with one lookup of its current
+        # contents.
+        if hasattr(self.restricted_list, 'restricted'):
+            return self.restricted_list.restricted(assets)
+        return np.array([asset in self.restricted_list for asset in assets],
+                        dtype=bool)
+
 
 class MaxOrderSize(TradingControl):
     """
@@ -188,6 +316,30 @@ class MaxOrderSize(TradingControl):
         if too_much_value:
             self.fail(asset, amount, _algo_datetime)
 
+    def validate_many(self,
+                      assets,
+                      amounts,
+                      portfolio,
+                      _algo_datetime,
+                      algo_current_data):
+        """
+        Flag the orders whose magnitude exceeds either self.max_shares or
+        self.max_notional.
+        """
+        applies = _applies_to(self.asset, assets)
+        amounts = np.asarray(amounts, dtype=np.float64)
+
+        failed = np.zeros(len(assets), dtype=bool)
+        if self.max_shares is not None:
+            failed |= np.abs(amounts) > self.max_shares
+
+        if self.max_notional is not None:
+            prices = _current_prices(assets, applies, algo_current_data)
+            with np.errstate(invalid='ignore'):
+                failed |= np.abs(amounts * prices) > self.max_notional
+
+        return failed & applies
+
 
 class MaxPositionSize(TradingControl):
     """
@@ -250,6 +402,34 @@ class MaxPositionSize(TradingControl):
         if too_much_value:
             self.fail(asset, amount, algo_datetime)
 
+    def validate_many(self,
+                      assets,
+                      amounts,
+                      portfolio,
+                      algo_datetime,
+                      algo_current_data):
+        """
+        Flag the orders that would take the magnitude of their position over
+        self.max_shares or self.max_notional.
+        """
+        applies = _applies_to(self.asset, assets)
+        shares_post_order = (
+            _held_shares(portfolio, assets) +
+            np.asarray(amounts, dtype=np.float64)
+        )
+
+        failed = np.zeros(len(assets), dtype=bool)
+        if self.max_shares is not None:
+            failed |= np.abs(shares_post_order) > self.max_shares
+
+        if self.max_notional is not None:
+            prices = _current_prices(assets, applies, algo_current_data)
+            with np.errstate(invalid='ignore'):
+                failed |= (np.abs(shares_post_order * prices) >
+                           self.max_notional)
+
+        return failed & applies
+
 
 class LongOnly(TradingControl):
     """
@@ -269,6 +449,18 @@ class LongOnly(TradingControl):
         if portfolio.positions[asset].amount + amount < 0:
             self.fail(asset, amount, _algo_datetime)
 
+    def validate_many(self,
+                      assets,
+                      amounts,
+                      portfolio,
+                      _algo_datetime,
+                      _algo_current_data):
+        """
+        Flag the orders that would leave a negative position.
+        """
+        return (_held_shares(portfolio, assets) +
+                np.asarray(amounts, dtype=np.float64)) < 0
+
 
 class AssetDateBounds(TradingControl):
     """
@@ -293,6 +485,20 @@ class AssetDateBounds(TradingControl):
         if asset.end_date and (algo_datetime >= asset.end_date):
             self.fail(asset, amount, algo_datetime)
 
+    def validate_many(self,
+                      assets,
+                      amounts,
+                      portfolio,
+                      algo_datetime,
+                      algo_current_data):
+        """
+        Flag the orders for assets that are not trading at algo_datetime.
+        """
+        now = pd.Timestamp(algo_datetime).value
+        starts = _nanos([asset.start_date for asset in assets], now)
+        ends = _nanos([asset.end_date for asset in assets], now + 1)
+        return (now < starts) | (now >= ends)
+
 
 class AccountControl(with_metaclass(abc.ABCMeta)):
     """
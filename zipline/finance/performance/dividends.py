@@ -0,0 +1,138 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The schedule of the dividends known to a simulation.
+"""
+import numpy as np
+import pandas as pd
+
+# The fields of a dividend used to earn and pay it.  Dates are nanoseconds
+# since the epoch, in UTC, and a missing payment_sid, ratio or amount is NaN.
+DIVIDEND_DTYPE = np.dtype([
+    ('id', np.int64),
+    ('sid', np.int64),
+    ('ex_date', np.int64),
+    ('pay_date', np.int64),
+    ('payment_sid', np.float64),
+    ('ratio', np.float64),
+    ('net_amount', np.float64),
+    ('gross_amount', np.float64),
+])
+
+
+def dividend_table(frame):
+    """
+    A structured array of DIVIDEND_DTYPE holding the dividends in frame, a
+    DataFrame with columns containing at least the entries in
+    zipline.protocol.DIVIDEND_FIELDS plus an 'id'.
+    """
+    table = np.empty(len(frame), dtype=DIVIDEND_DTYPE)
+    for field in ('id', 'sid'):
+        table[field] = frame[field].values.astype(np.int64)
+    for field in ('ex_date', 'pay_date'):
+        table[field] = pd.DatetimeIndex(frame[field]).values\
+            .astype('datetime64[ns]').view(np.int64)
+    for field in ('payment_sid', 'ratio', 'net_amount', 'gross_amount'):
+        table[field] = frame[field].values.astype(np.float64)
+    return table
+
+
+class DividendSchedule(object):
+    """
+    The dividends known to a simulation.
+
+    The dividends are held as a structured array of DIVIDEND_DTYPE, indexed
+    by ex date and by pay date, so that the dividends going ex or paid on a
+    day are found by binary search rather than by comparing the dates of
+    every dividend.
+    """
+
+    def __init__(self, frame=None):
+        self.table = np.empty(0, dtype=DIVIDEND_DTYPE)
+        # The frames the dividends were added from, and their concatenation
+        # once it is needed.
+        self._frames = []
+        self._frame = None
+        # field -> (the sorted values of field, the order sorting them)
+        self._indexes = {}
+
+        if frame is not None and len(frame):
+            self.add(frame)
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def frame(self):
+        """
+        The dividends as a DataFrame sorted by pay date and ex date, and
+        indexed by id.
+        """
+        if not self._frames:
+            return pd.DataFrame()
+        if self._frame is None:
+            self._frame = pd.concat(self._frames)\
+                .sort(['pay_date', 'ex_date'])\
+                .set_index('id', drop=False)
+            self._frames = [self._frame]
+        return self._frame
+
+    def add(self, frame):
+        """
+        Add the dividends in frame, which must have an 'id' column on top of
+        zipline.protocol.DIVIDEND_FIELDS.
+        """
+        self.table = np.concatenate([self.table, dividend_table(frame)])
+        self._frames.append(frame)
+        self._frame = None
+        self._indexes = {}
+
+    def remove_sid(self, sid):
+        """
+        Drop the dividends of sid.
+        """
+        if not len(self):
+            return
+        self.table = self.table[self.table['sid'] != sid]
+        frame = self.frame
+        self._frame = frame[frame.sid != sid]
+        self._frames = [self._frame]
+        self._indexes = {}
+
+    def _on(self, field, date):
+        try:
+            values, order = self._indexes[field]
+        except KeyError:
+            order = np.argsort(self.table[field], kind='mergesort')
+            values = self.table[field][order]
+            self._indexes[field] = values, order
+
+        value = pd.Timestamp(date).value
+        start = values.searchsorted(value, 'left')
+        stop = values.searchsorted(value, 'right')
+        return self.table[order[start:stop]]
+
+    def going_ex(self, date):
+        """
+        The dividends whose ex_date is date, as an array of DIVIDEND_DTYPE.
+        """
+        return self._on('ex_date', date)
+
+    def paid(self, date):
+        """
+        The dividends whose pay_date is date, as an array of DIVIDEND_DTYPE.
+        """
+        return self._on('pay_date', date)
@@ -88,6 +88,7 @@ from six import itervalues, iteritems
 
 import zipline.protocol as zp
 
+from zipline.utils.memory import sizeof
 from zipline.utils.serialization_utils import (
     VERSION_LABEL
 )
@@ -98,6 +99,26 @@ log = logbook.Logger('Performance')
 TRADE_TYPE = zp.DATASOURCE_TYPE.TRADE
 
 
+def changed_fields(current, previous):
+    """
+    The items of the dict current whose values differ from those in the
+    dict previous, or are not in it.  NaNs compare equal to each other.
+    """
+    if not previous:
+        return dict(current)
+
+    changed = {}
+    for key, value in iteritems(current):
+        try:
+            old = previous[key]
+        except KeyError:
+            changed[key] = value
+            continue
+        if value != old and not (value != value and old != old):
+            changed[key] = value
+    return changed
+
+
 class PerformancePeriod(object):
 
     def __init__(
@@ -310,34 +331,53 @@ class PerformancePeriod(object):
 
         # we want the key to be absent, not just empty
         if self.keep_transactions:
-            if dt:
-                # Only include transactions for given dt
-                try:
-                    transactions = [x.to_dict()
-                                    for x in self.processed_transactions[dt]]
-                except KeyError:
-                    transactions = []
-            else:
-                transactions = \
-                    [y.to_dict()
-                     for x in itervalues(self.processed_transactions)
-                     for y in x]
-            rval['transactions'] = transactions
+            rval['transactions'] = self._transactions_list(dt)
 
         if self.keep_orders:
-            if dt:
-                # only include orders modified as of the given dt.
-                try:
-                    orders = [x.to_dict()
-                              for x in itervalues(self.orders_by_modified[dt])]
-                except KeyError:
-                    orders = []
-            else:
-                orders = [x.to_dict() for x in itervalues(self.orders_by_id)]
-            rval['orders'] = orders
+            rval['orders'] = self._orders_list(dt)
 
         return rval
 
+    def to_delta_dict(self, previous, dt=None):
+        """
+        A compact version of to_dict(dt), without positions, and with only
+        the scalar fields whose values differ from those in previous.
+
+        Returns a tuple of the delta and of all the scalar fields, which
+        are the previous to pass for the next delta.
+        """
+        scalars = self.__core_dict()
+        delta = changed_fields(scalars, previous)
+
+        if self.keep_transactions:
+            delta['transactions'] = self._transactions_list(dt)
+
+        if self.keep_orders:
+            delta['orders'] = self._orders_list(dt)
+
+        return delta, scalars
+
+    def _transactions_list(self, dt=None):
+        if dt:
+            # Only include transactions for given dt
+            try:
+                return [x.to_dict() for x in self.processed_transactions[dt]]
+            except KeyError:
+                return []
+        return [y.to_dict()
+                for x in itervalues(self.processed_transactions)
+                for y in x]
+
+    def _orders_list(self, dt=None):
+        if dt:
+            # only include orders modified as of the given dt.
+            try:
+                return [x.to_dict()
+                        for x in itervalues(self.orders_by_modified[dt])]
+            except KeyError:
+                return []
+        return [x.to_dict() for x in itervalues(self.orders_by_id)]
+
     def as_portfolio(self):
         """
         The purpose of this method is to provide a portfolio
@@ -410,6 +450,19 @@ class PerformancePeriod(object):
             getattr(self, 'net_liquidation', self._net_liquidation_value)
         return account
 
+    @property
+    def nbytes(self):
+        """
+        An estimate of the number of bytes held by the transactions and
+        orders processed during the period.
+        """
+        seen = set()
+        return sum(sizeof(store, seen) for store in (
+            self.processed_transactions,
+            self.orders_by_id,
+            self.orders_by_modified,
+        ))
+
     def __getstate__(self):
         state_dict = {k: v for k, v in iteritems(self.__dict__)
                       if not k.startswith('_')}
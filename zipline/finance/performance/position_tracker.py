@@ -206,68 +206,83 @@ class PositionTracker(object):
             self._update_multipliers(split.sid)
             return leftover_cash
 
-    def _maybe_earn_dividend(self, dividend):
+    def earn_dividends(self, dividends):
         """
-        Take a historical dividend record and return a Series with fields in
-        zipline.protocol.DIVIDEND_FIELDS (plus an 'id' field) representing
-        the cash/stock amount we are owed when the dividend is paid.
+        Given an array of dividends of
+        zipline.finance.performance.dividends.DIVIDEND_DTYPE whose ex_dates
+        are all the next trading day, calculate and store the cash and/or stock
+        payments to be paid on each dividend's pay date.
         """
-        if dividend['sid'] in self.positions:
-            return self.positions[dividend['sid']].earn_dividend(dividend)
-        else:
-            return zp.dividend_payment()
+        positions = self.positions
+        held = np.array([sid in positions for sid in dividends['sid']],
+                        dtype=bool)
+        if not held.any():
+            return
+        dividends = dividends[held]
+        amounts = np.array(
+            [positions[sid].amount for sid in dividends['sid']],
+            dtype=np.float64,
+        )
 
-    def earn_dividends(self, dividend_frame):
-        """
-        Given a frame of dividends whose ex_dates are all the next trading day,
-        calculate and store the cash and/or stock payments to be paid on each
-        dividend's pay date.
-        """
-        earned = dividend_frame.apply(self._maybe_earn_dividend, axis=1)\
-                               .dropna(how='all')
-        if len(earned) > 0:
-            # Store the earned dividends so that they can be paid on the
-            # dividends' pay_dates.
-            self._unpaid_dividends = pd.concat(
-                [self._unpaid_dividends, earned],
-            )
-
-    def _maybe_pay_dividend(self, dividend):
-        """
-        Take a historical dividend record, look up any stored record of
-        cash/stock we are owed for that dividend, and return a Series
-        with fields drawn from zipline.protocol.DIVIDEND_PAYMENT_FIELDS.
-        """
-        try:
-            unpaid_dividend = self._unpaid_dividends.loc[dividend['id']]
-            return unpaid_dividend
-        except KeyError:
-            return zp.dividend_payment()
+        # As in Position.earn_dividend, a dividend pays stock if it has a
+        # payment_sid, and cash of its net amount if it has one, or else of
+        # its gross amount.
+        payment_sids = dividends['payment_sid']
+        pays_stock = ~np.isnan(payment_sids) & (payment_sids != 0)
+        net_amounts = dividends['net_amount']
+        gross_amounts = dividends['gross_amount']
+        pays_net = ~np.isnan(net_amounts) & (net_amounts != 0)
+        pays_gross = ~pays_net & ~np.isnan(gross_amounts) & \
+            (gross_amounts != 0)
+
+        earned = pd.DataFrame(
+            {
+                'id': dividends['id'],
+                'payment_sid': np.where(pays_stock, payment_sids, np.nan),
+                'share_count': np.where(
+                    pays_stock,
+                    np.floor(amounts * dividends['ratio']),
+                    np.nan,
+                ),
+                'cash_amount': np.where(
+                    pays_net,
+                    amounts * net_amounts,
+                    np.where(pays_gross, amounts * gross_amounts, np.nan),
+                ),
+            },
+            index=dividends['id'],
+            columns=zp.DIVIDEND_PAYMENT_FIELDS,
+        )
+
+        # Store the earned dividends so that they can be paid on the
+        # dividends' pay_dates.
+        self._unpaid_dividends = pd.concat([self._unpaid_dividends, earned])
 
-    def pay_dividends(self, dividend_frame):
+    def pay_dividends(self, dividends):
         """
-        Given a frame of dividends whose pay_dates are all the next trading
-        day, grant the cash and/or stock payments that were calculated on the
-        given dividends' ex dates.
+        Given an array of dividends of DIVIDEND_DTYPE whose pay_dates are all
+        the next trading day, grant the cash and/or stock payments that were
+        calculated on the given dividends' ex dates.
         """
-        payments = dividend_frame.apply(self._maybe_pay_dividend, axis=1)\
-                                 .dropna(how='all')
+        unpaid = self._unpaid_dividends
+        paid = unpaid.index.isin(dividends['id'])
+        payments = unpaid[paid]
 
         # Mark these dividends as paid by dropping them from our unpaid
         # table.
-        self._unpaid_dividends.drop(payments.index)
+        self._unpaid_dividends = unpaid[~paid]
 
         # Add stock for any stock dividends paid.  Again, the values here may
         # be negative in the case of short positions.
         stock_payments = payments[payments['payment_sid'].notnull()]
-        for _, row in stock_payments.iterrows():
-            stock = row['payment_sid']
-            share_count = row['share_count']
+        for stock, share_count in zip(stock_payments['payment_sid'].values,
+                                      stock_payments['share_count'].values):
+            stock = int(stock)
             # note we create a Position for stock dividend if we don't
             # already own the asset
             position = self.positions[stock]
 
-            position.amount += share_count
+            position.amount += int(share_count)
             self._position_amounts[stock] = position.amount
             self._position_last_sale_prices[stock] = position.last_sale_price
             self._update_multipliers(stock)
@@ -69,15 +69,20 @@ from pandas.tseries.tools import normalize_date
 
 import zipline.finance.risk as risk
 from zipline.finance.trading import TradingEnvironment
-from . period import PerformancePeriod
+from . period import PerformancePeriod, changed_fields
 
 from zipline.utils.serialization_utils import (
     VERSION_LABEL
 )
 from . position_tracker import PositionTracker
+from . dividends import DividendSchedule
 
 log = logbook.Logger('Performance')
 
+# The fields of a PerformancePeriod's dict that are not scalars.
+NON_SCALAR_FIELDS = frozenset(['positions', 'transactions', 'orders',
+                               'recorded_vars'])
+
 
 class PerformanceTracker(object):
     """
@@ -105,24 +110,25 @@ class PerformanceTracker(object):
 
         self.trading_days = all_trading_days[mask]
 
-        self.dividend_frame = pd.DataFrame()
+        self._dividends = DividendSchedule()
         self._dividend_count = 0
 
         self.position_tracker = PositionTracker()
 
         self.perf_periods = []
 
+        # Every benchmark return, in dt order, with its dt as nanoseconds
+        # since the epoch.  Perf messages are emitted at these dts.
+        self.benchmark_dts = np.empty(0, dtype=np.int64)
+        self.benchmark_values = np.empty(0, dtype=np.float64)
+        # The benchmark's return on each of trading_days, NaN if unknown.
+        self.benchmark_returns = np.full(len(self.trading_days), np.nan)
+
         if self.emission_rate == 'daily':
-            self.all_benchmark_returns = pd.Series(
-                index=self.trading_days)
             self.cumulative_risk_metrics = \
                 risk.RiskMetricsCumulative(self.sim_params)
 
         elif self.emission_rate == 'minute':
-            self.all_benchmark_returns = pd.Series(index=pd.date_range(
-                self.sim_params.first_open, self.sim_params.last_close,
-                freq='Min'))
-
             self.cumulative_risk_metrics = \
                 risk.RiskMetricsCumulative(self.sim_params,
                                            returns_frequency='daily',
@@ -220,9 +226,18 @@ class PerformanceTracker(object):
         )
         self._dividend_count += len(new_dividends)
 
-        self.dividend_frame = pd.concat(
-            [self.dividend_frame, new_dividends]
-        ).sort(['pay_date', 'ex_date']).set_index('id', drop=False)
+        self._dividends.add(new_dividends)
+
+    @property
+    def dividend_frame(self):
+        """
+        The dividends known to this tracker, sorted by pay date and ex date.
+        """
+        return self._dividends.frame
+
+    @dividend_frame.setter
+    def dividend_frame(self, frame):
+        self._dividends = DividendSchedule(frame)
 
     def initialize_dividends_from_other(self, other):
         """
@@ -248,9 +263,7 @@ class PerformanceTracker(object):
         """
 
         # Drop any dividends for the sid from the dividends frame
-        self.dividend_frame = self.dividend_frame[
-            self.dividend_frame.sid != sid
-        ]
+        self._dividends.remove_sid(sid)
 
     def update_performance(self):
         # calculate performance as of last trade
@@ -298,6 +311,76 @@ class PerformanceTracker(object):
 
         return _dict
 
+    def to_minute_delta(self, previous, recorded_vars):
+        """
+        A compact alternative to to_dict() for minute emission.
+
+        Instead of full snapshots of each section, holds under
+        'minute_perf_delta' the dt and, for each section, the scalar fields
+        that changed since previous, the scalars of the last minute's
+        message.  'minute_perf' also holds the transactions and orders of
+        the minute and the recorded variables that changed.  Positions are
+        left out.
+
+        Returns a tuple of the message and of the scalars to pass as
+        previous for the next minute.
+        """
+        previous = previous or {}
+
+        cumulative, cumulative_scalars = \
+            self.cumulative_performance.to_delta_dict(
+                previous.get('cumulative_perf'),
+            )
+        minute, minute_scalars = self.todays_performance.to_delta_dict(
+            previous.get('minute_perf'),
+            self.saved_dt,
+        )
+        minute['recorded_vars'] = changed_fields(
+            recorded_vars,
+            previous.get('recorded_vars'),
+        )
+        risk_scalars = self.cumulative_risk_metrics.to_dict()
+
+        message = {
+            'minute_perf_delta': {
+                'dt': self.saved_dt,
+                'progress': self.progress,
+                'cumulative_perf': cumulative,
+                'minute_perf': minute,
+                'cumulative_risk_metrics': changed_fields(
+                    risk_scalars,
+                    previous.get('cumulative_risk_metrics'),
+                ),
+            }
+        }
+        scalars = {
+            'cumulative_perf': cumulative_scalars,
+            'minute_perf': minute_scalars,
+            'cumulative_risk_metrics': risk_scalars,
+            'recorded_vars': dict(recorded_vars),
+        }
+        return message, scalars
+
+    @staticmethod
+    def minute_scalars(message):
+        """
+        The scalars of a full minute message from to_dict(), with its
+        recorded variables, to pass as previous to to_minute_delta.
+        """
+        def scalar_fields(section):
+            return {k: v for k, v in iteritems(section)
+                    if k not in NON_SCALAR_FIELDS}
+
+        minute = message['minute_perf']
+        return {
+            'cumulative_perf': scalar_fields(message['cumulative_perf']),
+            'minute_perf': scalar_fields(minute),
+            'cumulative_risk_metrics': dict(
+                message['cumulative_risk_metrics'],
+            ),
+            'recorded_vars': dict(minute.get('recorded_vars', {})),
+        }
+
     def process_trade(self, event):
         # update last sale, and pay out a cash adjustment
         cash_adjustment = self.position_tracker.update_last_sale(event)
@@ -331,26 +414,57 @@ class PerformanceTracker(object):
         for perf_period in self.perf_periods:
             perf_period.handle_commission(event)
 
+    def set_benchmark_returns(self, dts, returns):
+        """
+        Set the benchmark's returns for the whole simulation: returns[i] is
+        the return known as of dts[i], which should be the close of its
+        trading day with minute data or emission, and the day itself
+        otherwise.
+        """
+        dts = pd.DatetimeIndex(dts)
+        returns = np.asarray(returns, dtype=np.float64)
+        order = np.argsort(dts.asi8, kind='mergesort')
+
+        self.benchmark_dts = np.empty(0, dtype=np.int64)
+        self.benchmark_values = np.empty(0, dtype=np.float64)
+        self.benchmark_returns = np.full(len(self.trading_days), np.nan)
+        self._add_benchmark_returns(dts[order], returns[order])
+
     def process_benchmark(self, event):
-        if self.sim_params.data_frequency == 'minute' and \
-           self.sim_params.emission_rate == 'daily':
-            # Minute data benchmarks should have a timestamp of market
-            # close, so that calculations are triggered at the right time.
-            # However, risk module uses midnight as the 'day'
-            # marker for returns, so adjust back to midnight.
-            midnight = pd.tseries.tools.normalize_date(event.dt)
-        else:
-            midnight = event.dt
-
-        if midnight not in self.all_benchmark_returns.index:
+        """
+        Add a single benchmark return, as of event.dt, after those already
+        known.
+        """
+        self._add_benchmark_returns(
+            pd.DatetimeIndex([event.dt]),
+            np.array([event.returns], dtype=np.float64),
+        )
+
+    def _add_benchmark_returns(self, dts, returns):
+        # Minute data benchmarks should have a timestamp of market close, so
+        # that calculations are triggered at the right time.  However, risk
+        # module uses midnight as the 'day' marker for returns, so adjust
+        # back to midnight.
+        days = dts.normalize()
+        locs = self.trading_days.get_indexer(days)
+        missing = locs == -1
+        if missing.any():
             raise AssertionError(
-                ("Date %s not allocated in all_benchmark_returns. "
-                 "Calendar seems to mismatch with benchmark. "
-                 "Benchmark container is=%s" %
-                 (midnight,
-                  self.all_benchmark_returns.index)))
+                "Date %s is not a trading day of the simulation.  Calendar "
+                "seems to mismatch with benchmark.  Trading days are %s" % (
+                    days[missing][0], self.trading_days,
+                )
+            )
+        self.benchmark_returns[locs] = returns
 
-        self.all_benchmark_returns[midnight] = event.returns
+        self.benchmark_dts = np.concatenate([
+            self.benchmark_dts,
+            dts.values.astype('datetime64[ns]').view(np.int64),
+        ])
+        self.benchmark_values = np.concatenate([
+            self.benchmark_values,
+            returns,
+        ])
 
     def process_close_position(self, event):
 
@@ -372,29 +486,26 @@ class PerformanceTracker(object):
         is the next trading day.  Apply all such benefits, then recalculate
         performance.
         """
-        if len(self.dividend_frame) == 0:
+        if len(self._dividends) == 0:
             # We don't currently know about any dividends for this simulation
             # period, so bail.
             return
 
         # Get the next trading day and, if it is outside the bounds of the
         # simulation, bail.
-        next_trading_day = TradingEnvironment.instance().\
-            next_trading_day(completed_date)
+        next_trading_day = self.next_trading_day(completed_date)
         if (next_trading_day is None) or (next_trading_day >= self.last_close):
             return
 
         # Dividends whose ex_date is the next trading day.  We need to check if
         # we own any of these stocks so we know to pay them out when the pay
         # date comes.
-        ex_date_mask = (self.dividend_frame['ex_date'] == next_trading_day)
-        dividends_earnable = self.dividend_frame[ex_date_mask]
+        dividends_earnable = self._dividends.going_ex(next_trading_day)
 
         # Dividends whose pay date is the next trading day.  If we held any of
         # these stocks on midnight before the ex_date, we need to pay these out
         # now.
-        pay_date_mask = (self.dividend_frame['pay_date'] == next_trading_day)
-        dividends_payable = self.dividend_frame[pay_date_mask]
+        dividends_payable = self._dividends.paid(next_trading_day)
 
         position_tracker = self.position_tracker
         if len(dividends_earnable):
@@ -409,6 +520,16 @@ class PerformanceTracker(object):
             # notify periods to update their stats
             period.handle_dividends_paid(net_cash_payment)
 
+    def next_trading_day(self, date):
+        """
+        The first of the simulation's trading days after date, or None if
+        date is on or after the last one.
+        """
+        loc = self.trading_days.searchsorted(normalize_date(date), 'right')
+        if loc == len(self.trading_days):
+            return None
+        return self.trading_days[loc]
+
     def handle_minute_close(self, dt):
         self.update_performance()
         todays_date = normalize_date(dt)
@@ -416,8 +537,13 @@ class PerformanceTracker(object):
 
         self.minute_performance.rollover()
 
-        bench_returns = self.all_benchmark_returns.loc[todays_date:dt]
-        # cumulative returns
+        # The benchmark returns known since midnight, cumulated.
+        start = self.benchmark_dts.searchsorted(
+            pd.Timestamp(todays_date).value, 'left',
+        )
+        stop = self.benchmark_dts.searchsorted(pd.Timestamp(dt).value, 'right')
+        bench_returns = self.benchmark_values[start:stop]
+        bench_returns = bench_returns[~np.isnan(bench_returns)]
         bench_since_open = (1. + bench_returns).prod() - 1
 
         self.cumulative_risk_metrics.update(todays_date,
@@ -452,7 +578,7 @@ class PerformanceTracker(object):
         self.cumulative_risk_metrics.update(
             completed_date,
             self.todays_performance.returns,
-            self.all_benchmark_returns[completed_date],
+            self.benchmark_returns[self.trading_days.get_loc(completed_date)],
             account)
 
         # increment the day counter before we move markers forward.
@@ -469,10 +595,9 @@ class PerformanceTracker(object):
             return daily_update
 
         # move the market day markers forward
-        env = TradingEnvironment.instance()
+        self.day = self.next_trading_day(self.day)
         self.market_open, self.market_close = \
-            env.next_open_and_close(self.day)
-        self.day = env.next_trading_day(self.day)
+            TradingEnvironment.instance().get_open_and_close(self.day)
 
         # Roll over positions to current day.
         self.todays_performance.rollover()
@@ -525,7 +650,7 @@ class PerformanceTracker(object):
         # we already store perf periods as attributes
         del state_dict['perf_periods']
 
-        STATE_VERSION = 3
+        STATE_VERSION = 4
         state_dict[VERSION_LABEL] = STATE_VERSION
 
         return state_dict
@@ -538,10 +663,21 @@ class PerformanceTracker(object):
         if version < OLDEST_SUPPORTED_STATE:
             raise BaseException("PerformanceTracker saved state is too old.")
 
-        self.__dict__.update(state)
-
         # Handle the dividend frame specially
-        self.dividend_frame = pickle.loads(state['dividend_frame'])
+        dividend_frame = pickle.loads(state.pop('dividend_frame'))
+
+        # Versions before 4 held the benchmark returns as a series.
+        all_benchmark_returns = state.pop('all_benchmark_returns', None)
+
+        self.__dict__.update(state)
+        self.dividend_frame = dividend_frame
+
+        if version < 4:
+            known = all_benchmark_returns.dropna()
+            self.benchmark_dts = np.empty(0, dtype=np.int64)
+            self.benchmark_values = np.empty(0, dtype=np.float64)
+            self.benchmark_returns = np.full(len(self.trading_days), np.nan)
+            self._add_benchmark_returns(known.index, known.values)
 
         # properly setup the perf periods
         self.perf_periods = []
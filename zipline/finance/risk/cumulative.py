@@ -73,11 +73,55 @@ def information_ratio(algo_volatility, algorithm_return, benchmark_return):
     return (algorithm_return - benchmark_return) / algo_volatility
 
 
+# The fields of RiskMetricsCumulative.cont, besides METRIC_NAMES.
+CONT_FIELDS = (
+    'algorithm_returns',
+    'benchmark_returns',
+    'algorithm_cumulative_returns',
+    'benchmark_cumulative_returns',
+    'mean_returns',
+    'annualized_mean_returns',
+    'mean_benchmark_returns',
+    'annualized_mean_benchmark_returns',
+    'algorithm_cumulative_leverages',
+    'excess_returns',
+    'drawdowns',
+    'max_drawdowns',
+    'max_leverages',
+)
+
+# The arrays held by version 2 states, by their field in cont.
+_V2_CONT_ARRAYS = {
+    'algorithm_returns': 'algorithm_returns_cont',
+    'benchmark_returns': 'benchmark_returns_cont',
+    'algorithm_cumulative_returns': 'algorithm_cumulative_returns',
+    'benchmark_cumulative_returns': 'benchmark_cumulative_returns',
+    'mean_returns': 'mean_returns_cont',
+    'annualized_mean_returns': 'annualized_mean_returns_cont',
+    'mean_benchmark_returns': 'mean_benchmark_returns_cont',
+    'annualized_mean_benchmark_returns':
+    'annualized_mean_benchmark_returns_cont',
+    'algorithm_cumulative_leverages': 'algorithm_cumulative_leverages_cont',
+    'excess_returns': 'excess_returns',
+    'drawdowns': 'drawdowns',
+    'max_drawdowns': 'max_drawdowns',
+    'max_leverages': 'max_leverages',
+}
+
+_NANOS_PER_MINUTE = 60 * 1000000000
+
+
 class RiskMetricsCumulative(object):
     """
     :Usage:
         Instantiate RiskMetricsCumulative once.
         Call update() method on each dt to update the metrics.
+
+    The returns and metrics as of each dt are held in cont, a structured
+    array with a row per trading day, or per market minute if the returns
+    are minutely, and a float field per entry of CONT_FIELDS and
+    METRIC_NAMES.  Rows are found by position, so that pandas objects are
+    only built when asked for, by cont_index and metrics.
     """
 
     METRIC_NAMES = (
@@ -91,6 +135,9 @@ class RiskMetricsCumulative(object):
         'information',
     )
 
+    CONT_DTYPE = np.dtype([(name, np.float64)
+                           for name in CONT_FIELDS + METRIC_NAMES])
+
     def __init__(self, sim_params,
                  returns_frequency=None,
                  create_first_day_stats=False,
@@ -135,23 +182,11 @@ class RiskMetricsCumulative(object):
 
         self.returns_frequency = returns_frequency
 
-        if returns_frequency == 'daily':
-            cont_index = self.get_daily_index()
-        elif returns_frequency == 'minute':
-            cont_index = self.get_minute_index(sim_params)
+        self._init_rows()
 
-        self.cont_index = cont_index
-        self.cont_len = len(self.cont_index)
-
-        empty_cont = np.full(self.cont_len, np.nan)
-
-        self.algorithm_returns_cont = empty_cont.copy()
-        self.benchmark_returns_cont = empty_cont.copy()
-        self.algorithm_cumulative_leverages_cont = empty_cont.copy()
-        self.mean_returns_cont = empty_cont.copy()
-        self.annualized_mean_returns_cont = empty_cont.copy()
-        self.mean_benchmark_returns_cont = empty_cont.copy()
-        self.annualized_mean_benchmark_returns_cont = empty_cont.copy()
+        self.cont = np.empty(self.cont_len, dtype=self.CONT_DTYPE)
+        for name in self.CONT_DTYPE.names:
+            self.cont[name] = np.nan
 
         # The returns at a given time are read and reset from the respective
         # returns container.
@@ -161,57 +196,120 @@ class RiskMetricsCumulative(object):
         self.annualized_mean_returns = None
         self.mean_benchmark_returns = None
         self.annualized_mean_benchmark_returns = None
-
-        self.algorithm_cumulative_returns = empty_cont.copy()
-        self.benchmark_cumulative_returns = empty_cont.copy()
-        self.algorithm_cumulative_leverages = empty_cont.copy()
-        self.excess_returns = empty_cont.copy()
+        self.algorithm_cumulative_leverages = None
 
         self.latest_dt_loc = 0
-        self.latest_dt = cont_index[0]
+        self.latest_dt = self.trading_days[0]
+        if returns_frequency == 'minute':
+            self.latest_dt = pd.Timestamp(self.session_opens[0], tz='UTC')
+        self.latest_session = 0
 
-        self.metrics = pd.DataFrame(index=cont_index,
-                                    columns=self.METRIC_NAMES,
-                                    dtype=float)
-
-        self.drawdowns = empty_cont.copy()
-        self.max_drawdowns = empty_cont.copy()
         self.max_drawdown = 0
-        self.max_leverages = empty_cont.copy()
         self.max_leverage = 0
         self.current_max = -np.inf
-        self.daily_treasury = pd.Series(index=self.trading_days)
+        # The treasury return as of each trading day, once looked up.
+        self.daily_treasury = np.full(len(self.trading_days), np.nan)
         self.treasury_period_return = np.nan
 
         self.num_trading_days = 0
 
-    def get_minute_index(self, sim_params):
+    def _init_rows(self):
         """
-        Stitches together multiple days worth of business minutes into
-        one continous index.
+        Lay out the rows of cont: one per trading day, or, for minutely
+        returns, one per market minute, the minutes of each day starting at
+        the row session_starts[day].
         """
-        trading_minutes = None
-        for day in self.trading_days:
-            minutes_for_day = trading.environment.market_minutes_for_day(day)
-            if trading_minutes is None:
-                # Create container for all minutes on first iteration
-                trading_minutes = minutes_for_day
-            else:
-                trading_minutes = trading_minutes.union(minutes_for_day)
-        return trading_minutes
+        self._cont_index = None
+        if self.returns_frequency == 'minute':
+            hours = trading.environment.open_and_closes.loc[self.trading_days]
+            opens = _nanos(hours.market_open)
+            closes = _nanos(hours.market_close)
+            minutes = (closes - opens) // _NANOS_PER_MINUTE + 1
+            self.session_opens = opens
+            self.session_starts = np.concatenate([[0], np.cumsum(minutes)])
+            self.cont_len = int(self.session_starts[-1])
+        else:
+            self.cont_len = len(self.trading_days)
+
+    def get_minute_index(self, sim_params=None):
+        """
+        Every business minute of the simulation, as one continuous index.
+        """
+        minutes = np.diff(self.session_starts)
+        offsets = np.arange(self.cont_len) - \
+            np.repeat(self.session_starts[:-1], minutes)
+        return pd.DatetimeIndex(
+            np.repeat(self.session_opens, minutes) +
+            offsets * _NANOS_PER_MINUTE,
+            tz='UTC',
+        )
 
     def get_daily_index(self):
         return self.trading_days
 
+    @property
+    def cont_index(self):
+        """
+        The dt of each row of cont.
+        """
+        if self._cont_index is None:
+            if self.returns_frequency == 'minute':
+                self._cont_index = self.get_minute_index()
+            else:
+                self._cont_index = self.get_daily_index()
+        return self._cont_index
+
+    @property
+    def metrics(self):
+        """
+        The metrics as of each dt, as a DataFrame indexed by cont_index with
+        a column per entry of METRIC_NAMES.
+        """
+        return pd.DataFrame(
+            {name: self.cont[name] for name in self.METRIC_NAMES},
+            index=self.cont_index,
+            columns=self.METRIC_NAMES,
+        )
+
+    @property
+    def algorithm_returns_cont(self):
+        return self.cont['algorithm_returns']
+
+    @property
+    def benchmark_returns_cont(self):
+        return self.cont['benchmark_returns']
+
+    def _locate(self, dt):
+        """
+        The row of cont for dt, and the position of its day in
+        trading_days.
+        """
+        if self.returns_frequency != 'minute':
+            dt_loc = self.trading_days.get_loc(dt)
+            return dt_loc, dt_loc
+
+        value = pd.Timestamp(dt).value
+        session = self.session_opens.searchsorted(value, 'right') - 1
+        if session >= 0:
+            offset = (value - self.session_opens[session]) // \
+                _NANOS_PER_MINUTE
+            dt_loc = self.session_starts[session] + offset
+            if dt_loc < self.session_starts[session + 1]:
+                return int(dt_loc), session
+        raise KeyError(dt)
+
     def update(self, dt, algorithm_returns, benchmark_returns, account):
         # Keep track of latest dt for use in to_dict and other methods
         # that report current state.
         self.latest_dt = dt
-        dt_loc = self.cont_index.get_loc(dt)
+        dt_loc, session = self._locate(dt)
         self.latest_dt_loc = dt_loc
+        self.latest_session = session
+        cont = self.cont
 
-        self.algorithm_returns_cont[dt_loc] = algorithm_returns
-        self.algorithm_returns = self.algorithm_returns_cont[:dt_loc + 1]
+        algorithm_returns_cont = cont['algorithm_returns']
+        algorithm_returns_cont[dt_loc] = algorithm_returns
+        self.algorithm_returns = algorithm_returns_cont[:dt_loc + 1]
 
         self.num_trading_days = len(self.algorithm_returns)
 
@@ -219,22 +317,22 @@ class RiskMetricsCumulative(object):
             if len(self.algorithm_returns) == 1:
                 self.algorithm_returns = np.append(0.0, self.algorithm_returns)
 
-        self.algorithm_cumulative_returns[dt_loc] = \
+        algorithm_cumulative_returns = cont['algorithm_cumulative_returns']
+        algorithm_cumulative_returns[dt_loc] = \
             self.calculate_cumulative_returns(self.algorithm_returns)
 
-        algo_cumulative_returns_to_date = \
-            self.algorithm_cumulative_returns[:dt_loc + 1]
+        mean_returns_cont = cont['mean_returns']
+        mean_returns_cont[dt_loc] = \
+            algorithm_cumulative_returns[dt_loc] / self.num_trading_days
 
-        self.mean_returns_cont[dt_loc] = \
-            algo_cumulative_returns_to_date[dt_loc] / self.num_trading_days
+        self.mean_returns = mean_returns_cont[:dt_loc + 1]
 
-        self.mean_returns = self.mean_returns_cont[:dt_loc + 1]
-
-        self.annualized_mean_returns_cont[dt_loc] = \
-            self.mean_returns_cont[dt_loc] * 252
+        annualized_mean_returns_cont = cont['annualized_mean_returns']
+        annualized_mean_returns_cont[dt_loc] = \
+            mean_returns_cont[dt_loc] * 252
 
         self.annualized_mean_returns = \
-            self.annualized_mean_returns_cont[:dt_loc + 1]
+            annualized_mean_returns_cont[:dt_loc + 1]
 
         if self.create_first_day_stats:
             if len(self.mean_returns) == 1:
@@ -242,34 +340,35 @@ class RiskMetricsCumulative(object):
                 self.annualized_mean_returns = np.append(
                     0.0, self.annualized_mean_returns)
 
-        self.benchmark_returns_cont[dt_loc] = benchmark_returns
-        self.benchmark_returns = self.benchmark_returns_cont[:dt_loc + 1]
+        benchmark_returns_cont = cont['benchmark_returns']
+        benchmark_returns_cont[dt_loc] = benchmark_returns
+        self.benchmark_returns = benchmark_returns_cont[:dt_loc + 1]
 
         if self.create_first_day_stats:
             if len(self.benchmark_returns) == 1:
                 self.benchmark_returns = np.append(0.0, self.benchmark_returns)
 
-        self.benchmark_cumulative_returns[dt_loc] = \
+        benchmark_cumulative_returns = cont['benchmark_cumulative_returns']
+        benchmark_cumulative_returns[dt_loc] = \
             self.calculate_cumulative_returns(self.benchmark_returns)
 
-        benchmark_cumulative_returns_to_date = \
-            self.benchmark_cumulative_returns[:dt_loc + 1]
-
-        self.mean_benchmark_returns_cont[dt_loc] = \
-            benchmark_cumulative_returns_to_date[dt_loc] / \
-            self.num_trading_days
+        mean_benchmark_returns_cont = cont['mean_benchmark_returns']
+        mean_benchmark_returns_cont[dt_loc] = \
+            benchmark_cumulative_returns[dt_loc] / self.num_trading_days
 
-        self.mean_benchmark_returns = self.mean_benchmark_returns_cont[:dt_loc]
+        self.mean_benchmark_returns = mean_benchmark_returns_cont[:dt_loc]
 
-        self.annualized_mean_benchmark_returns_cont[dt_loc] = \
-            self.mean_benchmark_returns_cont[dt_loc] * 252
+        annualized_mean_benchmark_returns_cont = \
+            cont['annualized_mean_benchmark_returns']
+        annualized_mean_benchmark_returns_cont[dt_loc] = \
+            mean_benchmark_returns_cont[dt_loc] * 252
 
         self.annualized_mean_benchmark_returns = \
-            self.annualized_mean_benchmark_returns_cont[:dt_loc + 1]
+            annualized_mean_benchmark_returns_cont[:dt_loc + 1]
 
-        self.algorithm_cumulative_leverages_cont[dt_loc] = account['leverage']
-        self.algorithm_cumulative_leverages = \
-            self.algorithm_cumulative_leverages_cont[:dt_loc + 1]
+        leverages_cont = cont['algorithm_cumulative_leverages']
+        leverages_cont[dt_loc] = account['leverage']
+        self.algorithm_cumulative_leverages = leverages_cont[:dt_loc + 1]
 
         if self.create_first_day_stats:
             if len(self.algorithm_cumulative_leverages) == 1:
@@ -290,39 +389,36 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
             raise Exception(message)
 
         self.update_current_max()
-        metrics = self.metrics
-        metrics.benchmark_volatility.iloc[dt_loc] = \
+        cont['benchmark_volatility'][dt_loc] = \
             self.calculate_volatility(self.benchmark_returns)
-        metrics.algorithm_volatility.iloc[dt_loc] = \
+        cont['algorithm_volatility'][dt_loc] = \
             self.calculate_volatility(self.algorithm_returns)
 
         # caching the treasury rates for the minutely case is a
         # big speedup, because it avoids searching the treasury
         # curves on every minute.
         # In both minutely and daily, the daily curve is always used.
-        treasury_end = dt.replace(hour=0, minute=0)
-        if np.isnan(self.daily_treasury[treasury_end]):
-            treasury_period_return = choose_treasury(
+        if np.isnan(self.daily_treasury[session]):
+            treasury_end = dt.replace(hour=0, minute=0)
+            self.daily_treasury[session] = choose_treasury(
                 self.treasury_curves,
                 self.start_date,
                 treasury_end
             )
-            self.daily_treasury[treasury_end] = treasury_period_return
-        self.treasury_period_return = self.daily_treasury[treasury_end]
-        self.excess_returns[dt_loc] = (
-            self.algorithm_cumulative_returns[dt_loc] -
+        self.treasury_period_return = self.daily_treasury[session]
+        cont['excess_returns'][dt_loc] = (
+            algorithm_cumulative_returns[dt_loc] -
             self.treasury_period_return)
-        metrics.beta.iloc[dt_loc] = self.calculate_beta()
-        metrics.alpha.iloc[dt_loc] = self.calculate_alpha()
-        metrics.sharpe.iloc[dt_loc] = self.calculate_sharpe()
-        metrics.downside_risk.iloc[dt_loc] = \
-            self.calculate_downside_risk()
-        metrics.sortino.iloc[dt_loc] = self.calculate_sortino()
-        metrics.information.iloc[dt_loc] = self.calculate_information()
+        cont['beta'][dt_loc] = self.calculate_beta()
+        cont['alpha'][dt_loc] = self.calculate_alpha()
+        cont['sharpe'][dt_loc] = self.calculate_sharpe()
+        cont['downside_risk'][dt_loc] = self.calculate_downside_risk()
+        cont['sortino'][dt_loc] = self.calculate_sortino()
+        cont['information'][dt_loc] = self.calculate_information()
         self.max_drawdown = self.calculate_max_drawdown()
-        self.max_drawdowns[dt_loc] = self.max_drawdown
+        cont['max_drawdowns'][dt_loc] = self.max_drawdown
         self.max_leverage = self.calculate_max_leverage()
-        self.max_leverages[dt_loc] = self.max_leverage
+        cont['max_leverages'][dt_loc] = self.max_leverage
 
     def to_dict(self):
         """
@@ -330,30 +426,25 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
         Returns a dict object of the form:
         """
         dt = self.latest_dt
-        dt_loc = self.latest_dt_loc
         period_label = dt.strftime("%Y-%m")
-        metrics = self.metrics
+        row = self.cont[self.latest_dt_loc]
         rval = {
             'trading_days': self.num_trading_days,
-            'benchmark_volatility':
-            metrics.benchmark_volatility.iloc[dt_loc],
-            'algo_volatility':
-            metrics.algorithm_volatility.iloc[dt_loc],
+            'benchmark_volatility': row['benchmark_volatility'],
+            'algo_volatility': row['algorithm_volatility'],
             'treasury_period_return': self.treasury_period_return,
             # Though the two following keys say period return,
             # they would be more accurately called the cumulative return.
             # However, the keys need to stay the same, for now, for backwards
             # compatibility with existing consumers.
-            'algorithm_period_return':
-            self.algorithm_cumulative_returns[dt_loc],
-            'benchmark_period_return':
-            self.benchmark_cumulative_returns[dt_loc],
-            'beta': metrics.beta.iloc[dt_loc],
-            'alpha': metrics.alpha.iloc[dt_loc],
-            'sharpe': metrics.sharpe.iloc[dt_loc],
-            'sortino': metrics.sortino.iloc[dt_loc],
-            'information': metrics.information.iloc[dt_loc],
-            'excess_return': self.excess_returns[dt_loc],
+            'algorithm_period_return': row['algorithm_cumulative_returns'],
+            'benchmark_period_return': row['benchmark_cumulative_returns'],
+            'beta': row['beta'],
+            'alpha': row['alpha'],
+            'sharpe': row['sharpe'],
+            'sortino': row['sortino'],
+            'information': row['information'],
+            'excess_return': row['excess_returns'],
             'max_drawdown': self.max_drawdown,
             'max_leverage': self.max_leverage,
             'period_label': period_label
@@ -365,29 +456,35 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
     def __repr__(self):
         statements = []
         for metric in self.METRIC_NAMES:
-            value = getattr(self.metrics, metric)[-1]
-            if isinstance(value, list):
-                if len(value) == 0:
-                    value = np.nan
-                else:
-                    value = value[-1]
+            value = self.cont[metric][-1]
             statements.append("{m}:{v}".format(m=metric, v=value))
 
         return '\n'.join(statements)
 
+    @property
+    def nbytes(self):
+        """
+        The number of bytes held by the containers of returns and metrics,
+        which are allocated for the whole simulation up front.
+        """
+        nbytes = self.cont.nbytes + self.daily_treasury.nbytes
+        if self._cont_index is not None:
+            nbytes += self._cont_index.nbytes
+        return nbytes
+
     def calculate_cumulative_returns(self, returns):
         return (1. + returns).prod() - 1
 
     def update_current_max(self):
-        if len(self.algorithm_cumulative_returns) == 0:
+        if self.cont_len == 0:
             return
         current_cumulative_return = \
-            self.algorithm_cumulative_returns[self.latest_dt_loc]
+            self.cont['algorithm_cumulative_returns'][self.latest_dt_loc]
         if self.current_max < current_cumulative_return:
             self.current_max = current_cumulative_return
 
     def calculate_max_drawdown(self):
-        if len(self.algorithm_cumulative_returns) == 0:
+        if self.cont_len == 0:
             return self.max_drawdown
 
         # The drawdown is defined as: (high - low) / high
@@ -398,11 +495,12 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
         # exceed the previous max_drawdown iff the current return is lower than
         # the previous low in the current drawdown window.
         cur_drawdown = 1.0 - (
-            (1.0 + self.algorithm_cumulative_returns[self.latest_dt_loc])
+            (1.0 +
+             self.cont['algorithm_cumulative_returns'][self.latest_dt_loc])
             /
             (1.0 + self.current_max))
 
-        self.drawdowns[self.latest_dt_loc] = cur_drawdown
+        self.cont['drawdowns'][self.latest_dt_loc] = cur_drawdown
 
         if self.max_drawdown < cur_drawdown:
             return cur_drawdown
@@ -413,7 +511,7 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
         # The leverage is defined as: the gross_exposure/net_liquidation
         # gross_exposure = long_exposure + abs(short_exposure)
         # net_liquidation = ending_cash + long_exposure + short_exposure
-        cur_leverage = self.algorithm_cumulative_leverages_cont[
+        cur_leverage = self.cont['algorithm_cumulative_leverages'][
             self.latest_dt_loc]
 
         return max(cur_leverage, self.max_leverage)
@@ -422,38 +520,42 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
         """
         http://en.wikipedia.org/wiki/Sharpe_ratio
         """
+        row = self.cont[self.latest_dt_loc]
         return sharpe_ratio(
-            self.metrics.algorithm_volatility[self.latest_dt_loc],
-            self.annualized_mean_returns_cont[self.latest_dt_loc],
-            self.daily_treasury[self.latest_dt.date()])
+            row['algorithm_volatility'],
+            row['annualized_mean_returns'],
+            self.daily_treasury[self.latest_session])
 
     def calculate_sortino(self):
         """
         http://en.wikipedia.org/wiki/Sortino_ratio
         """
+        row = self.cont[self.latest_dt_loc]
         return sortino_ratio(
-            self.annualized_mean_returns_cont[self.latest_dt_loc],
-            self.daily_treasury[self.latest_dt.date()],
-            self.metrics.downside_risk[self.latest_dt_loc])
+            row['annualized_mean_returns'],
+            self.daily_treasury[self.latest_session],
+            row['downside_risk'])
 
     def calculate_information(self):
         """
         http://en.wikipedia.org/wiki/Information_ratio
         """
+        row = self.cont[self.latest_dt_loc]
         return information_ratio(
-            self.metrics.algorithm_volatility[self.latest_dt_loc],
-            self.annualized_mean_returns_cont[self.latest_dt_loc],
-            self.annualized_mean_benchmark_returns_cont[self.latest_dt_loc])
+            row['algorithm_volatility'],
+            row['annualized_mean_returns'],
+            row['annualized_mean_benchmark_returns'])
 
     def calculate_alpha(self):
         """
         http://en.wikipedia.org/wiki/Alpha_(investment)
         """
+        row = self.cont[self.latest_dt_loc]
         return alpha(
-            self.annualized_mean_returns_cont[self.latest_dt_loc],
+            row['annualized_mean_returns'],
             self.treasury_period_return,
-            self.annualized_mean_benchmark_returns_cont[self.latest_dt_loc],
-            self.metrics.beta.iloc[self.latest_dt_loc])
+            row['annualized_mean_benchmark_returns'],
+            row['beta'])
 
     def calculate_volatility(self, daily_returns):
         if len(daily_returns) <= 1:
@@ -493,7 +595,7 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
             {k: v for k, v in iteritems(self.__dict__) if
                 (not k.startswith('_') and not k == 'treasury_curves')}
 
-        STATE_VERSION = 2
+        STATE_VERSION = 3
         state_dict[VERSION_LABEL] = STATE_VERSION
 
         return state_dict
@@ -508,7 +610,36 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
                     saved state is too old.")
 
         self.__dict__.update(state)
+        self._cont_index = None
+
+        if version < 3:
+            self._upgrade_v2_state()
 
         # This are big and we don't need to serialize them
         # pop them back in now
         self.treasury_curves = trading.environment.treasury_curves
+
+    def _upgrade_v2_state(self):
+        """
+        Move the arrays and metrics frame of a version 2 state into cont.
+        """
+        state = self.__dict__
+        del state['cont_index']
+        metrics = state.pop('metrics')
+        self._init_rows()
+        cont = np.empty(self.cont_len, dtype=self.CONT_DTYPE)
+        for field, name in iteritems(_V2_CONT_ARRAYS):
+            cont[field] = state.pop(name)
+        for name in self.METRIC_NAMES:
+            cont[name] = metrics[name].values
+        self.cont = cont
+
+        self.daily_treasury = self.daily_treasury.values
+        self.latest_session = self.trading_days.searchsorted(
+            normalize_date(self.latest_dt)
+        )
+
+
+def _nanos(values):
+    return pd.DatetimeIndex(values).values.astype('datetime64[ns]')\
+        .view(np.int64)
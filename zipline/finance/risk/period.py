@@ -46,22 +46,45 @@ choose_treasury = functools.partial(risk.choose_treasury,
                                     risk.select_treasury_duration)
 
 
+def max_drawdown(returns):
+    """
+    The largest relative peak to trough move of the compounded returns.
+    """
+    compounded_returns = []
+    cur_return = 0.0
+    for r in returns:
+        try:
+            cur_return += math.log(1.0 + r)
+        # this is a guard for a single day returning -100%, if returns are
+        # greater than -1.0 it will throw an error because you cannot take
+        # the log of a negative number
+        except ValueError:
+            log.debug("{cur} return, zeroing the returns".format(
+                cur=cur_return))
+            cur_return = 0.0
+        compounded_returns.append(cur_return)
+
+    cur_max = None
+    worst_drawdown = None
+    for cur in compounded_returns:
+        if cur_max is None or cur > cur_max:
+            cur_max = cur
+
+        drawdown = (cur - cur_max)
+        if worst_drawdown is None or drawdown < worst_drawdown:
+            worst_drawdown = drawdown
+
+    if worst_drawdown is None:
+        return 0.0
+
+    return 1.0 - math.exp(worst_drawdown)
+
+
 class RiskMetricsPeriod(object):
     def __init__(self, start_date, end_date, returns,
                  benchmark_returns=None,
                  algorithm_leverages=None):
 
-        treasury_curves = trading.environment.treasury_curves
-        if treasury_curves.index[-1] >= start_date:
-            mask = ((treasury_curves.index >= start_date) &
-                    (treasury_curves.index <= end_date))
-
-            self.treasury_curves = treasury_curves[mask]
-        else:
-            # our test is beyond the treasury curve history
-            # so we'll use the last available treasury curve
-            self.treasury_curves = treasury_curves[-1:]
-
         self.start_date = start_date
         self.end_date = end_date
 
@@ -76,6 +99,17 @@ class RiskMetricsPeriod(object):
 
         self.calculate_metrics()
 
+    @classmethod
+    def from_metrics(cls, **attributes):
+        """
+        Build a RiskMetricsPeriod from already computed metrics, without
+        calling calculate_metrics.  attributes must hold everything that
+        __init__ and calculate_metrics would set.
+        """
+        period = cls.__new__(cls)
+        period.__dict__.update(attributes)
+        return period
+
     def calculate_metrics(self):
 
         self.benchmark_period_returns = \
@@ -100,21 +134,20 @@ class RiskMetricsPeriod(object):
         self.num_trading_days = len(self.benchmark_returns)
         self.trading_day_counts = pd.stats.moments.rolling_count(
             self.algorithm_returns, self.num_trading_days)
-        self.mean_algorithm_returns = pd.Series(
-            index=self.algorithm_returns.index)
-        for dt, ret in self.algorithm_returns.iteritems():
-            self.mean_algorithm_returns[dt] = (
-                self.algorithm_returns[:dt].sum() /
-                self.trading_day_counts[dt])
+        self.mean_algorithm_returns = (
+            self.algorithm_returns.fillna(0).cumsum() /
+            self.trading_day_counts
+        )
 
         self.benchmark_volatility = self.calculate_volatility(
             self.benchmark_returns)
         self.algorithm_volatility = self.calculate_volatility(
             self.algorithm_returns)
         self.treasury_period_return = choose_treasury(
-            self.treasury_curves,
+            trading.environment.treasury_curves,
             self.start_date,
-            self.end_date
+            self.end_date,
+            in_period=True,
         )
         self.sharpe = self.calculate_sharpe()
         # The consumer currently expects a 0.0 value for sharpe in period,
@@ -285,34 +318,7 @@ class RiskMetricsPeriod(object):
                      self.beta)
 
     def calculate_max_drawdown(self):
-        compounded_returns = []
-        cur_return = 0.0
-        for r in self.algorithm_returns:
-            try:
-                cur_return += math.log(1.0 + r)
-            # this is a guard for a single day returning -100%, if returns are
-            # greater than -1.0 it will throw an error because you cannot take
-            # the log of a negative number
-            except ValueError:
-                log.debug("{cur} return, zeroing the returns".format(
-                    cur=cur_return))
-                cur_return = 0.0
-            compounded_returns.append(cur_return)
-
-        cur_max = None
-        max_drawdown = None
-        for cur in compounded_returns:
-            if cur_max is None or cur > cur_max:
-                cur_max = cur
-
-            drawdown = (cur - cur_max)
-            if max_drawdown is None or drawdown < max_drawdown:
-                max_drawdown = drawdown
-
-        if max_drawdown is None:
-            return 0.0
-
-        return 1.0 - math.exp(max_drawdown)
+        return max_drawdown(self.algorithm_returns)
 
     def calculate_max_leverage(self):
         if self.algorithm_leverages is None:
@@ -323,7 +329,7 @@ class RiskMetricsPeriod(object):
     def __getstate__(self):
         state_dict = \
             {k: v for k, v in iteritems(self.__dict__) if
-             (not k.startswith('_') and not k == 'treasury_curves')}
+             not k.startswith('_')}
 
         STATE_VERSION = 2
         state_dict[VERSION_LABEL] = STATE_VERSION
@@ -340,5 +346,3 @@ class RiskMetricsPeriod(object):
                     is too old.")
 
         self.__dict__.update(state)
-
-        self.treasury_curves = trading.environment.treasury_curves
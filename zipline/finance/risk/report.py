@@ -62,7 +62,7 @@ import datetime
 from dateutil.relativedelta import relativedelta
 from six import iteritems
 
-from . period import RiskMetricsPeriod
+from . rolling import RollingRiskMetrics
 
 from zipline.utils.serialization_utils import (
     VERSION_LABEL
@@ -87,6 +87,10 @@ class RiskReport(object):
         self.benchmark_returns = benchmark_returns
         self.algorithm_leverages = algorithm_leverages
 
+        # The RollingRiskMetrics of the returns, built by the first call to
+        # periods_in_range.
+        self._rolling = None
+
         if len(self.algorithm_returns) == 0:
             start_date = self.sim_params.period_start
             end_date = self.sim_params.period_end
@@ -124,6 +128,7 @@ class RiskReport(object):
 
     def periods_in_range(self, months_per, start, end):
         one_day = datetime.timedelta(days=1)
+        starts = []
         ends = []
         cur_start = start.replace(day=1)
 
@@ -139,18 +144,19 @@ class RiskReport(object):
             cur_end = cur_start + relativedelta(months=months_per) - one_day
             if(cur_end > the_end):
                 break
-            cur_period_metrics = RiskMetricsPeriod(
-                start_date=cur_start,
-                end_date=cur_end,
-                returns=self.algorithm_returns,
+            starts.append(cur_start)
+            ends.append(cur_end)
+            cur_start = cur_start + relativedelta(months=1)
+
+        # The metrics of all windows of all lengths are computed together
+        # from the same aligned returns.
+        if self._rolling is None:
+            self._rolling = RollingRiskMetrics(
+                self.algorithm_returns,
                 benchmark_returns=self.benchmark_returns,
                 algorithm_leverages=self.algorithm_leverages,
             )
-
-            ends.append(cur_period_metrics)
-            cur_start = cur_start + relativedelta(months=1)
-
-        return ends
+        return self._rolling.periods(starts, ends)
 
     def __getstate__(self):
         state_dict = \
@@ -174,3 +180,4 @@ class RiskReport(object):
             raise BaseException("RiskReport saved state is too old.")
 
         self.__dict__.update(state)
+        self._rolling = None
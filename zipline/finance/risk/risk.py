@@ -61,6 +61,7 @@ Risk Report
 import logbook
 import math
 import numpy as np
+import pandas as pd
 
 from zipline.finance import trading
 import zipline.utils.math_utils as zp_math
@@ -237,54 +238,203 @@ def select_treasury_duration(start_date, end_date):
     return treasury_duration
 
 
+class TreasuryCurveTable(object):
+    """
+    Treasury rates for every duration, forward filled onto every trading day
+    and every day with an observed curve.
+
+    For each row and duration, the table holds the latest rate observed on
+    or before that row's date, falling back on longer durations when a
+    duration is missing from a curve (1month data begins in 8/2001, for
+    example), along with the date of that observation and the number of
+    trading days since it.  Finding the rate for a date is then a single
+    searchsorted and an array lookup.
+
+    Parameters
+    ----------
+    treasury_curves : pd.DataFrame
+        Treasury curves indexed by date, with a column per duration.
+    trading_days : pd.DatetimeIndex
+        The trading calendar used to measure how stale a rate is.
+    """
+
+    def __init__(self, treasury_curves, trading_days):
+        self.treasury_curves = treasury_curves
+        self.durations = {d: i for i, d in enumerate(TREASURY_DURATIONS)}
+
+        curve_dates = _nanos(treasury_curves.index)
+        trading_dates = _nanos(trading_days)
+        dates = np.union1d(curve_dates, trading_dates)
+        self.curve_dates = curve_dates
+        self.dates = dates
+
+        observed = np.full((len(dates), len(TREASURY_DURATIONS)), np.nan)
+        curve_rows = dates.searchsorted(curve_dates)
+        for i, duration in enumerate(TREASURY_DURATIONS):
+            if duration in treasury_curves:
+                observed[curve_rows, i] = np.asarray(
+                    treasury_curves[duration], dtype=object,
+                ).astype(np.float64)
+
+        # Missing durations fall back on the next longer one, so fill from
+        # the longest duration down.
+        for i in range(len(TREASURY_DURATIONS) - 2, -1, -1):
+            missing = np.isnan(observed[:, i])
+            observed[missing, i] = observed[missing, i + 1]
+
+        # Row of the latest observation on or before each row, or -1.
+        rows = np.arange(len(dates))[:, np.newaxis]
+        source = np.where(np.isnan(observed), -1, rows)
+        self.source = np.maximum.accumulate(source, axis=0)
+        self.rates = np.where(
+            self.source >= 0,
+            observed[np.maximum(self.source, 0),
+                     np.arange(len(TREASURY_DURATIONS))],
+            np.nan,
+        )
+
+        # Position of each row in the trading calendar, as bisect_left.
+        self.num_trading_days = len(trading_dates)
+        self.trading_positions = trading_dates.searchsorted(dates)
+        self.is_trading_day = (
+            (self.trading_positions < len(trading_dates)) &
+            (trading_dates.take(self.trading_positions, mode='clip') == dates)
+        )
+        self.days_since = np.where(
+            self.source >= 0,
+            self.trading_positions[:, np.newaxis] -
+            self.trading_positions[np.maximum(self.source, 0)],
+            -1,
+        )
+
+    def find(self, treasury_duration, end_date, first_date=None):
+        """
+        Find the latest rate for treasury_duration observed on or before
+        end_date, and no earlier than first_date if given.
+
+        Returns
+        -------
+        (rate, observed_date, days_since, exact) or None
+            days_since is the number of trading days between observed_date
+            and end_date, or None if either is past the trading calendar.
+            exact is whether the rate was observed on end_date itself.
+        """
+        end = pd.Timestamp(end_date).value
+        row = self.dates.searchsorted(end, side='right') - 1
+        if row < 0:
+            return None
+
+        col = self.durations[treasury_duration]
+        source = self.source[row, col]
+        if source < 0:
+            return None
+        observed = self.dates[source]
+        if first_date is not None and \
+                observed < pd.Timestamp(first_date).value:
+            return None
+
+        exact = source == row and self.dates[row] == end
+
+        # Trading days between the observation and end_date, as measured by
+        # TradingEnvironment.trading_day_distance.  Rows include every
+        # trading day, so end_date is at most one trading day past its row.
+        days_since = self.days_since[row, col]
+        end_position = self.trading_positions[row]
+        if end > self.dates[row] and self.is_trading_day[row]:
+            days_since += 1
+            end_position += 1
+        if end_position == self.num_trading_days or \
+                self.trading_positions[source] == self.num_trading_days:
+            days_since = None
+
+        return (self.rates[row, col],
+                pd.Timestamp(observed, tz='UTC'),
+                days_since,
+                exact)
+
+    def observed_range(self, first_date=None, last_date=None):
+        """
+        The first and last dates of the curves observed between first_date
+        and last_date, or None if there are none.
+        """
+        lo = 0
+        hi = len(self.curve_dates)
+        if first_date is not None:
+            lo = self.curve_dates.searchsorted(
+                pd.Timestamp(first_date).value)
+        if last_date is not None:
+            hi = self.curve_dates.searchsorted(
+                pd.Timestamp(last_date).value, side='right')
+        if lo >= hi:
+            return None
+        return self.curve_dates[lo], self.curve_dates[hi - 1]
+
+
+def _nanos(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.values.astype('M8[ns]').astype(np.int64)
+
+
+def treasury_curve_table(treasury_curves):
+    """
+    Return a TreasuryCurveTable for treasury_curves, reusing the trading
+    environment's table when they are the environment's curves.
+    """
+    env = trading.environment
+    if treasury_curves is env.treasury_curves:
+        return env.treasury_curve_table
+    return TreasuryCurveTable(treasury_curves, env.trading_days)
+
+
 def choose_treasury(select_treasury, treasury_curves, start_date, end_date,
-                    compound=True):
+                    compound=True, in_period=False):
     """
     Find the latest known interest rate for a given duration within a date
     range.
 
     If we find one but it's more than a trading day ago from the date we're
     looking for, then we log a warning
+
+    If in_period is True, only curves observed between start_date and
+    end_date are used, as long as there are curves on or after start_date.
+    Otherwise the latest available curve is used.
     """
     treasury_duration = select_treasury(start_date, end_date)
     end_day = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    search_day = None
 
-    if end_day in treasury_curves.index:
-        rate = get_treasury_rate(treasury_curves,
-                                 treasury_duration,
-                                 end_day)
-        if rate is not None:
-            search_day = end_day
+    table = treasury_curve_table(treasury_curves)
+    first_date = None
+    if in_period and table.observed_range(first_date=start_date):
+        first_date = start_date
+
+    found = table.find(treasury_duration, end_day, first_date=first_date)
+    if found is not None:
+        rate, search_day, search_dist, exact = found
+        if in_period:
+            search_range = table.observed_range(first_date, end_date)
+            if search_range is None:
+                # our test is beyond the treasury curve history
+                # so we'll use the last available treasury curve
+                last = table.curve_dates[-1]
+                search_range = (last, last)
+        else:
+            search_range = table.observed_range()
 
-    if not search_day:
         # in case end date is not a trading day or there is no treasury
-        # data, search for the previous day with an interest rate.
-        search_days = treasury_curves.index
-
-        # Find rightmost value less than or equal to end_day
-        i = search_days.searchsorted(end_day)
-        for prev_day in search_days[i - 1::-1]:
-            rate = get_treasury_rate(treasury_curves,
-                                     treasury_duration,
-                                     prev_day)
-            if rate is not None:
-                search_day = prev_day
-                search_dist = search_day_distance(end_date, prev_day)
-                break
-
-        if search_day:
-            if (search_dist is None or search_dist > 1) and \
-                    search_days[0] <= end_day <= search_days[-1]:
-                message = "No rate within 1 trading day of end date = \
+        # data, we used the previous day with an interest rate.
+        if not exact and (search_dist is None or search_dist > 1) and \
+                search_range[0] <= pd.Timestamp(end_day).value <= \
+                search_range[1]:
+            message = "No rate within 1 trading day of end date = \
 {dt} and term = {term}. Using {search_day}. Check that date doesn't exceed \
 treasury history range."
-                message = message.format(dt=end_date,
-                                         term=treasury_duration,
-                                         search_day=search_day)
-                log.warn(message)
+            message = message.format(dt=end_date,
+                                     term=treasury_duration,
+                                     search_day=search_day)
+            log.warn(message)
 
-    if search_day:
         td = end_date - start_date
         if compound:
             return rate * (td.days + 1) / 365
@@ -0,0 +1,477 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Risk metrics for many periods of one return series, computed together.
+
+RiskReport needs the metrics of every 1, 3, 6 and 12 month window of a
+backtest.  Rather than masking the return series and recomputing each
+metric from scratch for every window, RollingRiskMetrics aligns the
+algorithm and benchmark returns once, builds cumulative sums of their
+moments, and computes each metric for all windows at once from differences
+of those sums.  The results are the same RiskMetricsPeriod objects that
+computing each window on its own would produce.
+"""
+import numpy as np
+import pandas as pd
+
+from zipline.finance import trading
+import zipline.utils.math_utils as zp_math
+
+from . period import RiskMetricsPeriod, choose_treasury, max_drawdown
+from . risk import (
+    alpha,
+    sharpe_ratio,
+    sortino_ratio,
+)
+
+
+def _as_series(daily_returns):
+    if isinstance(daily_returns, list):
+        return pd.Series([x.returns for x in daily_returns],
+                         index=[x.date for x in daily_returns])
+    return daily_returns
+
+
+def _on_trading_days(returns):
+    trade_days = trading.environment.trading_days
+    return returns[returns.index.normalize().isin(trade_days)]
+
+
+def _cumulative(values):
+    """
+    Cumulative sums of values with a leading zero, so that the sum of
+    values[s:e] is result[e] - result[s].
+    """
+    result = np.empty(len(values) + 1)
+    result[0] = 0.0
+    np.cumsum(values, out=result[1:])
+    return result
+
+
+def _window_products(values, starts, ends):
+    """
+    The product of values[s:e] for each pair of starts and ends.
+    """
+    result = np.ones(len(starts))
+    nonempty = ends > starts
+    if nonempty.any():
+        # reduceat over interleaved starts and ends reduces each window at
+        # the even positions, even when the windows overlap.
+        bounds = np.column_stack([starts[nonempty], ends[nonempty]]).ravel()
+        padded = np.append(values, 1.0)
+        result[nonempty] = np.multiply.reduceat(padded, bounds)[::2]
+    return result
+
+
+class _Moments(object):
+    """
+    Cumulative count, sum and sum of squares of the non-NaN entries of an
+    array.  Values are centered on their mean before summing, which does not
+    change the variance of any window but keeps the sums small.
+    """
+
+    def __init__(self, values):
+        valid = ~np.isnan(values)
+        center = values[valid].mean() if valid.any() else 0.0
+        centered = np.where(valid, values - center, 0.0)
+
+        self.center = center
+        self.centered = centered
+        self.count = _cumulative(valid)
+        self.sum = _cumulative(centered)
+        self.sum_sq = _cumulative(centered * centered)
+
+    def window(self, starts, ends):
+        return (self.count[ends] - self.count[starts],
+                self.sum[ends] - self.sum[starts],
+                self.sum_sq[ends] - self.sum_sq[starts])
+
+    def mean(self, starts, ends):
+        count, total, _ = self.window(starts, ends)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return total / count + self.center
+
+    def std(self, starts, ends):
+        """
+        Sample standard deviation of each window, skipping NaNs.
+        """
+        count, total, sum_sq = self.window(starts, ends)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = (sum_sq - total * total / count) / (count - 1)
+        var[count < 2] = np.nan
+        return np.sqrt(np.maximum(var, 0.0))
+
+
+class RollingRiskMetrics(object):
+    """
+    Computes RiskMetricsPeriods for arbitrary windows of one algorithm return
+    series.
+
+    Parameters
+    ----------
+    algorithm_returns : pd.Series or list
+        Daily algorithm returns, sorted by date.
+    benchmark_returns : pd.Series or list, optional
+        Daily benchmark returns.  Defaults to the trading environment's
+        benchmark returns over the span of algorithm_returns.
+    algorithm_leverages : list, optional
+        Daily gross leverages of the algorithm.
+    """
+
+    def __init__(self, algorithm_returns, benchmark_returns=None,
+                 algorithm_leverages=None):
+        algorithm_returns = _as_series(algorithm_returns)
+        if benchmark_returns is None:
+            br = trading.environment.benchmark_returns
+            benchmark_returns = br[(br.index >= algorithm_returns.index[0]) &
+                                   (br.index <= algorithm_returns.index[-1])]
+
+        self.raw_algorithm_returns = algorithm_returns
+        self.raw_benchmark_returns = benchmark_returns
+        self.algorithm_returns = _on_trading_days(algorithm_returns)
+        self.benchmark_returns = _on_trading_days(
+            _as_series(benchmark_returns)
+        )
+        self.algorithm_leverages = algorithm_leverages
+        self.treasury_curves = trading.environment.treasury_curves
+
+        self.aligned = self.algorithm_returns.index.equals(
+            self.benchmark_returns.index
+        )
+        if self.aligned:
+            self._precompute()
+
+    def _precompute(self):
+        algo = self.algorithm_returns.values.astype(np.float64)
+        bench = self.benchmark_returns.values.astype(np.float64)
+
+        self.algo = algo
+        self.algo_moments = _Moments(algo)
+        self.bench_moments = _Moments(bench)
+        self.relative_moments = _Moments(algo - bench)
+
+        # Covariance only uses windows without NaNs, like np.cov.
+        either_nan = np.isnan(algo) | np.isnan(bench)
+        self.nan_count = _cumulative(either_nan)
+        self.cross = _cumulative(
+            self.algo_moments.centered * self.bench_moments.centered
+        )
+
+        # Growth factors for period returns; pandas' prod skips NaNs.
+        self.algo_growth = 1.0 + np.where(np.isnan(algo), 0.0, algo)
+        self.bench_growth = 1.0 + np.where(np.isnan(bench), 0.0, bench)
+
+        # Running sums for the expanding mean of each window used by the
+        # downside risk.
+        self.algo_filled_sum = _cumulative(np.where(np.isnan(algo), 0.0,
+                                                    algo))
+
+        # Log growth for drawdowns.  Windows containing a loss of 100% or
+        # more take the slow path in max_drawdown.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_growth = np.log(1.0 + algo)
+        self.total_loss_count = _cumulative(~(1.0 + algo > 0.0) &
+                                            ~np.isnan(algo))
+        self.log_growth = np.where(np.isfinite(log_growth), log_growth, 0.0)
+
+    def _bounds(self, start_dates, end_dates):
+        index = self.algorithm_returns.index
+        starts = index.searchsorted(pd.DatetimeIndex(start_dates))
+        ends = index.searchsorted(pd.DatetimeIndex(end_dates), side='right')
+        return (np.asarray(starts, dtype=np.int64),
+                np.maximum(np.asarray(ends, dtype=np.int64), starts))
+
+    def periods(self, start_dates, end_dates):
+        """
+        Return a RiskMetricsPeriod for each pair of start_dates and
+        end_dates.
+        """
+        if not len(start_dates):
+            return []
+
+        if not self.aligned:
+            # Let each period compare its own slice of the returns, raising
+            # on the first mismatch like RiskMetricsPeriod does.
+            return [
+                RiskMetricsPeriod(
+                    start_date=start,
+                    end_date=end,
+                    returns=self.raw_algorithm_returns,
+                    benchmark_returns=self.raw_benchmark_returns,
+                    algorithm_leverages=self.algorithm_leverages,
+                )
+                for start, end in zip(start_dates, end_dates)
+            ]
+
+        starts, ends = self._bounds(start_dates, end_dates)
+        lengths = ends - starts
+
+        algo_period_returns = _window_products(self.algo_growth,
+                                               starts, ends) - 1
+        bench_period_returns = _window_products(self.bench_growth,
+                                                starts, ends) - 1
+
+        root_days = np.sqrt(lengths)
+        algo_volatility = self.algo_moments.std(starts, ends) * root_days
+        bench_volatility = self.bench_moments.std(starts, ends) * root_days
+
+        betas = self._betas(starts, ends)
+        downside = self._downside_risks(starts, ends)
+        drawdowns = self._max_drawdowns(starts, ends)
+        information = self._information_ratios(starts, ends)
+        max_leverage = self._max_leverage()
+
+        periods = []
+        for i, (start_date, end_date) in enumerate(zip(start_dates,
+                                                       end_dates)):
+            s, e = starts[i], ends[i]
+            periods.append(self._period(
+                start_date,
+                end_date,
+                s,
+                e,
+                algo_period_returns[i],
+                bench_period_returns[i],
+                algo_volatility[i],
+                bench_volatility[i],
+                betas[i],
+                downside[i],
+                drawdowns[i],
+                information[i],
+                max_leverage,
+            ))
+        return periods
+
+    def _period(self, start_date, end_date, s, e, algo_period_return,
+                bench_period_return, algo_volatility, bench_volatility,
+                beta_stats, downside_risk, max_dd, information,
+                max_leverage):
+        algorithm_returns = self.algorithm_returns.iloc[s:e]
+        benchmark_returns = self.benchmark_returns.iloc[s:e]
+        treasury_period_return = choose_treasury(self.treasury_curves,
+                                                 start_date,
+                                                 end_date,
+                                                 in_period=True)
+
+        sharpe = sharpe_ratio(algo_volatility,
+                              algo_period_return,
+                              treasury_period_return)
+        if pd.isnull(sharpe):
+            sharpe = 0.0
+
+        beta, algorithm_covariance, benchmark_variance, condition_number, \
+            eigen_values = beta_stats
+
+        trading_day_counts, mean_algorithm_returns = \
+            self._expanding_stats(s, e)
+
+        return RiskMetricsPeriod.from_metrics(
+            start_date=start_date,
+            end_date=end_date,
+            treasury_curves=self.treasury_curves,
+            algorithm_returns=algorithm_returns,
+            benchmark_returns=benchmark_returns,
+            algorithm_leverages=self.algorithm_leverages,
+            algorithm_period_returns=algo_period_return,
+            benchmark_period_returns=bench_period_return,
+            num_trading_days=e - s,
+            trading_day_counts=trading_day_counts,
+            mean_algorithm_returns=mean_algorithm_returns,
+            algorithm_volatility=algo_volatility,
+            benchmark_volatility=bench_volatility,
+            treasury_period_return=treasury_period_return,
+            sharpe=sharpe,
+            downside_risk=downside_risk,
+            sortino=sortino_ratio(algo_period_return,
+                                  treasury_period_return,
+                                  downside_risk),
+            information=information,
+            beta=beta,
+            algorithm_covariance=algorithm_covariance,
+            benchmark_variance=benchmark_variance,
+            condition_number=condition_number,
+            eigen_values=eigen_values,
+            alpha=alpha(algo_period_return,
+                        treasury_period_return,
+                        bench_period_return,
+                        beta),
+            excess_return=algo_period_return - treasury_period_return,
+            max_drawdown=max_dd,
+            max_leverage=max_leverage,
+        )
+
+    def _expanding_stats(self, s, e):
+        index = self.algorithm_returns.index[s:e]
+        counts = self.algo_moments.count[s + 1:e + 1] - \
+            self.algo_moments.count[s]
+        sums = self.algo_filled_sum[s + 1:e + 1] - self.algo_filled_sum[s]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / counts
+        return (pd.Series(counts, index=index),
+                pd.Series(means, index=index))
+
+    def _betas(self, starts, ends):
+        """
+        Beta, covariance, benchmark variance, condition number and
+        eigenvalues of the covariance matrix of each window, as computed by
+        RiskMetricsPeriod.calculate_beta.
+        """
+        lengths = ends - starts
+        algo = self.algo_moments
+        bench = self.bench_moments
+
+        _, algo_sum, algo_sum_sq = algo.window(starts, ends)
+        _, bench_sum, bench_sum_sq = bench.window(starts, ends)
+        cross = self.cross[ends] - self.cross[starts]
+        has_nan = (self.nan_count[ends] - self.nan_count[starts]) > 0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = lengths.astype(np.float64)
+            algo_var = (algo_sum_sq - algo_sum * algo_sum / n) / (n - 1)
+            bench_var = (bench_sum_sq - bench_sum * bench_sum / n) / (n - 1)
+            covariance = (cross - algo_sum * bench_sum / n) / (n - 1)
+
+            algo_var[has_nan] = np.nan
+            bench_var[has_nan] = np.nan
+            covariance[has_nan] = np.nan
+
+            # Eigenvalues of the symmetric 2x2 covariance matrix.
+            half_trace = (algo_var + bench_var) / 2
+            radius = np.sqrt(((algo_var - bench_var) / 2) ** 2 +
+                             covariance ** 2)
+            largest = half_trace + radius
+            smallest = half_trace - radius
+            condition_numbers = largest / smallest
+            betas = covariance / bench_var
+
+        results = []
+        for i in range(len(starts)):
+            # it doesn't make much sense to calculate beta for less than two
+            # days, so return none.
+            if lengths[i] < 2:
+                results.append((0.0, 0.0, 0.0, 0.0, []))
+                continue
+            results.append((
+                betas[i],
+                covariance[i],
+                bench_var[i],
+                condition_numbers[i],
+                np.array([largest[i], smallest[i]]),
+            ))
+        return results
+
+    def _flat_windows(self, starts, ends):
+        """
+        Positions of the entries of every window laid end to end, along with
+        the window each belongs to.
+        """
+        lengths = ends - starts
+        window_ids = np.repeat(np.arange(len(starts)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        return starts[window_ids] + offsets, window_ids
+
+    def _downside_risks(self, starts, ends):
+        """
+        The downside risk of each window, as computed by risk.downside_risk
+        against the expanding mean of the window's returns.
+        """
+        positions, window_ids = self._flat_windows(starts, ends)
+        window_starts = starts[window_ids]
+
+        counts = self.algo_moments.count[positions + 1] - \
+            self.algo_moments.count[window_starts]
+        sums = self.algo_filled_sum[positions + 1] - \
+            self.algo_filled_sum[window_starts]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = (sums / counts).round(8)
+            returns = self.algo[positions].round(8)
+            below = returns < means
+
+        diffs = (returns - means)[below]
+        below_ids = window_ids[below]
+        num_windows = len(starts)
+        count = np.bincount(below_ids, minlength=num_windows)
+        total = np.bincount(below_ids, weights=diffs, minlength=num_windows)
+        sum_sq = np.bincount(below_ids, weights=diffs * diffs,
+                             minlength=num_windows)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = (sum_sq - total * total / count) / (count - 1)
+        result = np.sqrt(np.maximum(var, 0.0)) * np.sqrt(ends - starts)
+        result[count <= 1] = 0.0
+        return result
+
+    def _information_ratios(self, starts, ends):
+        """
+        The information ratio of each window, as computed by
+        risk.information_ratio.
+        """
+        relative = self.relative_moments
+        deviations = relative.std(starts, ends)
+        means = relative.mean(starts, ends)
+
+        results = np.zeros(len(starts))
+        for i, deviation in enumerate(deviations):
+            if not (np.isnan(deviation) or
+                    zp_math.tolerant_equals(deviation, 0)):
+                results[i] = means[i] / deviation
+        return results
+
+    def _max_drawdowns(self, starts, ends):
+        """
+        The max drawdown of each window, as computed by max_drawdown.
+        """
+        num_windows = len(starts)
+        results = np.zeros(num_windows)
+
+        total_losses = self.total_loss_count[ends] - \
+            self.total_loss_count[starts]
+        slow = (total_losses > 0) & (ends > starts)
+        for i in np.flatnonzero(slow):
+            results[i] = max_drawdown(
+                self.algorithm_returns.iloc[starts[i]:ends[i]]
+            )
+
+        fast = (total_losses == 0) & (ends > starts)
+        if not fast.any():
+            return results
+
+        fast_starts, fast_ends = starts[fast], ends[fast]
+        positions, window_ids = self._flat_windows(fast_starts, fast_ends)
+
+        log_sums = _cumulative(self.log_growth)
+        compounded = log_sums[positions + 1] - \
+            log_sums[fast_starts[window_ids]]
+
+        # A running maximum within each window, done as one running maximum
+        # over all windows by lifting each window above all earlier ones.
+        lift = (compounded.max() - compounded.min()) + 1.0
+        lifted = compounded + window_ids * lift
+        peaks = np.maximum.accumulate(lifted) - window_ids * lift
+
+        boundaries = np.cumsum(fast_ends - fast_starts) - \
+            (fast_ends - fast_starts)
+        troughs = np.minimum.reduceat(compounded - peaks, boundaries)
+        results[fast] = 1.0 - np.exp(troughs)
+        return results
+
+    def _max_leverage(self):
+        if self.algorithm_leverages is None:
+            return 0.0
+        else:
+            return max(self.algorithm_leverages)
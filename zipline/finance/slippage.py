@@ -98,13 +98,34 @@ def transact_stub(slippage, commission, event, open_orders):
     """
     This is intended to be wrapped in a partial, so that the
     slippage and commission models can be enclosed.
+
+    The commissions of all the transactions created against event are
+    calculated together, with the commission model's calculate_many when it
+    has one.
     """
-    for order, transaction in slippage(event, open_orders):
-        if transaction and transaction.amount != 0:
+    fills = list(slippage(event, open_orders))
+    transactions = [transaction for _, transaction in fills
+                    if transaction and transaction.amount != 0]
+
+    if transactions:
+        if hasattr(commission, 'calculate_many'):
+            per_shares, total_commissions = commission.calculate_many(
+                [txn.amount for txn in transactions],
+                [txn.price for txn in transactions],
+                [txn.order_id for txn in transactions],
+            )
+            commissions = zip(per_shares.tolist(),
+                              total_commissions.tolist())
+        else:
+            commissions = map(commission.calculate, transactions)
+
+        for transaction, commission_pair in zip(transactions, commissions):
+            per_share, total_commission = commission_pair
             direction = math.copysign(1, transaction.amount)
-            per_share, total_commission = commission.calculate(transaction)
             transaction.price += per_share * direction
             transaction.commission = total_commission
+
+    for order, transaction in fills:
         yield order, transaction
 
 
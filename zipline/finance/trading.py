@@ -138,6 +138,24 @@ class TradingEnvironment(object):
 
         self.asset_finder = AssetFinder()
 
+        self._treasury_curve_table = None
+
+    @property
+    def treasury_curve_table(self):
+        """
+        A TreasuryCurveTable of the treasury curves, built on first use and
+        rebuilt if the curves are replaced.
+        """
+        table = self._treasury_curve_table
+        if table is None or table.treasury_curves is not self.treasury_curves:
+            # Imported here because zipline.finance.risk imports this module.
+            from zipline.finance.risk.risk import TreasuryCurveTable
+            table = self._treasury_curve_table = TreasuryCurveTable(
+                self.treasury_curves,
+                self.trading_days,
+            )
+        return table
+
     def __enter__(self, *args, **kwargs):
         global environment
         self.prev_environment = environment
@@ -16,6 +16,7 @@
 from contextlib2 import ExitStack
 
 from logbook import Logger, Processor
+import pandas as pd
 from pandas.tslib import normalize_date
 
 from zipline.utils.api_support import ZiplineAPI
@@ -23,9 +24,9 @@ from zipline.utils.api_support import ZiplineAPI
 from zipline.finance import trading
 from zipline.protocol import (
     BarData,
-    SIDData,
     DATASOURCE_TYPE
 )
+from zipline.utils.checkpoint import restore_bar_data
 
 log = Logger('Trade Simulation')
 
@@ -64,6 +65,33 @@ class AlgorithmSimulator(object):
         # receive a message.
         self.simulation_dt = None
 
+        # ==============
+        # Minute Emission
+        # ==============
+
+        # The scalar fields of the last minute perf message, which delta
+        # messages are relative to, and the number of minute messages since
+        # the last full one.
+        self.minute_scalars = None
+        self.minutes_since_snapshot = 0
+
+        # ==============
+        # Checkpointing
+        # ==============
+
+        # Called at the end of each session when not None.
+        self.checkpointer = None
+
+        # The market open and close of the first session to simulate, and
+        # the dt of the last event processed before the checkpoint, when
+        # resuming from a checkpoint.
+        self.resume_market_hours = None
+        self.resume_dt = None
+
+        # When not None, the simulation ends after the first session ending
+        # at or after this dt.
+        self.stop_at = None
+
         # =============
         # Logging Setup
         # =============
@@ -79,9 +107,23 @@ class AlgorithmSimulator(object):
         """
         Main generator work loop.
         """
+        if self.sim_params.data_frequency == 'daily' and \
+           self.sim_params.emission_rate == 'daily':
+            return self._transform_daily(stream_in)
+        return self._transform_snapshots(stream_in)
+
+    def _initial_market_hours(self):
+        if self.resume_market_hours is None:
+            return (self.algo.perf_tracker.market_open,
+                    self.algo.perf_tracker.market_close)
+        return self.resume_market_hours
+
+    def _transform_snapshots(self, stream_in):
+        """
+        Generic work loop, for any data frequency and emission rate.
+        """
         # Initialize the mkt_close
-        mkt_open = self.algo.perf_tracker.market_open
-        mkt_close = self.algo.perf_tracker.market_close
+        mkt_open, mkt_close = self._initial_market_hours()
 
         # inject the current algo
         # snapshot time to any log record generated.
@@ -92,9 +134,12 @@ class AlgorithmSimulator(object):
 
             data_frequency = self.sim_params.data_frequency
 
-            self._call_before_trading_start(mkt_open)
+            # When resuming, before_trading_start was called for the first
+            # session before the checkpoint was taken.
+            if self.resume_market_hours is None:
+                self._call_before_trading_start(mkt_open)
 
-            for date, snapshot in stream_in:
+            for date, snapshot, emit in self._with_emission_dts(stream_in):
 
                 self.simulation_dt = date
                 self.on_dt_changed(date)
@@ -103,27 +148,23 @@ class AlgorithmSimulator(object):
                 # update our universe, but don't yield any perf messages,
                 # and don't send a snapshot to handle_data.
                 if date < self.algo_start:
-                    for event in snapshot:
-                        if event.type == DATASOURCE_TYPE.SPLIT:
-                            self.algo.blotter.process_split(event)
-
-                        elif event.type == DATASOURCE_TYPE.TRADE:
-                            self.update_universe(event)
-                            self.algo.perf_tracker.process_trade(event)
-                        elif event.type == DATASOURCE_TYPE.CUSTOM:
-                            self.update_universe(event)
+                    self._process_warmup(snapshot)
 
                 else:
                     message = self._process_snapshot(
                         date,
                         snapshot,
                         self.algo.instant_fill,
+                        emit,
                     )
-                    # Perf messages are only emitted if the snapshot contained
-                    # a benchmark event.
+                    # Perf messages are only emitted at the dts of benchmark
+                    # returns.
                     if message is not None:
                         yield message
 
+                    session_end = date == mkt_close or \
+                        data_frequency == 'daily'
+
                     # When emitting minutely, we re-iterate the day as a
                     # packet with the entire days performance rolled up.
                     if date == mkt_close:
@@ -132,11 +173,13 @@ class AlgorithmSimulator(object):
                                 emission_type='daily'
                             )
                             daily_rollup['daily_perf']['recorded_vars'] = \
-                                self.algo.recorded_vars
+                                self.algo.recorder.values()
                             yield daily_rollup
                             tp = self.algo.perf_tracker.todays_performance
                             tp.rollover()
 
+                        self.algo.recorder.end_session()
+
                         if mkt_close <= self.algo.perf_tracker.last_close:
                             before_last_close = \
                                 mkt_close < self.algo.perf_tracker.last_close
@@ -160,6 +203,8 @@ class AlgorithmSimulator(object):
                                 self._call_before_trading_start(mkt_open)
 
                     elif data_frequency == 'daily':
+                        self.algo.recorder.end_session()
+
                         next_day = trading.environment.next_trading_day(date)
 
                         if next_day is not None and \
@@ -170,13 +215,163 @@ class AlgorithmSimulator(object):
                     self.algo.account_needs_update = True
                     self.algo.performance_needs_update = True
 
-            risk_message = self.algo.perf_tracker.handle_simulation_end()
+                    if session_end and \
+                       self._end_session(date, mkt_open, mkt_close):
+                        return
+
+            risk_message = self._simulation_end_message()
+            yield risk_message
+
+    def _transform_daily(self, stream_in):
+        """
+        Work loop for daily data emitted daily.
+
+        Every snapshot ends a session, so there is no minute emission to
+        handle, and the session following each snapshot is found by walking
+        a position forward through the simulation's trading days, rather
+        than by searching the trading calendar day by day.
+        """
+        mkt_open, mkt_close = self._initial_market_hours()
+
+        with ExitStack() as stack:
+            stack.enter_context(self.processor.threadbound())
+            stack.enter_context(ZiplineAPI(self.algo))
+
+            perf_tracker = self.algo.perf_tracker
+            recorder = self.algo.recorder
+            instant_fill = self.algo.instant_fill
+            last_close = perf_tracker.last_close
+
+            sessions = list(perf_tracker.trading_days)
+            num_sessions = len(sessions)
+            # The position in sessions of the first session after the
+            # current snapshot.
+            next_session = 0
+
+            if self.resume_market_hours is None:
+                self._call_before_trading_start(mkt_open)
+
+            for date, snapshot, emit in self._with_emission_dts(stream_in):
+
+                self.simulation_dt = date
+                self.on_dt_changed(date)
+
+                if date < self.algo_start:
+                    self._process_warmup(snapshot)
+                    continue
+
+                message = self._process_snapshot(date, snapshot, instant_fill,
+                                                 emit)
+                if message is not None:
+                    yield message
+
+                recorder.end_session()
+
+                while next_session < num_sessions and \
+                        sessions[next_session] <= date:
+                    next_session += 1
+
+                if date == mkt_close:
+                    # Daily bars stamped with the market close move the
+                    # market hours forward, as minute bars do.
+                    if mkt_close <= last_close:
+                        before_last_close = mkt_close < last_close
+                        if next_session < num_sessions:
+                            mkt_open, mkt_close = trading.environment \
+                                .get_open_and_close(sessions[next_session])
+                        else:
+                            try:
+                                mkt_open, mkt_close = trading.environment \
+                                    .next_open_and_close(mkt_close)
+                            except trading.NoFurtherDataError:
+                                pass
+                        if before_last_close:
+                            self._call_before_trading_start(mkt_open)
+
+                elif next_session < num_sessions and \
+                        sessions[next_session] < last_close:
+                    self._call_before_trading_start(sessions[next_session])
+
+                self.algo.portfolio_needs_update = True
+                self.algo.account_needs_update = True
+                self.algo.performance_needs_update = True
+
+                if self._end_session(date, mkt_open, mkt_close):
+                    return
+
+            risk_message = self._simulation_end_message()
             yield risk_message
 
-    def _process_snapshot(self, dt, snapshot, instant_fill):
+    def _process_warmup(self, snapshot):
+        """
+        Update the universe with the events of a snapshot from before the
+        start of the simulation, without calling handle_data.
+        """
+        for event in snapshot:
+            if event.type == DATASOURCE_TYPE.SPLIT:
+                self.algo.blotter.process_split(event)
+
+            elif event.type == DATASOURCE_TYPE.TRADE:
+                self.update_universe(event)
+                self.algo.perf_tracker.process_trade(event)
+            elif event.type == DATASOURCE_TYPE.CUSTOM:
+                self.update_universe(event)
+
+    def _end_session(self, date, mkt_open, mkt_close):
         """
-        Process a stream of events corresponding to a single datetime, possibly
-        returning a perf message to be yielded.
+        Checkpoint the session ending at date if needed, returning whether
+        the simulation should stop there.  mkt_open and mkt_close are those
+        of the next session.
+        """
+        stop = self.stop_at is not None and date >= self.stop_at
+        if self.checkpointer is not None:
+            self.checkpointer.session_end(
+                self, date, mkt_open, mkt_close, force=stop,
+            )
+        return stop
+
+    def resume(self, checkpoint):
+        """
+        Restore the simulator's state from checkpoint, so that transform
+        carries on with the session after the checkpoint.
+        """
+        self.current_data = restore_bar_data(checkpoint.current_data)
+        self.resume_market_hours = (checkpoint.market_open,
+                                    checkpoint.market_close)
+        self.resume_dt = checkpoint.dt
+
+    def _with_emission_dts(self, stream_in):
+        """
+        Yield (date, snapshot, emit) for each snapshot of stream_in, where
+        emit is whether a perf message is due at date, along with an empty
+        snapshot for each dt a message is due at without any events.
+
+        Messages are due at the dts of the perf tracker's benchmark returns.
+        """
+        emission_dts = self.algo.perf_tracker.benchmark_dts
+        if self.resume_dt is not None:
+            emission_dts = emission_dts[emission_dts > pd.Timestamp(
+                self.resume_dt).value]
+        emission_dts = [pd.Timestamp(dt, tz='UTC') for dt in emission_dts]
+
+        i = 0
+        num_emissions = len(emission_dts)
+        for date, snapshot in stream_in:
+            while i < num_emissions and emission_dts[i] < date:
+                yield emission_dts[i], (), True
+                i += 1
+            emit = i < num_emissions and emission_dts[i] == date
+            if emit:
+                i += 1
+            yield date, snapshot, emit
+
+        for dt in emission_dts[i:]:
+            yield dt, (), True
+
+    def _process_snapshot(self, dt, snapshot, instant_fill, emit=False):
+        """
+        Process a stream of events corresponding to a single datetime,
+        returning a perf message to be yielded if emit is True.
 
         If @instant_fill = True, we delay processing of events until after the
         user's call to handle_data, and we process the user's placed orders
@@ -190,12 +385,9 @@ class AlgorithmSimulator(object):
         and as such it is the default behavior in TradingAlgorithm.
         """
 
-        # Flags indicating whether we saw any events of type TRADE and type
-        # BENCHMARK.  Respectively, these control whether or not handle_data is
-        # called for this snapshot and whether we emit a perf message for this
-        # snapshot.
+        # Flag indicating whether we saw any events of type TRADE, which
+        # controls whether or not handle_data is called for this snapshot.
         any_trade_occurred = False
-        benchmark_event_occurred = False
 
         if instant_fill:
             events_to_be_processed = []
@@ -208,7 +400,6 @@ class AlgorithmSimulator(object):
         perf_process_trade = self.algo.perf_tracker.process_trade
         perf_process_transaction = self.algo.perf_tracker.process_transaction
         perf_process_order = self.algo.perf_tracker.process_order
-        perf_process_benchmark = self.algo.perf_tracker.process_benchmark
         perf_process_split = self.algo.perf_tracker.process_split
         perf_process_dividend = self.algo.perf_tracker.process_dividend
         perf_process_commission = self.algo.perf_tracker.process_commission
@@ -221,9 +412,6 @@ class AlgorithmSimulator(object):
         # processed in a predictable order, without relying on the sorted order
         # of the individual sources.
 
-        # There is only one benchmark per snapshot, will be set to the current
-        # benchmark iff it occurs.
-        benchmark = None
         # trades and customs are initialized as a list since process_snapshot
         # is most often called on market bars, which could contain trades or
         # custom events.
@@ -246,8 +434,6 @@ class AlgorithmSimulator(object):
         for event in snapshot:
             if event.type == DATASOURCE_TYPE.TRADE:
                 trades.append(event)
-            elif event.type == DATASOURCE_TYPE.BENCHMARK:
-                benchmark = event
             elif event.type == DATASOURCE_TYPE.SPLIT:
                 if splits is None:
                     splits = []
@@ -263,15 +449,13 @@ class AlgorithmSimulator(object):
             else:
                 raise log.warn("Unrecognized event=%s".format(event))
 
-        # Handle benchmark first.
+        # Handle the emission first.
         #
-        # Internal broker implementation depends on the benchmark being
+        # Internal broker implementation depends on the emission being
         # processed first so that transactions and commissions reported from
         # the broker can be injected.
-        if benchmark is not None:
-            benchmark_event_occurred = True
-            perf_process_benchmark(benchmark)
-            for txn, order in blotter_process_benchmark(benchmark):
+        if emit:
+            for txn, order in blotter_process_benchmark(dt):
                 if txn.type == DATASOURCE_TYPE.TRANSACTION:
                     perf_process_transaction(txn)
                 elif txn.type == DATASOURCE_TYPE.COMMISSION:
@@ -327,11 +511,22 @@ class AlgorithmSimulator(object):
                         perf_process_order(order)
                 perf_process_trade(trade)
 
-        if benchmark_event_occurred:
+        if emit:
             return self.get_message(dt)
         else:
             return None
 
+    def _simulation_end_message(self):
+        """
+        The risk report ending the simulation, along with the timing of the
+        algorithm's events if they were timed.
+        """
+        risk_message = self.algo.perf_tracker.handle_simulation_end()
+        event_manager = self.algo.event_manager
+        if event_manager.timed:
+            risk_message['event_timing'] = event_manager.timing_report()
+        return risk_message
+
     def _call_handle_data(self):
         """
         Call the user's handle_data, returning any orders placed by the algo
@@ -366,19 +561,49 @@ class AlgorithmSimulator(object):
         self.algo.updated_portfolio()
         self.algo.updated_account()
 
-        rvars = self.algo.recorded_vars
+        recorder = self.algo.recorder
         if self.algo.perf_tracker.emission_rate == 'daily':
+            rvars = recorder.values()
             perf_message = \
                 self.algo.perf_tracker.handle_market_close_daily()
             perf_message['daily_perf']['recorded_vars'] = rvars
             return perf_message
 
         elif self.algo.perf_tracker.emission_rate == 'minute':
-            self.algo.perf_tracker.handle_minute_close(dt)
-            perf_message = self.algo.perf_tracker.to_dict()
+            perf_tracker = self.algo.perf_tracker
+            perf_tracker.handle_minute_close(dt)
+            rvars = recorder.values(minute=True)
+            recorder.end_minute()
+
+            if self.algo.minute_emission == 'delta' and \
+               not self._minute_snapshot_due():
+                self.minutes_since_snapshot += 1
+                perf_message, self.minute_scalars = \
+                    perf_tracker.to_minute_delta(self.minute_scalars, rvars)
+                return perf_message
+
+            perf_message = perf_tracker.to_dict()
             perf_message['minute_perf']['recorded_vars'] = rvars
+            if self.algo.minute_emission == 'delta':
+                self.minute_scalars = perf_tracker.minute_scalars(perf_message)
+                self.minutes_since_snapshot = 0
             return perf_message
 
+    def _minute_snapshot_due(self):
+        """
+        Whether the next minute perf message of a delta emission should be a
+        full one: the first of the simulation, and then every
+        algo.minute_snapshot_every minute messages if it is set.
+
+        Minute messages are emitted at the dts of the benchmark returns,
+        which are the market closes with the default benchmark, so that
+        deltas run across sessions rather than restarting with each one.
+        """
+        if self.minute_scalars is None:
+            return True
+        every = self.algo.minute_snapshot_every
+        return every is not None and self.minutes_since_snapshot + 1 >= every
+
     def update_universe(self, event):
         """
         Update the universe with new event information.
@@ -389,6 +614,6 @@ class AlgorithmSimulator(object):
         try:
             sid_data = self.current_data[event.sid]
         except KeyError:
-            sid_data = self.current_data[event.sid] = SIDData(event.sid)
+            sid_data = self.current_data.create_sid_data(event.sid)
 
-        sid_data.__dict__.update(event.__dict__)
+        sid_data.update(event.__dict__)
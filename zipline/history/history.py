@@ -232,6 +232,13 @@ class Frequency(object):
             return dt
         return pd.tslib.normalize_date(dt)
 
+    def __getstate__(self):
+        # prev_bar caches a function of the environment on the instance,
+        # which can't be pickled; it is rebuilt on the next call.
+        state = self.__dict__.copy()
+        state.pop('prev_bar', None)
+        return state
+
     def __eq__(self, other):
         return self.freq_str == other.freq_str
 
@@ -307,6 +307,15 @@ class HistoryContainer(object):
         for panel in self.digest_panels.values():
             yield panel
 
+    @property
+    def nbytes(self):
+        """
+        The number of bytes held by the buffer and digest panels and the
+        last known prior values.
+        """
+        return sum(panel.nbytes for panel in self.all_panels) + \
+            self.last_known_prior_values.values.nbytes
+
     @property
     def unique_frequencies(self):
         """
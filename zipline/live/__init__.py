@@ -0,0 +1,48 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Running algorithms against real-time bars, on an asyncio event loop.
+
+A LiveRunner waits on one or more MarketDataFeeds for the bars of each bar
+close, calls the algorithm's handle_data and scheduled functions with them,
+and routes the orders placed to a Broker, whose fills are applied to the
+algorithm's blotter and performance tracker as they are reported.
+
+SimulatedFeed and SimulatedBroker replay zipline data sources and fill
+orders with zipline's slippage and commission models, so that the live path
+can be run offline.  paced_replay paper trades over historical bars replayed
+at the pace of a live market, to find algorithms too slow to keep up.
+"""
+import sys
+
+if sys.version_info < (3, 5):
+    raise ImportError("zipline.live requires Python 3.5 or later")
+
+from . brokers import Broker, SimulatedBroker  # noqa
+from . feeds import MarketDataFeed, SimulatedFeed  # noqa
+from . runner import LiveRunner  # noqa
+from . replay import ReplayFeed, ReplayRunner, paced_replay  # noqa
+
+__all__ = [
+    'Broker',
+    'LiveRunner',
+    'MarketDataFeed',
+    'ReplayFeed',
+    'ReplayRunner',
+    'SimulatedBroker',
+    'SimulatedFeed',
+    'paced_replay',
+]
@@ -0,0 +1,117 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import abc
+import asyncio
+
+from copy import copy
+
+from zipline.finance.blotter import Blotter
+from zipline.finance.commission import PerShare
+from zipline.finance.slippage import VolumeShareSlippage, transact_partial
+from zipline.protocol import DATASOURCE_TYPE
+
+
+class Broker(metaclass=abc.ABCMeta):
+    """
+    The interface through which a LiveRunner places and cancels orders.
+
+    Fills are reported by calling the on_fill callback given to start with a
+    zipline.finance.slippage.Transaction, whose order_id is the id of the
+    order it fills and whose commission is the commission charged for it.
+    on_fill may be called at any time from the event loop's thread.
+    """
+
+    def __init__(self):
+        self.on_fill = None
+
+    async def start(self, on_fill):
+        """
+        Called before the first order is submitted.
+        """
+        self.on_fill = on_fill
+
+    async def stop(self):
+        """
+        Called once the runner is done with the broker.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def submit(self, order):
+        """
+        Place order, a zipline.finance.blotter.Order.
+        """
+        raise NotImplementedError('submit')
+
+    @abc.abstractmethod
+    async def cancel(self, order_id):
+        """
+        Cancel what is left open of the order with order_id.
+        """
+        raise NotImplementedError('cancel')
+
+    async def on_bar(self, dt, events):
+        """
+        Called with the events of each bar close, before they are passed to
+        the algorithm.
+        """
+        pass
+
+
+class SimulatedBroker(Broker):
+    """
+    Fills orders against the trades of each bar, with zipline's slippage and
+    commission models, in the same way as a backtest without instant fills.
+
+    Fills are reported latency seconds after the bar they are made on.
+    """
+
+    def __init__(self, slippage=None, commission=None, latency=0):
+        super(SimulatedBroker, self).__init__()
+        if slippage is None:
+            slippage = VolumeShareSlippage()
+        if commission is None:
+            commission = PerShare()
+        self.latency = latency
+
+        self.blotter = Blotter()
+        self.blotter.transact = transact_partial(slippage, commission)
+
+    async def submit(self, order):
+        # The broker's blotter works on its own copy of the order, so that
+        # the algorithm's order only changes as fills are reported.
+        order = copy(order)
+        self.blotter.open_orders[order.sid].append(order)
+        self.blotter.orders[order.id] = order
+
+    async def cancel(self, order_id):
+        self.blotter.cancel(order_id)
+        self.blotter.new_orders = []
+
+    async def on_bar(self, dt, events):
+        self.blotter.set_date(dt)
+        for event in events:
+            if event.type != DATASOURCE_TYPE.TRADE:
+                continue
+            for txn, _ in self.blotter.process_trade(event):
+                if txn.type == DATASOURCE_TYPE.TRANSACTION:
+                    self._report(txn)
+
+    def _report(self, txn):
+        if self.latency:
+            asyncio.get_event_loop().call_later(self.latency, self.on_fill,
+                                                txn)
+        else:
+            self.on_fill(txn)
@@ -0,0 +1,73 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import abc
+import asyncio
+
+from itertools import groupby
+from operator import attrgetter
+
+from zipline.gens.composites import date_sorted_sources
+
+
+class MarketDataFeed(metaclass=abc.ABCMeta):
+    """
+    An asynchronous source of bars.
+
+    Each call to next_batch waits for the next bar close and returns the
+    bars of that close, as events like those of zipline's data sources.
+    """
+
+    # The sids the feed has bars for, which make up the algorithm's universe
+    # at the start of a run.
+    sids = ()
+
+    @abc.abstractmethod
+    async def next_batch(self):
+        """
+        Wait for the next bar close, and return (dt, events) with the events
+        of that close, or None once the feed has ended.
+        """
+        raise NotImplementedError('next_batch')
+
+    async def close(self):
+        """
+        Called once the runner is done with the feed.
+        """
+        pass
+
+
+class SimulatedFeed(MarketDataFeed):
+    """
+    Replays the events of zipline data sources, one dt at a time, waiting
+    interval seconds before each one.
+    """
+
+    def __init__(self, sources, interval=0):
+        self.sources = sources
+        self.interval = interval
+        self.sids = set()
+        for source in sources:
+            self.sids.update(source.sids)
+
+        self._batches = groupby(date_sorted_sources(*sources),
+                                attrgetter('dt'))
+
+    async def next_batch(self):
+        await asyncio.sleep(self.interval)
+        try:
+            dt, events = next(self._batches)
+        except StopIteration:
+            return None
+        return dt, list(events)
@@ -0,0 +1,190 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Paper trading over historical data, replayed at the pace of a live market.
+
+A ReplayFeed hands out the bars of zipline data sources on a wall-clock
+schedule, speed times faster than they happened, and a ReplayRunner times
+the algorithm's handle_data on each bar against the time until the next
+one, reporting the bars it overran, which a live algorithm would have fallen
+behind on.
+"""
+import asyncio
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from logbook import Logger
+
+from . brokers import SimulatedBroker
+from . feeds import SimulatedFeed
+from . runner import LiveRunner
+
+log = Logger('Paced Replay')
+
+
+class ReplayFeed(SimulatedFeed):
+    """
+    Replays the events of zipline data sources on a wall-clock schedule.
+
+    Each batch is due the time between its dt and the previous batch's
+    after that batch, divided by speed.  Longer gaps, such as those between
+    sessions, count as max_gap, so that replays skip the time the market is
+    closed.  A batch asked for after it is due is handed out at once, and
+    how late it was is recorded in lags.
+    """
+
+    def __init__(self, sources, speed=1.0, max_gap=timedelta(minutes=1)):
+        if speed <= 0:
+            raise ValueError("speed must be positive, got %s" % speed)
+        super(ReplayFeed, self).__init__(sources)
+        self.speed = speed
+        self.max_gap = max_gap
+
+        # The dt of the last batch handed out, and the event loop time it was
+        # due at.
+        self._last_dt = None
+        self._due = None
+
+        # How late each batch was asked for, in seconds.
+        self.lags = []
+
+    @property
+    def bar_interval(self):
+        """
+        The longest time, in seconds, between two batches.
+        """
+        return self.max_gap.total_seconds() / self.speed
+
+    async def next_batch(self):
+        try:
+            dt, events = next(self._batches)
+        except StopIteration:
+            return None
+
+        loop = asyncio.get_event_loop()
+        if self._due is None:
+            self._due = loop.time()
+        else:
+            gap = min(dt - self._last_dt, self.max_gap)
+            self._due += gap.total_seconds() / self.speed
+        self._last_dt = dt
+
+        delay = self._due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.lags.append(max(-delay, 0.0))
+
+        return dt, list(events)
+
+
+class ReplayRunner(LiveRunner):
+    """
+    A LiveRunner checking the time taken by the algorithm's handle_data,
+    and the scheduled functions run with it, on each bar against budget
+    seconds.
+
+    The calls are timed by the algorithm's EventManager, whose timing is
+    turned on.  budget defaults to the shortest bar_interval of the feeds,
+    the time between two bars of a replay.  Bars taking longer are overruns,
+    which are logged as they happen.  The broker defaults to a
+    SimulatedBroker.
+    """
+
+    def __init__(self, algo, feeds, broker=None, sim_params=None,
+                 budget=None):
+        if broker is None:
+            broker = SimulatedBroker()
+        super(ReplayRunner, self).__init__(algo, feeds, broker, sim_params)
+
+        if budget is None:
+            budget = min(feed.bar_interval for feed in self.feeds)
+        self.budget = budget
+        algo.event_manager.timed = True
+
+        # The dt of each bar handle_data was called on, and how long the
+        # call took, in seconds.
+        self.dts = []
+        self.latencies = []
+
+    def _call_handle_data(self):
+        orders = super(ReplayRunner, self)._call_handle_data()
+        latency = self.algo.event_manager.last_bar_time
+
+        dt = self.simulator.simulation_dt
+        self.dts.append(dt)
+        self.latencies.append(latency)
+        if latency > self.budget:
+            log.warn("handle_data took {latency:.3f}s at {dt}, over the "
+                     "{budget:.3f}s until the next bar.".format(
+                         latency=latency, dt=dt, budget=self.budget))
+        return orders
+
+    @property
+    def overruns(self):
+        """
+        The dts of the bars whose handle_data took longer than the budget.
+        """
+        return [dt for dt, latency in zip(self.dts, self.latencies)
+                if latency > self.budget]
+
+    def latency_frame(self):
+        """
+        The latency of handle_data on each bar, in seconds, and whether it
+        overran the budget, as a DataFrame indexed by dt.
+        """
+        latencies = np.array(self.latencies, dtype=np.float64)
+        return pd.DataFrame(
+            {'latency': latencies, 'overrun': latencies > self.budget},
+            index=pd.DatetimeIndex(self.dts),
+            columns=['latency', 'overrun'],
+        )
+
+    def latency_report(self):
+        """
+        A summary of the latencies of handle_data over the replay.
+        """
+        latencies = np.array(self.latencies, dtype=np.float64)
+        if not len(latencies):
+            latencies = np.array([np.nan])
+        return {
+            'bars': len(self.latencies),
+            'budget': self.budget,
+            'mean': np.mean(latencies),
+            'max': np.max(latencies),
+            'overruns': len(self.overruns),
+        }
+
+
+def paced_replay(algo, sources, speed=1.0, fill_latency=0,
+                 max_gap=timedelta(minutes=1), sim_params=None, loop=None):
+    """
+    Paper trade algo over the bars of sources, replayed speed times faster
+    than they happened, with orders filled by a SimulatedBroker reporting
+    its fills fill_latency seconds after the bar they are made on.
+
+    Returns the algorithm's daily stats and the ReplayRunner, whose
+    latency_report and overruns tell whether the algorithm kept up with
+    the bars.
+    """
+    runner = ReplayRunner(
+        algo,
+        [ReplayFeed(sources, speed=speed, max_gap=max_gap)],
+        SimulatedBroker(latency=fill_latency),
+        sim_params=sim_params,
+    )
+    return runner.run(loop=loop), runner
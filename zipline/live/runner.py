@@ -0,0 +1,304 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+
+from collections import deque
+
+from contextlib2 import ExitStack
+import pandas as pd
+from pandas.tslib import normalize_date
+
+from zipline.finance import trading
+from zipline.finance.blotter import ORDER_STATUS
+from zipline.protocol import DATASOURCE_TYPE
+from zipline.utils.api_support import ZiplineAPI
+
+
+class LiveRunner(object):
+    """
+    Runs a TradingAlgorithm against the bars of feeds, a list of
+    MarketDataFeeds, placing its orders with broker.
+
+    On each bar close, the bars of every feed are passed to the broker and
+    then to the algorithm's handle_data and scheduled functions.  The orders
+    placed are submitted to the broker, and the fills it reports are applied
+    to the algorithm's blotter and performance tracker before the next bar.
+    Orders are never filled against the bar they are placed on, whatever
+    the algorithm's instant_fill.
+
+    Sessions are those of sim_params, which defaults to the algorithm's,
+    and perf messages are emitted as in a backtest over sim_params: at the
+    dts of the benchmark returns, whether or not there are bars at those
+    dts, and at every session's close when emitting minutely.  The run ends
+    once the feeds have ended, or after the last session.
+    """
+
+    def __init__(self, algo, feeds, broker, sim_params=None):
+        self.algo = algo
+        self.feeds = list(feeds)
+        self.broker = broker
+        self.sim_params = sim_params or algo.sim_params
+
+        # The perf messages emitted so far.
+        self.perfs = []
+
+        # The fills reported by the broker and not yet applied.
+        self._fills = deque()
+        # The ids of the orders submitted to the broker.
+        self._submitted = set()
+        # The next batch of each feed, by position in feeds, once it has been
+        # received.  A feed's batch is None once it has ended.
+        self._batches = {}
+
+        self.simulator = None
+        self.sessions = None
+        self.session = 0
+        self.market_close = None
+        # Whether any bars of the current session have been processed.
+        self.session_started = False
+
+    def run(self, loop=None):
+        """
+        Run the algorithm on loop, which defaults to the current event loop,
+        until every feed has ended, returning its daily stats.
+        """
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        return loop.run_until_complete(self.run_async())
+
+    async def run_async(self):
+        """
+        Coroutine running the algorithm until every feed has ended, and
+        returning its daily stats.
+        """
+        algo = self.algo
+
+        algo._current_universe = set()
+        for feed in self.feeds:
+            algo._current_universe.update(feed.sids)
+
+        # Start from a fresh performance tracker, as TradingAlgorithm.run
+        # does.
+        algo.perf_tracker = None
+        algo._prepare_simulation(self.sim_params)
+        self.simulator = algo.trading_client
+
+        if algo.history_specs:
+            algo.history_container = algo.history_container_class(
+                algo.history_specs,
+                algo.current_universe(),
+                self.sim_params.first_open,
+                self.sim_params.data_frequency,
+            )
+
+        await self.broker.start(self._fills.append)
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(self.simulator.processor.threadbound())
+                stack.enter_context(ZiplineAPI(algo))
+                await self._run()
+        finally:
+            await self.broker.stop()
+            for feed in self.feeds:
+                await feed.close()
+
+        daily_stats = algo._create_daily_stats(self.perfs)
+        algo.analyze(daily_stats)
+        return daily_stats
+
+    async def _run(self):
+        tracker = self.algo.perf_tracker
+
+        self.sessions = tracker.trading_days
+        self.session = 0
+        self.market_close = tracker.market_close
+        await self._call_before_trading_start(tracker.market_open)
+
+        # Perf messages are due at the dts of the benchmark returns, whether
+        # or not there are bars at those dts, as in a backtest.
+        emission_dts = deque(pd.Timestamp(dt, tz='UTC')
+                             for dt in tracker.benchmark_dts)
+
+        while self.session < len(self.sessions):
+            batch = await self._next_batch()
+            if batch is None:
+                break
+            dt, events = batch
+
+            while emission_dts and emission_dts[0] < dt:
+                await self._process_batch(emission_dts.popleft(), (), True)
+
+            emit = bool(emission_dts) and emission_dts[0] == dt
+            if emit:
+                emission_dts.popleft()
+            await self._process_batch(dt, events, emit)
+
+        # The feeds ended before the end of the current session, whose
+        # remaining messages are emitted.
+        while self.session_started and emission_dts and \
+                emission_dts[0] <= self.market_close:
+            await self._process_batch(emission_dts.popleft(), (), True)
+
+        if self.session == len(self.sessions):
+            self.perfs.append(self.simulator._simulation_end_message())
+
+    async def _next_batch(self):
+        """
+        Wait for the next bar close, returning (dt, events) with the events
+        of every feed at dt, or None once every feed has ended.
+        """
+        waiting = [i for i in range(len(self.feeds))
+                   if i not in self._batches]
+        if waiting:
+            batches = await asyncio.gather(
+                *[self.feeds[i].next_batch() for i in waiting]
+            )
+            self._batches.update(zip(waiting, batches))
+
+        dts = [batch[0] for batch in self._batches.values()
+               if batch is not None]
+        if not dts:
+            return None
+        dt = min(dts)
+
+        events = []
+        for i in range(len(self.feeds)):
+            batch = self._batches[i]
+            if batch is not None and batch[0] == dt:
+                events.extend(batch[1])
+                del self._batches[i]
+        return dt, events
+
+    async def _process_batch(self, dt, events, emit=False):
+        """
+        Process the events of the bar close at dt, emitting a perf message
+        if emit is True, and end the session if dt ends it.
+        """
+        algo = self.algo
+        simulator = self.simulator
+        tracker = algo.perf_tracker
+
+        simulator.simulation_dt = dt
+        simulator.on_dt_changed(dt)
+        self._apply_fills()
+
+        if dt < simulator.algo_start:
+            simulator._process_warmup(events)
+            return
+
+        self.session_started = True
+        trades = []
+        for event in events:
+            if event.type == DATASOURCE_TYPE.TRADE:
+                simulator.update_universe(event)
+                trades.append(event)
+            elif event.type == DATASOURCE_TYPE.CUSTOM:
+                simulator.update_universe(event)
+            elif event.type == DATASOURCE_TYPE.SPLIT:
+                algo.blotter.process_split(event)
+                tracker.process_split(event)
+
+        # Orders placed on earlier bars are filled against these bars before
+        # the algorithm sees them.
+        await self.broker.on_bar(dt, events)
+        self._apply_fills()
+
+        for trade in trades:
+            tracker.process_trade(trade)
+
+        if trades:
+            await self._route(self._call_handle_data())
+
+        if emit:
+            self.perfs.append(simulator.get_message(dt))
+
+        algo.portfolio_needs_update = True
+        algo.account_needs_update = True
+        algo.performance_needs_update = True
+
+        if self.sim_params.data_frequency == 'daily' or \
+                dt >= self.market_close:
+            await self._end_session(dt)
+
+    async def _end_session(self, dt):
+        """
+        End the session of dt, and move on to the next one.
+        """
+        algo = self.algo
+        tracker = algo.perf_tracker
+
+        # When emitting minutely, the session is emitted again with the
+        # entire day's performance rolled up.
+        if tracker.emission_rate == 'minute':
+            daily_rollup = tracker.to_dict(emission_type='daily')
+            daily_rollup['daily_perf']['recorded_vars'] = \
+                algo.recorder.values()
+            self.perfs.append(daily_rollup)
+            tracker.todays_performance.rollover()
+
+        algo.recorder.end_session()
+
+        self.session = self.sessions.searchsorted(normalize_date(dt),
+                                                  'right')
+        self.session_started = False
+        if self.session < len(self.sessions):
+            market_open, self.market_close = trading.environment \
+                .get_open_and_close(self.sessions[self.session])
+            if tracker.emission_rate == 'minute':
+                tracker.handle_intraday_market_close(market_open,
+                                                     self.market_close)
+            await self._call_before_trading_start(market_open)
+
+        algo.portfolio_needs_update = True
+        algo.account_needs_update = True
+        algo.performance_needs_update = True
+
+    def _call_handle_data(self):
+        """
+        Call the algorithm's handle_data and scheduled functions with the
+        current bars, returning the orders placed or cancelled.
+        """
+        return self.simulator._call_handle_data()
+
+    async def _call_before_trading_start(self, market_open):
+        self.simulator._call_before_trading_start(market_open)
+        blotter = self.algo.blotter
+        orders, blotter.new_orders = blotter.new_orders, []
+        await self._route(orders)
+
+    async def _route(self, orders):
+        """
+        Record orders placed or cancelled by the algorithm, and pass them on
+        to the broker.
+        """
+        tracker = self.algo.perf_tracker
+        for order in orders:
+            tracker.process_order(order)
+            if order.open:
+                if order.id not in self._submitted:
+                    self._submitted.add(order.id)
+                    await self.broker.submit(order)
+            elif order.status == ORDER_STATUS.CANCELLED and \
+                    order.id in self._submitted:
+                await self.broker.cancel(order.id)
+
+    def _apply_fills(self):
+        algo = self.algo
+        tracker = algo.perf_tracker
+        while self._fills:
+            txn = self._fills.popleft()
+            order = algo.blotter.process_fill(txn)
+            tracker.process_transaction(txn)
+            tracker.process_order(order)
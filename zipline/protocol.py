@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from copy import copy
+import numbers
 
 from six import iteritems, iterkeys
 import pandas as pd
@@ -22,6 +23,7 @@ import numpy as np
 from . utils.protocol_utils import Enum
 from . utils.math_utils import nanstd, nanmean, nansum
 
+from zipline.assets import asset_array_to_sids
 from zipline.finance.trading import with_environment
 from zipline.utils.algo_instance import get_algo_instance
 from zipline.utils.serialization_utils import (
@@ -269,7 +271,151 @@ class Positions(dict):
         return pos
 
 
+# The core fields of a TRADE event.  SIDData keeps these in the columns of a
+# UniverseBars shared by all the sids of a BarData, rather than in its
+# __dict__, so that they can be read for many sids at once.
+BAR_FIELDS = ('dt', 'price', 'volume')
+_BAR_FIELD_INDEX = {name: i for i, name in enumerate(BAR_FIELDS)}
+_DT_INDEX = _BAR_FIELD_INDEX['dt']
+
+
+def _is_number(value):
+    # bool is a numbers.Real, but not a price or a volume.
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+class UniverseBars(object):
+    """
+    The BAR_FIELDS of the most recent event of each sid in a universe, with
+    one row per sid and one array per field.
+
+    objects holds each field as it was set, so that a SIDData returns values
+    of the same type as its event.  numbers holds the price and volume that
+    are real numbers as float64, for reading them for many sids at once.
+    present marks the fields that have been set for each row, and numeric
+    the ones that are in numbers.
+    """
+
+    def __init__(self, capacity=16):
+        self.rows = {}
+        self.size = 0
+        shape = (len(BAR_FIELDS), capacity)
+        self.objects = np.empty(shape, dtype=object)
+        self.numbers = np.full(shape, np.nan)
+        self.present = np.zeros(shape, dtype=bool)
+        self.numeric = np.zeros(shape, dtype=bool)
+
+    def __len__(self):
+        return self.size
+
+    def add_row(self, sid):
+        """
+        Return the row of sid, adding one if sid has none.
+        """
+        try:
+            return self.rows[sid]
+        except KeyError:
+            pass
+
+        row = self.size
+        capacity = self.present.shape[1]
+        if row == capacity:
+            self._grow(2 * capacity)
+        self.rows[sid] = row
+        self.size += 1
+        return row
+
+    def drop(self, sid):
+        """
+        Stop reading the fields of sid from its row.  The row is not reused.
+        """
+        self.rows.pop(sid, None)
+
+    def _grow(self, capacity):
+        size = self.present.shape[1]
+        shape = (len(BAR_FIELDS), capacity)
+        for name, fill in (('objects', None),
+                           ('numbers', np.nan),
+                           ('present', False),
+                           ('numeric', False)):
+            old = getattr(self, name)
+            new = np.full(shape, fill, dtype=old.dtype)
+            new[:, :size] = old
+            setattr(self, name, new)
+
+    def get(self, row, index, default=None):
+        if not self.present[index, row]:
+            return default
+        return self.objects[index, row]
+
+    def set(self, row, index, value):
+        self.objects[index, row] = value
+        self.present[index, row] = True
+        numeric = index != _DT_INDEX and _is_number(value)
+        self.numeric[index, row] = numeric
+        if numeric:
+            self.numbers[index, row] = value
+
+    def clear(self, row, index):
+        self.present[index, row] = False
+        self.numeric[index, row] = False
+        self.objects[index, row] = None
+
+    def values(self, sids, field, default=np.nan):
+        """
+        An array of field for each of sids, default for the sids without a
+        row or without field set.  None if some of sids have no row.
+
+        price and volume are read as float64, and are default where they are
+        not real numbers.
+        """
+        index = _BAR_FIELD_INDEX[field]
+        rows = self.rows
+        try:
+            idx = np.array([rows[sid] for sid in sids], dtype=np.intp)
+        except KeyError:
+            return None
+        if index == _DT_INDEX:
+            out = self.objects[index, idx]
+            missing = ~self.present[index, idx]
+        else:
+            out = self.numbers[index, idx]
+            missing = ~self.numeric[index, idx]
+        if missing.any():
+            out[missing] = default
+        return out
+
+
+def _bar_field(name):
+    index = _BAR_FIELD_INDEX[name]
+
+    def fget(self):
+        bars = self._bars
+        if not bars.present[index, self._row]:
+            raise AttributeError(name)
+        return bars.objects[index, self._row]
+
+    def fset(self, value):
+        self._bars.set(self._row, index, value)
+
+    def fdel(self):
+        if not self._bars.present[index, self._row]:
+            raise AttributeError(name)
+        self._bars.clear(self._row, index)
+
+    return property(fget, fset, fdel)
+
+
 class SIDData(object):
+    """
+    The fields of the most recent event of a sid.
+
+    The BAR_FIELDS are a view of the sid's row in a UniverseBars, which is
+    the one of the BarData holding this SIDData, or a private one for a
+    SIDData built on its own.  Any other field is held in __dict__.
+    """
+    __slots__ = ('_sid', '_freqstr', '_bars', '_row', '__dict__')
+
     # Cache some data on the class so that this is shared for all instances of
     # siddata.
 
@@ -292,19 +438,45 @@ class SIDData(object):
     # This maps days to number of minutes.
     _minute_bar_cache = {}
 
-    def __init__(self, sid, initial_values=None):
+    dt = _bar_field('dt')
+    price = _bar_field('price')
+    volume = _bar_field('volume')
+
+    def __init__(self, sid, initial_values=None, bars=None):
         self._sid = sid
         self._freqstr = None
 
-        # To check if we have data, we use the __len__ which depends on the
-        # __dict__. Because we are foward defining the attributes needed, we
-        # need to account for their entrys in the __dict__.
-        # We will add 1 because we need to account for the _initial_len entry
-        # itself.
-        self._initial_len = len(self.__dict__) + 1
+        if bars is None:
+            bars = UniverseBars(capacity=1)
+        self._bars = bars
+        self._row = bars.add_row(sid)
 
         if initial_values:
-            self.__dict__.update(initial_values)
+            self.update(initial_values)
+
+    def update(self, values):
+        """
+        Set the fields in the dict values.
+        """
+        fields = self.__dict__
+        fields.update(values)
+        bars = self._bars
+        row = self._row
+        for index, name in enumerate(BAR_FIELDS):
+            if name in fields:
+                bars.set(row, index, fields.pop(name))
+
+    def to_dict(self):
+        """
+        A dict of the fields of this SIDData.
+        """
+        rval = {k: v for k, v in iteritems(self.__dict__)
+                if not k.startswith('_')}
+        bars = self._bars
+        for index, name in enumerate(BAR_FIELDS):
+            if bars.present[index, self._row]:
+                rval[name] = bars.objects[index, self._row]
+        return rval
 
     @property
     def datetime(self):
@@ -322,22 +494,38 @@ class SIDData(object):
         return self.dt
 
     def get(self, name, default=None):
-        return self.__dict__.get(name, default)
+        index = _BAR_FIELD_INDEX.get(name)
+        if index is None:
+            return self.__dict__.get(name, default)
+        return self._bars.get(self._row, index, default)
 
     def __getitem__(self, name):
-        return self.__dict__[name]
+        index = _BAR_FIELD_INDEX.get(name)
+        if index is None:
+            return self.__dict__[name]
+        if not self._bars.present[index, self._row]:
+            raise KeyError(name)
+        return self._bars.objects[index, self._row]
 
     def __setitem__(self, name, value):
-        self.__dict__[name] = value
+        index = _BAR_FIELD_INDEX.get(name)
+        if index is None:
+            self.__dict__[name] = value
+        else:
+            self._bars.set(self._row, index, value)
 
     def __len__(self):
-        return len(self.__dict__) - self._initial_len
+        return (len(self.__dict__) +
+                np.count_nonzero(self._bars.present[:, self._row]))
 
     def __contains__(self, name):
-        return name in self.__dict__
+        index = _BAR_FIELD_INDEX.get(name)
+        if index is None:
+            return name in self.__dict__
+        return bool(self._bars.present[index, self._row])
 
     def __repr__(self):
-        return "SIDData({0})".format(self.__dict__)
+        return "SIDData({0})".format(self.to_dict())
 
     def _get_buffer(self, bars, field='price', raw=False):
         """
@@ -365,7 +553,7 @@ class SIDData(object):
             )
             # Assert that the column holds ints, not security objects.
             if not isinstance(self._sid, str):
-                hst.columns = hst.columns.astype(int)
+                hst.columns = pd.Index(asset_array_to_sids(hst.columns))
             self._history_cache[field] = (hst, hst.values, hst.columns)
 
         # Slice of only the bars needed. This is because we strore the LARGEST
@@ -494,6 +682,41 @@ class BarData(object):
     def __init__(self, data=None):
         self._data = data or {}
         self._contains_override = None
+        # The BAR_FIELDS of the SIDData created by create_sid_data.
+        self._bars = UniverseBars()
+
+    def create_sid_data(self, sid, initial_values=None):
+        """
+        Add a SIDData for sid, viewing a row of this BarData's UniverseBars.
+        """
+        sid_data = self._data[sid] = SIDData(sid, initial_values,
+                                             bars=self._bars)
+        return sid_data
+
+    def current(self, sids, field, default=np.nan):
+        """
+        An array of field for each of sids, default for the sids without
+        field in their most recent event.  price and volume are float64, and
+        default where they are not real numbers.
+        """
+        if field in _BAR_FIELD_INDEX:
+            values = self._bars.values(sids, field, default)
+            if values is not None:
+                return values
+
+        data = self._data
+        values = []
+        for sid in sids:
+            sid_data = data.get(sid)
+            values.append(default if sid_data is None
+                          else sid_data.get(field, default))
+        if field == 'dt':
+            return np.array(values, dtype=object)
+        if field in _BAR_FIELD_INDEX:
+            return np.array([value if _is_number(value) else default
+                             for value in values],
+                            dtype=np.float64)
+        return np.array(values)
 
     def __contains__(self, name):
         if self._contains_override:
@@ -512,6 +735,8 @@ class BarData(object):
         return name in self
 
     def __setitem__(self, name, value):
+        if getattr(value, '_bars', None) is not self._bars:
+            self._bars.drop(name)
         self._data[name] = value
 
     def __getitem__(self, name):
@@ -519,6 +744,7 @@ class BarData(object):
 
     def __delitem__(self, name):
         del self._data[name]
+        self._bars.drop(name)
 
     def __iter__(self):
         for sid, data in iteritems(self._data):
@@ -13,11 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from copy import copy
 import six
 
 import numpy as np
-from datetime import timedelta
 import pandas as pd
 
 from zipline.sources.data_source import DataSource
@@ -32,11 +30,14 @@ class RandomWalkSource(DataSource):
     of the supplied calendar and can generate emit events with
     user-defined frequencies (e.g. minutely).
 
+    The prices of all the sids are stepped at once for each bar, which
+    can also be read as columnar batches with bar_batches().
     """
     VALID_FREQS = frozenset(('daily', 'minute'))
 
     def __init__(self, start_prices=None, freq='minute', start=None,
-                 end=None, drift=0.1, sd=0.1, calendar=calendar_nyse):
+                 end=None, drift=0.1, sd=0.1, calendar=calendar_nyse,
+                 seed=None, factor_loadings=None):
         """
         :Arguments:
             start_prices : dict
@@ -56,6 +57,16 @@ class RandomWalkSource(DataSource):
             calendar : calendar object <default: NYSE>
                  Calendar to use.
                  See zipline.utils for different choices.
+            seed : int <default=None>
+                 Seed of the source's own np.random.RandomState.  If None,
+                 the global numpy random state is used.
+            factor_loadings : dict <default=None>
+                 sid -> loading, or sequence of loadings, on common
+                 factors.  The steps of each sid are then correlated
+                 through the factors, with the sum of the squared loadings
+                 of a sid being the share of the variance of its steps
+                 explained by them.  Sids not in factor_loadings have no
+                 loading.
 
         :Example:
             # Assumes you have instantiated your Algorithm
@@ -92,16 +103,51 @@ class RandomWalkSource(DataSource):
         self.drift = drift
         self.sd = sd
 
+        if seed is None:
+            self.random_state = np.random
+        else:
+            self.random_state = np.random.RandomState(seed)
+
         self.sids = self.start_prices.keys()
         TradingEnvironment.instance().update_asset_finder(
             identifiers=self.sids
         )
 
+        self._sid_array = np.array(list(self.sids))
+        self._start_price_array = np.array(
+            [self.start_prices[sid] for sid in self.sids],
+            dtype=np.float64,
+        )
+        self._loadings = self._loading_matrix(factor_loadings)
+
         self.open_and_closes = \
             calendar.open_and_closes[self.start:self.end]
 
         self._raw_data = None
 
+    def _loading_matrix(self, factor_loadings):
+        """
+        The loadings of each sid on each factor as an array of shape
+        (sids, factors), or None if there are no factors.
+        """
+        if not factor_loadings:
+            return None
+
+        loadings = {sid: np.atleast_1d(np.asarray(loading, dtype=np.float64))
+                    for sid, loading in six.iteritems(factor_loadings)}
+        num_factors = max(len(loading) for loading in loadings.values())
+        matrix = np.zeros((len(self._sid_array), num_factors))
+        for i, sid in enumerate(self._sid_array):
+            loading = loadings.get(sid)
+            if loading is not None:
+                matrix[i, :len(loading)] = loading
+
+        if ((matrix ** 2).sum(axis=1) > 1).any():
+            raise ValueError(
+                "The squared factor loadings of a sid must sum to at most 1."
+            )
+        return matrix
+
     @property
     def instance_hash(self):
         return self.arg_string
@@ -118,41 +164,67 @@ class RandomWalkSource(DataSource):
             'low': (float, 'low'),
         }
 
-    def _gen_next_step(self, x):
-        x += np.random.randn() * self.sd + self.drift
-        return max(x, 0.1)
-
-    def _gen_events(self, cur_prices, current_dt):
-        for sid, price in six.iteritems(cur_prices):
-            cur_prices[sid] = self._gen_next_step(cur_prices[sid])
-
-            event = {
-                'dt': current_dt,
-                'sid': sid,
-                'price': cur_prices[sid],
-                'volume': np.random.randint(1e5, 1e6),
-                'open_price': cur_prices[sid],
-                'high': cur_prices[sid] + .1,
-                'low': cur_prices[sid] - .1,
-            }
-
-            yield event
-
-    def raw_data_gen(self):
-        cur_prices = copy(self.start_prices)
+    def _gen_shocks(self):
+        """
+        A standard normal shock for each sid, correlated through the
+        factors if there are any.
+        """
+        random_state = self.random_state
+        shocks = random_state.randn(len(self._sid_array))
+        loadings = self._loadings
+        if loadings is not None:
+            idiosyncratic = np.sqrt(1 - (loadings ** 2).sum(axis=1))
+            factors = random_state.randn(loadings.shape[1])
+            shocks = loadings.dot(factors) + idiosyncratic * shocks
+        return shocks
+
+    def _bar_dts(self):
+        """
+        The dt of each bar: every minute from open to close of each session
+        in minute mode, and the date of each session in daily mode.
+        """
         for _, (open_dt, close_dt) in self.open_and_closes.iterrows():
-            current_dt = copy(open_dt)
             if self.freq == 'minute':
                 # Emit minutely trade signals from open to close
-                while current_dt <= close_dt:
-                    for event in self._gen_events(cur_prices, current_dt):
-                        yield event
-                    current_dt += timedelta(minutes=1)
+                for current_dt in pd.date_range(open_dt, close_dt,
+                                                freq='min'):
+                    yield current_dt
             elif self.freq == 'daily':
                 # Emit one signal per day at close
-                for event in self._gen_events(
-                        cur_prices, pd.tslib.normalize_date(close_dt)):
-                    yield event
+                yield pd.tslib.normalize_date(close_dt)
+
+    def bar_batches(self):
+        """
+        Generate the bars of all the sids for each dt, as a dict mapping
+        'dt' to the dt and each of 'sid', 'price', 'volume', 'open_price',
+        'high' and 'low' to an array with an entry per sid.
+        """
+        random_state = self.random_state
+        prices = self._start_price_array.copy()
+        num_sids = len(prices)
+        for current_dt in self._bar_dts():
+            prices = np.maximum(
+                prices + self._gen_shocks() * self.sd + self.drift,
+                0.1,
+            )
+            yield {
+                'dt': current_dt,
+                'sid': self._sid_array,
+                'price': prices,
+                'volume': random_state.randint(100000, 1000000, num_sids),
+                'open_price': prices,
+                'high': prices + .1,
+                'low': prices - .1,
+            }
+
+    def raw_data_gen(self):
+        fields = ('sid', 'price', 'volume', 'open_price', 'high', 'low')
+        for batch in self.bar_batches():
+            current_dt = batch['dt']
+            for row in zip(*(batch[field].tolist() for field in fields)):
+                event = dict(zip(fields, row))
+                event['dt'] = current_dt
+                yield event
 
     @property
     def raw_data(self):
@@ -264,7 +264,7 @@ class BatchTransform(object):
         # sid keys.
         event = Event()
         event.dt = max(dts)
-        event.data = {k: v.__dict__ for k, v in iteritems(data._data)
+        event.data = {k: v.to_dict() for k, v in iteritems(data._data)
                       # Need to check if data has a 'length' to filter
                       # out sids without trade data available.
                       # TODO: expose more of 'no trade available'
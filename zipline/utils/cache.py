@@ -0,0 +1,86 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Small caching containers.
+"""
+try:
+    # optional cython based OrderedDict
+    from cyordereddict import OrderedDict
+except ImportError:
+    from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    A mapping that holds at most `maxsize` entries, evicting the least
+    recently used entry when full.
+
+    If a `load` function is given, missing keys are passed to it and the
+    result is cached.  `load` should raise KeyError for keys that do not
+    exist.
+    """
+
+    def __init__(self, maxsize, load=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive, got %s" % maxsize)
+        self.maxsize = maxsize
+        self._load = load
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, key):
+        try:
+            # Re-insert the entry to mark it as the most recently used.
+            value = self._data.pop(key)
+        except KeyError:
+            if self._load is None:
+                raise
+            value = self._load(key)
+            if len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+        self._data[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = value
+
+    def peek(self, key, default=None):
+        """
+        Return the value for key if it is cached, without loading it or
+        marking it as used.
+        """
+        return self._data.get(key, default)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear(self):
+        self._data.clear()
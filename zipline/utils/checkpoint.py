@@ -0,0 +1,352 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Checkpoints of a running simulation.
+
+A checkpoint is taken at the end of a trading session and holds everything
+needed to carry the simulation on from the next session:
+
+- the algorithm's state: its performance tracker, blotter, recorded
+  variables, history container, the attributes set on it by the user's code
+  (its context) and the state of the rules of its scheduled functions.
+- the simulator's state: the last event seen for each sid, and the market
+  open and close of the next session.
+- a cursor into the data sources: the dt of the last processed event.  On
+  resume, events up to and including that dt are skipped.
+- a reference to the perf messages emitted so far, so that a resumed run
+  returns the same results as an uninterrupted one.
+
+A checkpoint file is a fixed-size header, holding a magic string and the
+format version, followed by a zlib compressed pickle.  Pickling relies on the
+__getstate__/__setstate__ methods of the objects involved.
+
+The perf messages are not held in the checkpoint itself, as writing all of
+them at every checkpoint would take time quadratic in the number of
+sessions.  They are appended to a perf log next to the checkpoint, in one
+segment per checkpoint holding the messages emitted since the previous one.
+A checkpoint records the size of the perf log and the number of messages in
+it when it was taken, so that a log that has since grown still gives the
+messages of an earlier checkpoint.
+"""
+import os
+import struct
+import zlib
+
+from six import iteritems
+from six.moves import cPickle as pickle
+
+from zipline.errors import InvalidCheckpoint
+from zipline.protocol import BarData
+
+CHECKPOINT_FORMAT_VERSION = 3
+
+_MAGIC = b'ZLCHKPT\n'
+_HEADER = struct.Struct('>8sI')
+
+# Each segment of a perf log is its length followed by a zlib compressed
+# pickle of a list of perf messages.
+_SEGMENT_HEADER = struct.Struct('>Q')
+
+
+def _sim_params_key(sim_params):
+    """
+    The simulation parameters that must be the same for a checkpoint to be
+    resumed.
+    """
+    return (
+        sim_params.first_open,
+        sim_params.last_close,
+        sim_params.capital_base,
+        sim_params.data_frequency,
+        sim_params.emission_rate,
+    )
+
+
+def bar_data_state(bar_data):
+    """
+    Return the fields of each sid's most recent event in bar_data.
+    """
+    return {sid: sid_data.to_dict()
+            for sid, sid_data in iteritems(bar_data._data)}
+
+
+def restore_bar_data(state):
+    """
+    Rebuild a BarData from the output of bar_data_state.
+    """
+    bar_data = BarData()
+    for sid, fields in iteritems(state):
+        bar_data.create_sid_data(sid, fields)
+    return bar_data
+
+
+def perf_log_path(path):
+    """
+    The path of the perf log of the checkpoints written to path.
+    """
+    return path + '.perfs'
+
+
+def append_perfs(log_path, perfs):
+    """
+    Append a segment holding perfs to the perf log at log_path, and return
+    the size of the log after it.
+    """
+    payload = zlib.compress(pickle.dumps(perfs, pickle.HIGHEST_PROTOCOL))
+    with open(log_path, 'ab') as f:
+        f.write(_SEGMENT_HEADER.pack(len(payload)))
+        f.write(payload)
+        return f.tell()
+
+
+def read_perfs(log_path, size):
+    """
+    The perf messages in the first size bytes of the perf log at log_path.
+    """
+    perfs = []
+    with open(log_path, 'rb') as f:
+        while f.tell() < size:
+            length, = _SEGMENT_HEADER.unpack(f.read(_SEGMENT_HEADER.size))
+            perfs.extend(pickle.loads(zlib.decompress(f.read(length))))
+    return perfs
+
+
+class Checkpoint(object):
+    """
+    The state of a simulation at the end of the session ending at dt.
+    """
+
+    def __init__(self,
+                 dt,
+                 market_open,
+                 market_close,
+                 sim_params_key,
+                 algo_state,
+                 current_data,
+                 perf_log,
+                 perf_log_size,
+                 perf_count,
+                 path=None):
+        self.dt = dt
+        self.market_open = market_open
+        self.market_close = market_close
+        self.sim_params_key = sim_params_key
+        self.algo_state = algo_state
+        self.current_data = current_data
+        # The perf log's path relative to the checkpoint's directory, and its
+        # size and number of messages when the checkpoint was taken.
+        self.perf_log = perf_log
+        self.perf_log_size = perf_log_size
+        self.perf_count = perf_count
+        self.path = path
+
+    @classmethod
+    def from_simulator(cls, simulator, dt, market_open, market_close,
+                       perf_log, perf_log_size, perf_count):
+        return cls(
+            dt=dt,
+            market_open=market_open,
+            market_close=market_close,
+            sim_params_key=_sim_params_key(simulator.sim_params),
+            algo_state=simulator.algo._checkpoint_state(),
+            current_data=bar_data_state(simulator.current_data),
+            perf_log=perf_log,
+            perf_log_size=perf_log_size,
+            perf_count=perf_count,
+        )
+
+    def __repr__(self):
+        return '%s(dt=%s, path=%r)' % (type(self).__name__, self.dt,
+                                       self.path)
+
+    @property
+    def perf_log_path(self):
+        """
+        The path of the perf log holding the messages of this checkpoint.
+        """
+        return os.path.join(os.path.dirname(os.path.abspath(self.path)),
+                            self.perf_log)
+
+    def read_perfs(self):
+        """
+        The perf messages emitted up to this checkpoint.
+        """
+        try:
+            perfs = read_perfs(self.perf_log_path, self.perf_log_size)
+        except Exception as e:
+            raise InvalidCheckpoint(
+                path=self.path,
+                reason='its perf log %s can not be read: %s' % (
+                    self.perf_log_path, e,
+                ),
+            )
+        if len(perfs) != self.perf_count:
+            raise InvalidCheckpoint(
+                path=self.path,
+                reason='its perf log %s holds %d messages, expected %d' % (
+                    self.perf_log_path, len(perfs), self.perf_count,
+                ),
+            )
+        return perfs
+
+    def check_sim_params(self, sim_params):
+        """
+        Raise InvalidCheckpoint unless this checkpoint was taken by a
+        simulation with the same parameters as sim_params.
+        """
+        if _sim_params_key(sim_params) != self.sim_params_key:
+            raise InvalidCheckpoint(
+                path=self.path,
+                reason='it was written by a simulation from %s to %s, '
+                       'but this simulation runs from %s to %s, or its '
+                       'capital base, data frequency or emission rate '
+                       'differ' % (self.sim_params_key[0],
+                                   self.sim_params_key[1],
+                                   sim_params.first_open,
+                                   sim_params.last_close),
+            )
+
+    def to_dict(self):
+        return {
+            'dt': self.dt,
+            'market_open': self.market_open,
+            'market_close': self.market_close,
+            'sim_params_key': self.sim_params_key,
+            'algo_state': self.algo_state,
+            'current_data': self.current_data,
+            'perf_log': self.perf_log,
+            'perf_log_size': self.perf_log_size,
+            'perf_count': self.perf_count,
+        }
+
+
+def write_checkpoint(path, checkpoint):
+    """
+    Write checkpoint to path.
+
+    The file is written to a temporary path and moved into place, so an
+    interrupted write leaves the previous checkpoint intact.
+    """
+    payload = zlib.compress(
+        pickle.dumps(checkpoint.to_dict(), pickle.HIGHEST_PROTOCOL),
+    )
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, CHECKPOINT_FORMAT_VERSION))
+        f.write(payload)
+    os.rename(tmp_path, path)
+
+
+def read_checkpoint(path):
+    """
+    Load the checkpoint at path.
+
+    Raises IOError if there is no file at path, and InvalidCheckpoint if the
+    file is not a checkpoint or was written in a different format version.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        payload = f.read()
+
+    if len(header) < _HEADER.size:
+        raise InvalidCheckpoint(path=path, reason='the file is truncated')
+
+    magic, version = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise InvalidCheckpoint(path=path, reason='not a checkpoint file')
+    if version != CHECKPOINT_FORMAT_VERSION:
+        raise InvalidCheckpoint(
+            path=path,
+            reason='format version %d, expected %d' % (
+                version, CHECKPOINT_FORMAT_VERSION,
+            ),
+        )
+
+    try:
+        state = pickle.loads(zlib.decompress(payload))
+    except Exception as e:
+        raise InvalidCheckpoint(path=path, reason=str(e))
+
+    return Checkpoint(path=path, **state)
+
+
+class Checkpointer(object):
+    """
+    Writes a checkpoint of an AlgorithmSimulator to path at the end of every
+    `every` trading sessions.
+
+    perfs is the list of perf messages emitted so far, which the caller keeps
+    appending to.  The messages emitted since the previous checkpoint are
+    appended to the perf log of path at each checkpoint.
+
+    resumed is the Checkpoint that perfs was restored from, if any.  If it
+    was written to path, the perf log is carried on from that checkpoint,
+    and otherwise a new perf log is started.
+    """
+
+    def __init__(self, path, perfs, every=1, resumed=None):
+        if every < 1:
+            raise ValueError(
+                "Checkpoints must be taken at least every session, got "
+                "every=%s" % every
+            )
+        self.path = path
+        self.perfs = perfs
+        self.every = every
+        self.sessions = 0
+
+        self.log_path = perf_log_path(path)
+        # The size of the perf log and the number of messages in it.
+        self.log_size = 0
+        self.logged = 0
+        if resumed is not None and (
+                os.path.abspath(resumed.perf_log_path) ==
+                os.path.abspath(self.log_path)):
+            self.log_size = resumed.perf_log_size
+            self.logged = resumed.perf_count
+        # Drop the segments written after the last checkpoint, or the log of
+        # an earlier simulation.
+        with open(self.log_path, 'ab') as f:
+            f.truncate(self.log_size)
+
+    def session_end(self, simulator, dt, market_open, market_close,
+                    force=False):
+        """
+        Called by the simulator once it is done with the session ending at
+        dt.  market_open and market_close are those of the next session.
+
+        If force is True, a checkpoint is written whatever the number of
+        sessions since the last one.
+        """
+        self.sessions += 1
+        if self.sessions % self.every and not force:
+            return
+
+        perfs = self.perfs
+        if len(perfs) > self.logged:
+            self.log_size = append_perfs(self.log_path, perfs[self.logged:])
+            self.logged = len(perfs)
+
+        checkpoint_dir = os.path.dirname(os.path.abspath(self.path))
+        write_checkpoint(
+            self.path,
+            Checkpoint.from_simulator(
+                simulator, dt, market_open, market_close,
+                perf_log=os.path.relpath(self.log_path, checkpoint_dir),
+                perf_log_size=self.log_size,
+                perf_count=self.logged,
+            ),
+        )
@@ -106,6 +106,15 @@ def parse_args(argv, ipython_mode=False):
     parser.add_argument('--output', '-o')
     parser.add_argument('--metadata_path', '-m')
     parser.add_argument('--metadata_index', '-x')
+    parser.add_argument('--checkpoint',
+                        help="Write a checkpoint of the simulation to FILE",
+                        metavar='FILE')
+    parser.add_argument('--checkpoint-every', type=int,
+                        help="Number of trading sessions between checkpoints")
+    parser.add_argument('--resume-from',
+                        help="Resume the simulation from the checkpoint in "
+                             "FILE",
+                        metavar='FILE')
     if ipython_mode:
         parser.add_argument('--local_namespace', action='store_true')
 
@@ -243,7 +252,13 @@ def run_pipeline(print_algo=True, **kwargs):
                                     start=start,
                                     end=end)
 
-    perf = algo.run(source, overwrite_sim_params=overwrite_sim_params)
+    perf = algo.run(
+        source,
+        overwrite_sim_params=overwrite_sim_params,
+        checkpoint_path=kwargs.get('checkpoint'),
+        checkpoint_every=int(kwargs.get('checkpoint_every') or 1),
+        resume_from=kwargs.get('resume_from'),
+    )
 
     output_fname = kwargs.get('output', None)
     if output_fname is not None:
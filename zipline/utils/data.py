@@ -242,6 +242,13 @@ class RollingPanel(object):
     def window_length(self):
         return self._window
 
+    @property
+    def nbytes(self):
+        """
+        The number of bytes held by the buffers.
+        """
+        return self.buffer.values.nbytes + self.date_buf.nbytes
+
 
 class MutableIndexRollingPanel(object):
     """
@@ -391,3 +398,32 @@ class MutableIndexRollingPanel(object):
             self.buffer.loc[non_nan_items, :, non_nan_cols])
 
         self.buffer = new_buffer
+
+
+class GrowableArray(object):
+    """
+    A 1d array of dtype with amortized constant time appends.
+    """
+
+    def __init__(self, dtype, capacity=16):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        if self._size == len(self._data):
+            self._data = np.resize(self._data, 2 * len(self._data))
+        self._data[self._size] = value
+        self._size += 1
+
+    def clear(self):
+        self._size = 0
+
+    @property
+    def values(self):
+        """
+        A view of the appended values.
+        """
+        return self._data[:self._size]
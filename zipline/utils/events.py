@@ -14,13 +14,20 @@
 # limitations under the License.
 from abc import ABCMeta, abstractmethod
 from collections import namedtuple
+from timeit import default_timer
 import six
 
 import datetime
+from logbook import Logger
+import numpy as np
 import pandas as pd
 import pytz
 
+from zipline.errors import EventBudgetExceeded
 from zipline.finance.trading import TradingEnvironment
+from zipline.utils.data import GrowableArray
+
+log = Logger('Event Manager')
 
 
 __all__ = [
@@ -53,6 +60,8 @@ __all__ = [
 MAX_MONTH_RANGE = 26
 MAX_WEEK_RANGE = 5
 
+EVENT_BUDGET_ACTIONS = ('log', 'raise')
+
 
 def naive_to_utc(ts):
     """
@@ -176,22 +185,160 @@ class EventManager(object):
     Manages a list of Event objects.
     This manages the logic for checking the rules and dispatching to the
     handle_data function of the Events.
-    """
-    def __init__(self):
+
+    If timed, the time taken by each call of an event's callback is kept,
+    to be summarized by timing_stats.  If a budget is given, in seconds,
+    events are timed, and bars whose callbacks take longer than the budget
+    altogether are logged, or raise EventBudgetExceeded if budget_action is
+    'raise'.
+    """
+    def __init__(self, timed=False, budget=None, budget_action='log'):
+        if budget_action not in EVENT_BUDGET_ACTIONS:
+            raise ValueError(
+                "budget_action must be one of %s, got %r" % (
+                    ', '.join(map(repr, EVENT_BUDGET_ACTIONS)), budget_action,
+                )
+            )
         self._events = []
 
+        self.timed = timed or budget is not None
+        self.budget = budget
+        self.budget_action = budget_action
+
+        # The durations of the calls of each event's callback, in seconds,
+        # in the same order as the events.
+        self._timings = []
+        # The number of bars handled, and of those over budget.
+        self.bars = 0
+        self.bars_over_budget = 0
+        # The time taken by the callbacks of the last bar handled, in
+        # seconds.
+        self.last_bar_time = None
+
     def add_event(self, event, prepend=False):
         """
         Adds an event to the manager.
         """
         if prepend:
             self._events.insert(0, event)
+            self._timings.insert(0, GrowableArray(np.float64))
         else:
             self._events.append(event)
+            self._timings.append(GrowableArray(np.float64))
 
     def handle_data(self, context, data, dt):
-        for event in self._events:
-            event.handle_data(context, data, dt)
+        if not self.timed:
+            for event in self._events:
+                event.handle_data(context, data, dt)
+            return
+
+        bar_start = default_timer()
+        for event, timings in zip(self._events, self._timings):
+            if event.rule.should_trigger(dt):
+                start = default_timer()
+                event.callback(context, data)
+                timings.append(default_timer() - start)
+        elapsed = default_timer() - bar_start
+
+        self.bars += 1
+        self.last_bar_time = elapsed
+        if self.budget is not None and elapsed > self.budget:
+            self.bars_over_budget += 1
+            if self.budget_action == 'raise':
+                raise EventBudgetExceeded(
+                    dt=dt, elapsed=elapsed, budget=self.budget,
+                )
+            log.warn(
+                "Events took {elapsed:.6f}s at {dt}, over the budget of "
+                "{budget:.6f}s per bar.".format(
+                    elapsed=elapsed, dt=dt, budget=self.budget,
+                )
+            )
+
+    def timing_stats(self):
+        """
+        Returns the number of calls of each managed event's callback, in
+        order, and their mean, median, 99th percentile and longest duration,
+        in seconds, which are None for events that were never called.
+        """
+        stats = []
+        for event, timings in zip(self._events, self._timings):
+            callback = event.callback
+            entry = {
+                'name': getattr(callback, '__name__', repr(callback)),
+                'count': len(timings),
+                'mean': None,
+                'p50': None,
+                'p99': None,
+                'max': None,
+            }
+            if len(timings):
+                timings = timings.values
+                p50, p99 = np.percentile(timings, [50, 99])
+                entry.update(
+                    mean=timings.mean(),
+                    p50=p50,
+                    p99=p99,
+                    max=timings.max(),
+                )
+            stats.append(entry)
+        return stats
+
+    def timing_report(self):
+        """
+        The timing_stats of the events, along with the budget and the number
+        of bars handled and over budget.
+        """
+        return {
+            'events': self.timing_stats(),
+            'budget': self.budget,
+            'bars': self.bars,
+            'bars_over_budget': self.bars_over_budget,
+        }
+
+    def rule_states(self):
+        """
+        Returns the state of the rules of the managed events, in order.
+        Callbacks are not included.
+        """
+        return [_rule_state(event.rule) for event in self._events]
+
+    def restore_rule_states(self, states):
+        """
+        Restores the output of rule_states onto the rules of the managed
+        events, which must have been added in the same order.
+        """
+        if len(states) != len(self._events):
+            raise ValueError(
+                'Got state for %d events, but %d are managed' % (
+                    len(states), len(self._events),
+                )
+            )
+        for event, state in zip(self._events, states):
+            _restore_rule_state(event.rule, state)
+
+
+def _rule_state(rule):
+    """
+    The attributes of a rule that are neither callables nor other rules,
+    recursing into the rules it wraps.
+    """
+    state = {}
+    for name, value in six.iteritems(vars(rule)):
+        if isinstance(value, EventRule):
+            state[name] = _rule_state(value)
+        elif not callable(value):
+            state[name] = value
+    return state
+
+
+def _restore_rule_state(rule, state):
+    for name, value in six.iteritems(state):
+        wrapped = getattr(rule, name, None)
+        if isinstance(wrapped, EventRule):
+            _restore_rule_state(wrapped, value)
+        else:
+            setattr(rule, name, value)
 
 
 class Event(namedtuple('Event', ['rule', 'callback'])):
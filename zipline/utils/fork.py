@@ -0,0 +1,99 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Warm-started variants of a backtest.
+
+Variants of an algorithm that only differ after some date share the
+simulation up to that date.  Rather than simulating that prefix once per
+variant, simulate it once and checkpoint it:
+
+    algo.run(source, checkpoint_path=path, stop_at=fork_date)
+
+then continue from the checkpoint once per variant, in parallel processes:
+
+    results = fork(path, make_algo, make_source, [
+        {'threshold': 0.1},
+        {'threshold': 0.2},
+    ])
+
+Each variant is a dict of attributes set on the algorithm's restored
+context.  Each continuation returns the daily stats of the whole run,
+prefix included.
+"""
+from multiprocessing import Pool
+
+
+def run_continuation(checkpoint_path, algo_factory, source_factory, variant):
+    """
+    Resume the simulation checkpointed at checkpoint_path with the
+    attributes in variant set on the algorithm's context.
+
+    algo_factory and source_factory are called without arguments, and must
+    build the algorithm and source that the checkpoint was taken from.
+    """
+    algo = algo_factory()
+    return algo.run(source_factory(),
+                    resume_from=checkpoint_path,
+                    resume_context=variant)
+
+
+def _run_continuation(args):
+    return run_continuation(*args)
+
+
+def fork(checkpoint_path, algo_factory, source_factory, variants,
+         processes=None):
+    """
+    Run a continuation of the checkpointed simulation for each of variants.
+
+    Parameters
+    ----------
+    checkpoint_path : str
+        The checkpoint to fork from.
+    algo_factory : callable
+        Builds the TradingAlgorithm the checkpoint was taken from.
+    source_factory : callable
+        Builds the source the checkpoint was taken from.
+    variants : iterable of dict
+        The attributes to set on the restored context of each continuation.
+    processes : int, optional
+        The number of worker processes.  Defaults to the number of CPUs.  If
+        1, the continuations run one after another in this process.
+
+    Returns
+    -------
+    list of pd.DataFrame
+        The daily stats of each continuation, in the order of variants.
+
+    Notes
+    -----
+    Unless processes is 1, algo_factory and source_factory are pickled to
+    be sent to the workers, so they must be module-level functions or other
+    picklable callables.  Workers are forked from this process, so they
+    inherit its trading environment.
+    """
+    tasks = [(checkpoint_path, algo_factory, source_factory, variant)
+             for variant in variants]
+
+    if processes == 1:
+        return [_run_continuation(task) for task in tasks]
+
+    pool = Pool(processes)
+    try:
+        return pool.map(_run_continuation, tasks)
+    finally:
+        pool.close()
+        pool.join()
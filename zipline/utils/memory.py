@@ -0,0 +1,173 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Accounting of the memory held by the components of a running simulation.
+
+With memory accounting on, each perf message gets a 'memory' entry holding
+the number of bytes held by the history container, the performance periods'
+transactions and orders, the cumulative risk metrics and the perf messages
+emitted so far.  In 'tracemalloc' mode, the memory currently and at most
+allocated by Python, as traced by tracemalloc, is reported as well.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2, without the pytracemalloc backport.
+    tracemalloc = None
+
+MEMORY_ACCOUNTING_MODES = ('nbytes', 'tracemalloc')
+
+
+def sizeof(obj, seen=None):
+    """
+    An estimate of the number of bytes held by obj and everything it refers
+    to.  numpy arrays and pandas objects count for the size of their data,
+    containers and objects for their own size plus that of their contents or
+    attributes.  Objects referred to more than once are counted once.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.values.nbytes
+    if isinstance(obj, pd.DataFrame):
+        return obj.values.nbytes + obj.index.nbytes
+    if isinstance(obj, pd.Panel):
+        return obj.values.nbytes
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sizeof(k, seen) + sizeof(v, seen)
+                    for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += sizeof(obj.__dict__, seen)
+    return size
+
+
+class MemoryAccountant(object):
+    """
+    Samples the memory used by the components of a TradingAlgorithm.
+
+    mode is 'nbytes', to report the bytes held by each component, or
+    'tracemalloc', to also trace the allocations made during the run.
+    """
+
+    def __init__(self, mode='nbytes'):
+        if mode not in MEMORY_ACCOUNTING_MODES:
+            raise ValueError(
+                "memory_accounting must be one of %s, got %r" % (
+                    ', '.join(map(repr, MEMORY_ACCOUNTING_MODES)), mode,
+                )
+            )
+        if mode == 'tracemalloc' and tracemalloc is None:
+            raise ValueError(
+                "memory_accounting='tracemalloc' needs the tracemalloc "
+                "module, which is part of Python 3.4 and later"
+            )
+        self.mode = mode
+        self.samples = []
+        self.dts = []
+
+        # The perf messages already counted, and the bytes they hold, so
+        # that each message is only measured once.
+        self._perfs_counted = 0
+        self._perfs_nbytes = 0
+
+        # Whether tracing was started by us, and so should be stopped by us.
+        self._tracing = False
+
+    def start(self):
+        if self.mode == 'tracemalloc' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def stop(self):
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def _perfs_sizeof(self, perfs):
+        if len(perfs) < self._perfs_counted:
+            # The list was replaced, e.g. by a resumed checkpoint.
+            self._perfs_counted = 0
+            self._perfs_nbytes = 0
+        for perf in perfs[self._perfs_counted:]:
+            self._perfs_nbytes += sizeof(perf)
+        self._perfs_counted = len(perfs)
+        return self._perfs_nbytes
+
+    def sample(self, dt, algo, perfs):
+        """
+        Record, and return as a dict, the bytes held by each component of
+        algo at dt.  perfs is the list of perf messages emitted so far.
+        """
+        history_container = getattr(algo, 'history_container', None)
+        tracker = algo.perf_tracker
+
+        usage = {
+            'history_container': (
+                history_container.nbytes
+                if history_container is not None else 0
+            ),
+            'perf_periods': sum(
+                period.nbytes for period in tracker.perf_periods
+            ),
+            'risk_metrics': tracker.cumulative_risk_metrics.nbytes,
+            'perfs': self._perfs_sizeof(perfs),
+        }
+        if self.mode == 'tracemalloc':
+            usage['traced_current'], usage['traced_peak'] = \
+                tracemalloc.get_traced_memory()
+
+        self.dts.append(dt)
+        self.samples.append(usage)
+        return usage
+
+    def frame(self):
+        """
+        The samples taken so far as a DataFrame indexed by dt, with a column
+        per component.
+        """
+        return pd.DataFrame(self.samples, index=pd.DatetimeIndex(self.dts))
+
+    def top_allocations(self, limit=10, key_type='lineno'):
+        """
+        The limit source lines, or other key_type of
+        tracemalloc.Snapshot.statistics, allocating the most memory that is
+        still allocated.  Only available in 'tracemalloc' mode, while
+        tracing.
+        """
+        if self.mode != 'tracemalloc' or not tracemalloc.is_tracing():
+            raise ValueError(
+                "Allocations are only traced with "
+                "memory_accounting='tracemalloc', during a run"
+            )
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        return snapshot.statistics(key_type)[:limit]
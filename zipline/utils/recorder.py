@@ -0,0 +1,172 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Storage for the variables recorded by an algorithm with record().
+
+By default a recorded variable holds its last recorded value, which is what
+the perf messages report.  A variable can instead be aggregated over each
+emission interval, in which case the values recorded during the current
+session are kept in a typed buffer, and/or have every recorded value kept,
+with its dt, as a series exported at the end of the run rather than in the
+perf messages.
+"""
+import numpy as np
+import pandas as pd
+from six import iteritems
+
+from zipline.errors import (
+    NonNumericRecordedValue,
+    UnsupportedRecordAggregation,
+)
+from zipline.utils.data import GrowableArray
+
+AGGREGATIONS = {
+    'last': None,
+    'mean': np.mean,
+    'max': np.max,
+    'min': np.min,
+    'sum': np.sum,
+}
+
+
+class RecordedVariable(object):
+    """
+    The values recorded for a variable with non default options.
+    """
+
+    def __init__(self, name, how, keep_series):
+        self.name = name
+        self.how = how
+        self.keep_series = keep_series
+
+        # The values recorded during the current session, and the position
+        # in it of the first value of the current minute.
+        self.session = GrowableArray(np.float64) if how != 'last' else None
+        self.minute_start = 0
+
+        # Every recorded value, with its dt as nanoseconds since the epoch.
+        self.series_dts = GrowableArray(np.int64) if keep_series else None
+        self.series_values = GrowableArray(np.float64) if keep_series else None
+
+    def append(self, dt, value):
+        if self.session is None and not self.keep_series:
+            return
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise NonNumericRecordedValue(name=self.name, value=value)
+
+        if self.session is not None:
+            self.session.append(value)
+        if self.keep_series:
+            self.series_dts.append(pd.Timestamp(dt).value)
+            self.series_values.append(value)
+
+    def aggregate(self, minute):
+        """
+        The aggregate of the values recorded during the current minute if
+        minute is True, or else session.  NaN if there were none, except for
+        sums.
+        """
+        values = self.session.values
+        if minute:
+            values = values[self.minute_start:]
+        if not len(values):
+            return 0.0 if self.how == 'sum' else np.nan
+        return float(AGGREGATIONS[self.how](values))
+
+    def series(self):
+        index = pd.DatetimeIndex(self.series_dts.values, tz='UTC')
+        return pd.Series(self.series_values.values.copy(), index=index,
+                         name=self.name)
+
+
+class Recorder(object):
+    """
+    The variables recorded by an algorithm.
+    """
+
+    def __init__(self):
+        # The last recorded value of each variable.
+        self.last = {}
+        # The variables with non default options, by name.
+        self.variables = {}
+
+    def set_options(self, name, how='last', keep_series=False):
+        """
+        Aggregate the values recorded for name over each emission interval
+        with how, one of AGGREGATIONS, and keep every recorded value as a
+        series if keep_series is True.  Values recorded so far with
+        different options are dropped.
+        """
+        if how not in AGGREGATIONS:
+            raise UnsupportedRecordAggregation(
+                how=how,
+                supported=sorted(AGGREGATIONS),
+            )
+        if how == 'last' and not keep_series:
+            self.variables.pop(name, None)
+        else:
+            self.variables[name] = RecordedVariable(name, how, keep_series)
+
+    def record(self, dt, name, value):
+        self.last[name] = value
+        variable = self.variables.get(name)
+        if variable is not None:
+            variable.append(dt, value)
+
+    def values(self, minute=False):
+        """
+        The values to report for the current session, or minute if minute
+        is True: the last recorded value of each variable, or its aggregate
+        over the interval.
+        """
+        rval = dict(self.last)
+        for name, variable in iteritems(self.variables):
+            if variable.session is not None and name in rval:
+                rval[name] = variable.aggregate(minute)
+        return rval
+
+    def end_minute(self):
+        for variable in self.variables.values():
+            if variable.session is not None:
+                variable.minute_start = len(variable.session)
+
+    def end_session(self):
+        for variable in self.variables.values():
+            if variable.session is not None:
+                variable.session.clear()
+                variable.minute_start = 0
+
+    def series(self, name=None):
+        """
+        The series of the values recorded for name, or a DataFrame of all
+        the variables kept as series if name is None.
+        """
+        if name is not None:
+            variable = self.variables.get(name)
+            if variable is None or not variable.keep_series:
+                raise KeyError(
+                    "%r is not recorded as a series, see "
+                    "set_record_options" % name
+                )
+            return variable.series()
+
+        return pd.DataFrame({
+            name: variable.series()
+            for name, variable in iteritems(self.variables)
+            if variable.keep_series
+        })
@@ -1,7 +1,9 @@
+from bisect import bisect_right
 from datetime import datetime
 from os import listdir
 import os.path
 
+import numpy as np
 import pandas as pd
 import pytz
 import zipline
@@ -24,11 +26,12 @@ class SecurityList(object):
             current datetime
         """
         self.data = data
-        self._cache = {}
         self._knowledge_dates = self.make_knowledge_dates(self.data)
         self.current_date = current_date_func
-        self.count = 0
-        self._current_set = set()
+        # The contents of the list as of each knowledge date, built on first
+        # use.  See _build_snapshots.
+        self._snapshots = None
+        self._snapshot_sids = None
 
     def make_knowledge_dates(self, data):
         knowledge_dates = sorted(
@@ -43,33 +46,59 @@ class SecurityList(object):
 
     @property
     def restricted_list(self):
+        return self.current_securities(self.current_date())
 
-        cd = self.current_date()
-        for kd in self._knowledge_dates:
-            if cd < kd:
-                break
-            if kd in self._cache:
-                self._current_set = self._cache[kd]
-                continue
-
-            for effective_date, changes in iter(self.data[kd].items()):
-                self.update_current(
-                    effective_date,
-                    changes['add'],
-                    self._current_set.add
-                )
-
-                self.update_current(
-                    effective_date,
-                    changes['delete'],
-                    self._current_set.remove
-                )
+    def current_securities(self, dt):
+        """
+        The frozenset of sids on the list as of dt.
+        """
+        return self._snapshot_index(dt)[0]
 
-            self._cache[kd] = self._current_set
-        return self._current_set
+    def restricted(self, assets):
+        """
+        Return a bool array flagging which of assets, Assets or sids, are on
+        the list as of the current date.
+        """
+        sids = np.array([getattr(asset, 'sid', asset) for asset in assets],
+                        dtype=np.int64)
+        return np.in1d(sids, self._snapshot_index(self.current_date())[1])
+
+    def _snapshot_index(self, dt):
+        if self._snapshots is None:
+            self._build_snapshots()
+        # The last snapshot whose knowledge date is on or before dt.
+        idx = bisect_right(self._knowledge_dates, dt) - 1
+        if idx < 0:
+            return frozenset(), np.array([], dtype=np.int64)
+        return self._snapshots[idx], self._snapshot_sids[idx]
 
     @with_environment()
-    def update_current(self, effective_date, symbols, change_func, env=None):
+    def _build_snapshots(self, env=None):
+        """
+        Resolve every symbol in data once and store, for each knowledge date,
+        the sids on the list once all the changes known by that date apply.
+
+        Symbols are resolved as of the lookup date of their change; symbols
+        with no Asset are ignored.
+        """
+        current = set()
+        snapshots = []
+        for kd in self._knowledge_dates:
+            changes_by_date = self.data[kd]
+            for effective_date in sorted(changes_by_date):
+                changes = changes_by_date[effective_date]
+                current.update(self._resolve(
+                    changes.get('add', ()), effective_date, env))
+                current.difference_update(self._resolve(
+                    changes.get('delete', ()), effective_date, env))
+            snapshots.append(frozenset(current))
+
+        self._snapshots = snapshots
+        self._snapshot_sids = [np.array(sorted(s), dtype=np.int64)
+                               for s in snapshots]
+
+    @staticmethod
+    def _resolve(symbols, effective_date, env):
         for symbol in symbols:
             asset = env.asset_finder.lookup_symbol(
                 symbol,
@@ -78,7 +107,7 @@ class SecurityList(object):
             # Pass if no Asset exists for the symbol
             if asset is None:
                 continue
-            change_func(asset.sid)
+            yield asset.sid
 
 
 class SecurityListSet(object):